@@ -0,0 +1,101 @@
+# bench_cleaning.py
+# Raw-feed cleaning throughput: the notebook's row-wise .apply code vs src/cleaning.py,
+# on a 100x replica of data/raw/laptop_price.csv.
+#
+# Run from the repo root:  python benchmarks/bench_cleaning.py [--scale 100]
+
+import os
+import re
+import sys
+import hashlib
+import time
+import argparse
+
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.cleaning import HASH_COLUMNS, clean_raw, load_raw
+
+RAW_PATH = os.path.join(ROOT_DIR, "data", "raw", "laptop_price.csv")
+
+
+def notebook_clean(data):
+    """01_data_cleaning.ipynb as written (row-wise apply + regex loop), for comparison."""
+    data = data.drop(["laptop_ID"], axis=1)
+    data["Ram"] = data["Ram"].str.replace("GB", "").astype(int)
+    data["Weight"] = data["Weight"].str.replace("kg", "").astype(float)
+
+    def convert_memory(mem):
+        mem = str(mem)
+        ssd = hdd = hybrid = flash = 0
+        for part in mem.split("+"):
+            part = part.strip()
+            size_match = re.search(r"(\d+)", part)
+            size = int(size_match.group(1)) if size_match else 0
+            if "TB" in part:
+                size *= 1024
+            if "SSD" in part:
+                ssd += size
+            elif "HDD" in part:
+                hdd += size
+            elif "Hybrid" in part:
+                hybrid += size
+            elif "Flash" in part or "Flash Storage" in part:
+                flash += size
+        return pd.Series([ssd, hdd, hybrid, flash])
+
+    data[["SSD", "HDD", "Hybrid", "Flash_Storage"]] = data["Memory"].apply(convert_memory)
+    data = data.drop("Memory", axis=1)
+    data["Touchscreen"] = data["ScreenResolution"].apply(lambda x: 1 if "Touchscreen" in x else 0)
+    data["X_res"] = data["ScreenResolution"].str.split("x").str[0].str.extract(r"(\d+)").astype(int)
+    data["Y_res"] = data["ScreenResolution"].str.split("x").str[1].str.extract(r"(\d+)").astype(int)
+    data = data.drop("ScreenResolution", axis=1)
+    data["Cpu_brand"] = data["Cpu"].apply(lambda x: x.split()[0])
+    data = data.drop("Cpu", axis=1)
+    data["Gpu_brand"] = data["Gpu"].apply(lambda x: x.split()[0])
+    data = data.drop("Gpu", axis=1)
+
+    # HashingEncoder hashes row by row
+    def hash_row(value):
+        row = [0] * len(HASH_COLUMNS)
+        row[int(hashlib.md5(str(value).encode("utf-8")).hexdigest(), 16) % len(HASH_COLUMNS)] += 1
+        return row
+
+    hashed = pd.DataFrame([hash_row(v) for v in data["Product"]], columns=HASH_COLUMNS, index=data.index)
+    data = pd.concat([hashed, data.drop(columns=["Product"])], axis=1)
+    data["Price_euros"] = pd.to_numeric(data["Price_euros"], errors="coerce")
+    return data.dropna()
+
+
+def replicate(raw, scale):
+    big = pd.concat([raw] * scale, ignore_index=True)
+    big["laptop_ID"] = range(1, len(big) + 1)
+    return big
+
+
+def timed(fn, data):
+    start = time.perf_counter()
+    out = fn(data.copy())
+    return out, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=100)
+    args = parser.parse_args()
+
+    raw = replicate(load_raw(RAW_PATH), args.scale)
+    print(f"{len(raw):,} raw rows ({args.scale}x replica)")
+
+    expected, notebook_s = timed(notebook_clean, raw)
+    cleaned, vector_s = timed(clean_raw, raw)
+    assert cleaned.equals(expected), "vectorized cleaning diverged from the notebook"
+
+    print(f"notebook (row-wise apply)  {notebook_s:8.3f} s  {len(raw) / notebook_s:>12,.0f} rows/sec")
+    print(f"src/cleaning.py            {vector_s:8.3f} s  {len(raw) / vector_s:>12,.0f} rows/sec   {notebook_s / vector_s:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
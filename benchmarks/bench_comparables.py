@@ -0,0 +1,77 @@
+# bench_comparables.py
+# Comparable-laptop lookup: partitioned KD-tree index vs a vectorized brute-force
+# scan of the whole table, plus build time and incremental insert cost.
+#
+# Run from the repo root:  python benchmarks/bench_comparables.py [--rows 200000]
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.comparables import DEFAULT_K, ComparablesIndex, partition_key
+
+from synthetic import synthetic_clean
+
+QUERIES = 500
+
+
+def brute_force(index, companies, types, spec, k=DEFAULT_K):
+    """Scan every listing: partition mask, distances, partial sort."""
+    key = partition_key(spec["Company"], spec["TypeName"])
+    mask = (companies == key[0]) & (types == key[1])
+    ids = np.flatnonzero(mask)
+    d = np.sqrt(((index.points[ids] - index.vector(spec)) ** 2).sum(axis=1))
+    top = np.argpartition(d, min(k, len(d) - 1))[:k]
+    return ids[top[np.argsort(d[top])]]
+
+
+def per_call_us(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return (time.perf_counter() - start) / len(items) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    data = synthetic_clean(args.rows)
+    # Jitter the numeric specs a little so resampled rows are not exact duplicates
+    rng = np.random.default_rng(0)
+    for column in ("Weight", "Inches"):
+        data[column] = data[column] * (1.0 + rng.normal(0.0, 0.01, len(data)))
+    base, extra = data.iloc[: len(data) * 9 // 10], data.iloc[len(data) * 9 // 10:]
+
+    start = time.perf_counter()
+    index = ComparablesIndex(base)
+    print(f"build: {len(index):,} listings, {len(index.partitions)} partitions in {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    index.add(extra)
+    print(f"insert {len(extra):,} listings: {(time.perf_counter() - start) / len(extra) * 1e6:.1f} us each")
+
+    specs = data.sample(QUERIES, random_state=1).drop(columns=["Price_euros"]).to_dict("records")
+    companies = np.array([row["Company"].lower() for row in index.rows])
+    types = np.array([row["TypeName"].lower() for row in index.rows])
+
+    brute_us = per_call_us(lambda spec: brute_force(index, companies, types, spec), specs)
+    query_us = per_call_us(index.query, specs)
+    start = time.perf_counter()
+    index.query_batch(specs)
+    batch_us = (time.perf_counter() - start) / len(specs) * 1e6
+    print(f"\nk={DEFAULT_K} nearest, {QUERIES} queries")
+    print(f"  brute-force scan          {brute_us:9.1f} us/query")
+    print(f"  index.query               {query_us:9.1f} us/query   {brute_us / query_us:5.1f}x")
+    print(f"  index.query_batch         {batch_us:9.1f} us/query   {brute_us / batch_us:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
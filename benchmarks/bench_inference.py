@@ -0,0 +1,71 @@
+# bench_inference.py
+# Microbenchmark: sklearn model.predict vs the closed-form linear fast path.
+#
+# Run from the repo root:  python benchmarks/bench_inference.py
+
+import os
+import sys
+import random
+import timeit
+import warnings
+
+import joblib
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.encoder import get_encoder
+from src.inference import get_engine, predict_rows
+
+warnings.filterwarnings("ignore")
+
+N_SAMPLES = 1000
+REPEATS = 5
+
+
+def make_samples(encoder, n, seed=0):
+    """Random but valid spec dicts drawn from the encoder's category tables."""
+    rng = random.Random(seed)
+    tables = {field: list(values) for field, values in encoder.category_index.items()}
+    samples = []
+    for _ in range(n):
+        sample = {field: rng.choice(values) for field, values in tables.items()}
+        sample.update({
+            "Inches": rng.choice([13.3, 14.0, 15.6, 17.3]),
+            "Ram": rng.choice([4, 8, 16, 32]),
+            "Weight": round(rng.uniform(1.0, 3.5), 2),
+            "SSD": rng.choice([0, 128, 256, 512]),
+            "HDD": rng.choice([0, 500, 1024]),
+            "Hybrid": 0,
+            "Flash_Storage": 0,
+        })
+        samples.append(sample)
+    return samples
+
+
+def best_us_per_call(fn, samples):
+    """Best-of-REPEATS time per sample, in microseconds."""
+    runs = timeit.repeat(lambda: [fn(s) for s in samples], number=1, repeat=REPEATS)
+    return min(runs) / len(samples) * 1e6
+
+
+def main():
+    model = joblib.load(os.path.join(ROOT_DIR, "models", "best_model.pkl"))
+    feature_names = joblib.load(os.path.join(ROOT_DIR, "models", "feature_names.pkl"))
+    encoder = get_encoder(feature_names)
+    engine = get_engine(model, feature_names)
+    samples = make_samples(encoder, N_SAMPLES)
+
+    print(f"model: {type(model).__name__} (linear fast path: {engine.is_linear})")
+    results = {
+        "encode + sklearn predict": best_us_per_call(lambda s: model.predict(encoder.encode(s))[0], samples),
+        "encode + dot product": best_us_per_call(lambda s: predict_rows(model, encoder.encode(s))[0], samples),
+        "sparse coefficient sum": best_us_per_call(engine.predict_one, samples),
+    }
+    baseline = results["encode + sklearn predict"]
+    for name, us in results.items():
+        print(f"{name:<28} {us:9.2f} us/call   {baseline / us:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
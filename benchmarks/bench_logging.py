@@ -0,0 +1,66 @@
+# bench_logging.py
+# Per-event cost of log_event: the old makedirs + open/append/close vs the queued LogWriter.
+#
+# Run from the repo root:  python benchmarks/bench_logging.py [--events 100000]
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.logwriter import LogWriter
+
+
+def old_log_event(path, kind, field, value, message):
+    """log_event before the background writer."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            ts = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            f.write(f"[{ts}] {kind.upper()} | Field: {field} | Value: '{value}' | {message}\n")
+    except Exception as e:
+        print(f"⚠️ Logging event failed: {e}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--events", type=int, default=100000)
+    args = parser.parse_args()
+    n = args.events
+
+    with tempfile.TemporaryDirectory() as tmp:
+        old_path = os.path.join(tmp, "old", "input_errors.log")
+        start = time.perf_counter()
+        for i in range(n):
+            old_log_event(old_path, "warn", "PREDICT", str(7000.0 + i), "Unrealistic prediction generated.")
+        old = time.perf_counter() - start
+
+        writer = LogWriter(os.path.join(tmp, "new", "input_errors.log"), max_bytes=1 << 40)
+        writer.write("info", "WARMUP", "", "start writer thread")
+        writer.flush()
+        start = time.perf_counter()
+        for i in range(n):
+            writer.write("warn", "PREDICT", str(7000.0 + i), "Unrealistic prediction generated.")
+        enqueue = time.perf_counter() - start
+        writer.flush()
+        drained = time.perf_counter() - start
+        writer.close()
+
+        with open(writer.path, encoding="utf-8") as f:
+            lines = f.readlines()
+        assert len(lines) == n + 1 and json.loads(lines[-1])["value"] == str(7000.0 + n - 1)
+
+    print(f"{n:,} events")
+    print(f"  open/append/close per event    {old / n * 1e6:8.2f} µs/event")
+    print(f"  LogWriter enqueue (hot path)   {enqueue / n * 1e6:8.2f} µs/event   {old / enqueue:6.1f}x")
+    print(f"  LogWriter enqueue + drain      {drained / n * 1e6:8.2f} µs/event   {old / drained:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# bench_matrix_store.py
+# Loading the training matrix: CSV parse + get_dummies/reindex vs the mmap'd .npy store.
+#
+# Run from the repo root:  python benchmarks/bench_matrix_store.py [--scale 100]
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import warnings
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.matrix_store import PROCESSED_CSV, TARGET, export_matrix, load_matrix
+from src.registry import get_feature_names
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=100, help="copies of laptops_clean.csv")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+    feature_names = get_feature_names()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "laptops_clean.csv")
+        pd.concat([pd.read_csv(PROCESSED_CSV)] * args.scale, ignore_index=True).to_csv(csv_path, index=False)
+        store = os.path.join(tmp, "matrix")
+
+        start = time.perf_counter()
+        meta = export_matrix(csv_path, store, feature_names)
+        export_s = time.perf_counter() - start
+        print(f"{meta['n_rows']:,} rows x {meta['n_features']} features (export took {export_s:.3f} s)")
+
+        start = time.perf_counter()
+        data = pd.read_csv(csv_path)
+        X_csv = pd.get_dummies(data.drop(columns=[TARGET])).reindex(columns=feature_names, fill_value=0)
+        y_csv = data[TARGET]
+        csv_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        X, y, _ = load_matrix(store, feature_names)
+        mmap_s = time.perf_counter() - start
+
+        first_pass = time.perf_counter()
+        checksum = float(np.asarray(X).sum())  # touch every page once
+        first_pass = time.perf_counter() - first_pass
+
+        assert np.array_equal(X, X_csv.to_numpy(dtype=np.float64)) and np.array_equal(y, y_csv.to_numpy())
+        print(f"read_csv + get_dummies/reindex  {csv_s * 1e3:9.2f} ms")
+        print(f"np.load(mmap_mode='r')          {mmap_s * 1e3:9.2f} ms   {csv_s / mmap_s:8.0f}x")
+        print(f"first full pass over mmap'd X   {first_pass * 1e3:9.2f} ms   (checksum {checksum:.0f})")
+
+
+if __name__ == "__main__":
+    main()
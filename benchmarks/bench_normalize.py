@@ -0,0 +1,63 @@
+# bench_normalize.py
+# Normalizing messy supplier strings: per-row scalar normalizers vs normalize_series.
+#
+# Run from the repo root:  python benchmarks/bench_normalize.py [--rows 1000000]
+
+import os
+import sys
+import time
+import random
+import argparse
+
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.utils import normalize_company, normalize_type, normalize_opsys, normalize_series
+
+PIECES = {
+    "Company": ["Dell", "HP", "hp ", "Hewlett Packard", "msi", "Micro Star", "Lenovo", "ASUS", "acer", "Apple", "Toshiba"],
+    "TypeName": ["Notebook", "2-in-1", "2 in 1 Convertible", "Gaming Laptop", "ultrabook laptop", "Work Station", "Netbook"],
+    "OpSys": ["Windows 10", "win10 pro", "Windows 7", "Mac OS X", "macOS", "Ubuntu", "FreeDOS", "No OS", "Chrome OS", "Android"],
+}
+SCALAR = {
+    "Company": lambda v: normalize_company(v, quiet=True),
+    "TypeName": lambda v: normalize_type(v, quiet=True),
+    "OpSys": normalize_opsys,
+}
+
+
+def make_column(values, n, seed=0):
+    """n messy strings: a known value with random casing/padding/suffix noise."""
+    rng = random.Random(seed)
+    noise = ["", " ", "  ", " (2017)", " - refurbished", "_", ""]
+    pool = [f"{rng.choice(['', ' '])}{v if rng.random() < .5 else v.upper()}{rng.choice(noise)}"
+            for v in values for _ in range(40)]
+    return pd.Series(rng.choices(pool, k=n))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000000)
+    args = parser.parse_args()
+
+    print(f"{args.rows:,} rows per field")
+    for field, values in PIECES.items():
+        column = make_column(values, args.rows)
+        scalar = SCALAR[field]
+
+        start = time.perf_counter()
+        expected = [scalar(v) for v in column]
+        loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = normalize_series(column, field)
+        vectorized = time.perf_counter() - start
+
+        assert result.tolist() == expected
+        print(f"  {field:<9} per-row loop {loop:7.3f}s   normalize_series {vectorized:7.3f}s   {loop / vectorized:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# bench_parallel.py
+# Scaling of bulk scoring with the process pool: 1 .. N workers on a replica feed.
+#
+# Run from the repo root:  python benchmarks/bench_parallel.py [--scale 200] [--max-workers N]
+
+import os
+import sys
+import argparse
+import tempfile
+import warnings
+
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.bulk import score_file
+from src.cleaning import RAW_ENCODING, load_raw
+from src.parallel import default_workers
+from src.registry import get_model, get_feature_names
+
+RAW_PATH = os.path.join(ROOT_DIR, "data", "raw", "laptop_price.csv")
+
+
+def worker_counts(max_workers):
+    counts, n = [], 1
+    while n < max_workers:
+        counts.append(n)
+        n *= 2
+    return counts + [max_workers]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=200, help="copies of the raw CSV in the feed")
+    parser.add_argument("--max-workers", type=int, default=default_workers())
+    parser.add_argument("--chunk-size", type=int, default=20000)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    model, feature_names = get_model(), get_feature_names()
+    with tempfile.TemporaryDirectory() as tmp:
+        feed = os.path.join(tmp, "feed.csv")
+        raw = load_raw(RAW_PATH)
+        big = pd.concat([raw] * args.scale, ignore_index=True)
+        big["laptop_ID"] = range(1, len(big) + 1)
+        big.to_csv(feed, index=False, encoding=RAW_ENCODING)
+        print(f"{len(big):,} rows, chunk size {args.chunk_size:,}, {os.cpu_count()} CPU cores")
+
+        baseline = None
+        for workers in worker_counts(args.max_workers):
+            out = os.path.join(tmp, f"scored_{workers}.csv")
+            summary = score_file(feed, out, model, feature_names, chunk_size=args.chunk_size,
+                                 progress=False, workers=workers)
+            rate = summary["rows_per_sec"]
+            baseline = baseline or rate
+            speedup = rate / baseline
+            print(f"workers={workers:<3} {rate:>12,.0f} rows/sec   speedup {speedup:5.2f}x   "
+                  f"efficiency {speedup / workers:6.1%}")
+
+
+if __name__ == "__main__":
+    main()
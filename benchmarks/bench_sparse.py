@@ -0,0 +1,89 @@
+# bench_sparse.py
+# Dense vs sparse (CSR) encoding of synthetic feeds: matrix memory, encode / predict
+# / normal-equation time, and single-row dense vs index/value scoring.
+#
+# Run from the repo root:  python benchmarks/bench_sparse.py [--rows 200000]
+
+import os
+import sys
+import time
+import argparse
+import warnings
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.encoder import get_encoder
+from src.inference import get_engine, predict_rows
+from src.registry import get_feature_names, get_model
+from src.train import TARGET, TrainingState
+
+from synthetic import synthetic_clean
+
+
+def nbytes(matrix):
+    if hasattr(matrix, "indptr"):
+        return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+    return matrix.nbytes
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    model, feature_names = get_model(), get_feature_names()
+    encoder = get_encoder(feature_names)
+    data = synthetic_clean(args.rows)
+    features, y = data.drop(columns=[TARGET]), data[TARGET].to_numpy(dtype=np.float64)
+    print(f"{len(data):,} rows x {encoder.n_features} features")
+
+    dummies, dummies_s = timed(lambda: pd.get_dummies(features).reindex(columns=feature_names, fill_value=0))
+    variants = {
+        "get_dummies frame": (dummies, dummies_s, int(dummies.memory_usage(deep=True).sum())),
+    }
+    for label, fn in {
+        "dense float64": lambda: encoder.encode_batch(features),
+        "dense float32": lambda: encoder.encode_batch(features, out=np.zeros((len(features), encoder.n_features), np.float32)),
+        "CSR float64": lambda: encoder.encode_batch_sparse(features),
+        "CSR float32": lambda: encoder.encode_batch_sparse(features, np.float32),
+    }.items():
+        matrix, seconds = timed(fn)
+        variants[label] = (matrix, seconds, nbytes(matrix))
+
+    csr = variants["CSR float64"][0]
+    print(f"non-zeros: {csr.nnz / len(data):.1f} per row ({csr.nnz / csr.shape[0] / csr.shape[1]:.0%} dense)\n")
+    dense_bytes = variants["dense float64"][2]
+    print(f"{'layout':<22} {'memory':>10} {'vs dense':>9} {'encode':>10} {'predict':>10} {'X^T X fold':>11}")
+    for label, (matrix, encode_s, size) in variants.items():
+        row = f"{label:<22} {size / 1e6:8.1f}MB {size / dense_bytes:8.2f}x {encode_s * 1e3:8.1f}ms"
+        if label.startswith("get_dummies"):
+            # bool dummies + int/float numerics; sklearn converts it to dense float64 on predict
+            print(f"{row} {'-':>10} {'-':>11}")
+            continue
+        _, predict_s = timed(lambda: predict_rows(model, matrix))
+        state = TrainingState(feature_names)
+        _, fold_s = timed(lambda: state.update_arrays(matrix, y))
+        print(f"{row} {predict_s * 1e3:8.1f}ms {fold_s * 1e3:9.1f}ms")
+
+    # Single rows: dense encode + dot vs index/value pairs
+    engine = get_engine(model, feature_names)
+    records = features.head(2000).to_dict("records")
+    _, dense_s = timed(lambda: [predict_rows(model, encoder.encode(r)) for r in records])
+    _, pairs_s = timed(lambda: [engine.predict_pairs(*encoder.encode_pairs(r)) for r in records])
+    print(f"\nsingle row, dense encode + dot   {dense_s / len(records) * 1e6:7.2f} us")
+    print(f"single row, index/value pairs    {pairs_s / len(records) * 1e6:7.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# bench_startup.py
+# Startup time and per-rerun artifact cost: eager joblib.load vs the lazy registry
+# vs the compiled NumPy-only runtime artifact.
+#
+# Run from the repo root:  python benchmarks/bench_startup.py
+
+import os
+import sys
+import time
+import timeit
+import subprocess
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+REPEATS = 5
+RERUNS = 200
+
+SAMPLE = "{'Company': 'Dell', 'TypeName': 'Notebook', 'Ram': 8, 'SSD': 256, 'OpSys': 'Windows 10'}"
+
+# What importing streamlit/utils.py + app.py used to do before the first prediction
+EAGER_START = f"""
+import warnings; warnings.filterwarnings('ignore')
+import streamlit, joblib, pandas as pd
+model = joblib.load('models/best_model.pkl')
+feature_names = joblib.load('models/feature_names.pkl')
+model = joblib.load('models/best_model.pkl')
+row = pd.get_dummies(pd.DataFrame([{SAMPLE}])).reindex(columns=feature_names, fill_value=0)
+model.predict(row)
+"""
+
+# The CLI path now: no Streamlit, artifacts loaded once through the registry
+REGISTRY_START = f"""
+import warnings; warnings.filterwarnings('ignore')
+from src.registry import get_model, get_feature_names
+from src.utils import predict_specs
+predict_specs(get_model(), {SAMPLE}, get_feature_names())
+"""
+
+# Compiled artifact: NumPy only, no pickles (python -m src.runtime export)
+RUNTIME_START = f"""
+from src.runtime import RuntimeModel
+RuntimeModel.load().predict_one({SAMPLE})
+"""
+
+
+def time_subprocess(code):
+    """Best-of-REPEATS wall time for a fresh interpreter to run `code`, in seconds."""
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    import warnings
+    warnings.filterwarnings("ignore")
+    import joblib
+    from src import registry
+
+    print("time to first prediction (fresh process)")
+    eager = time_subprocess(EAGER_START)
+    lazy = time_subprocess(REGISTRY_START)
+    print(f"  eager (streamlit + joblib.load x3)   {eager * 1e3:8.1f} ms")
+    print(f"  registry CLI path                     {lazy * 1e3:8.1f} ms   {eager / lazy:5.1f}x")
+    if os.path.exists(os.path.join(ROOT_DIR, "models", "model_runtime.npz")):
+        compiled = time_subprocess(RUNTIME_START)
+        print(f"  NumPy runtime (model_runtime.npz)     {compiled * 1e3:8.1f} ms   {eager / compiled:5.1f}x")
+    else:
+        print("  NumPy runtime: run `python -m src.runtime export` first")
+
+    def eager_rerun():
+        joblib.load(registry.MODEL_PATH)
+        joblib.load(registry.FEATURES_PATH)
+
+    def registry_rerun():
+        registry.get_model()
+        registry.get_feature_names()
+
+    registry_rerun()  # warm the cache like the first Streamlit run does
+    print("artifact cost per Streamlit rerun")
+    eager_us = min(timeit.repeat(eager_rerun, number=RERUNS, repeat=REPEATS)) / RERUNS * 1e6
+    lazy_us = min(timeit.repeat(registry_rerun, number=RERUNS, repeat=REPEATS)) / RERUNS * 1e6
+    print(f"  joblib.load model + features          {eager_us:8.1f} us")
+    print(f"  registry lookup (stat only)           {lazy_us:8.1f} us   {eager_us / lazy_us:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# load_test.py
+# Load-test the HTTP prediction service: N concurrent keep-alive clients posting
+# /predict for a fixed duration; reports throughput and p50/p99 latency.
+#
+# Run from the repo root:
+#   python benchmarks/load_test.py                      # starts the service in-process, batched vs unbatched
+#   python benchmarks/load_test.py --url http://127.0.0.1:8000 --concurrency 64
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import threading
+import warnings
+from urllib.parse import urlsplit
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.service import PredictionService, DEFAULT_MAX_WAIT_MS
+from src.utils import VALID_COMPANIES, VALID_TYPES, VALID_OSS
+
+
+def make_specs(n, seed=0):
+    rng = random.Random(seed)
+    return [{
+        "Company": rng.choice(VALID_COMPANIES), "TypeName": rng.choice(VALID_TYPES),
+        "OpSys": rng.choice(VALID_OSS), "Cpu_brand": rng.choice(["Intel", "AMD"]),
+        "Gpu_brand": rng.choice(["Intel", "Nvidia", "AMD"]),
+        "Inches": rng.choice([13.3, 14.0, 15.6, 17.3]), "Ram": rng.choice([4, 8, 16, 32]),
+        "Weight": round(rng.uniform(1.0, 3.5), 2), "SSD": rng.choice([0, 128, 256, 512]),
+        "HDD": rng.choice([0, 500, 1000]), "Hybrid": 0, "Flash_Storage": 0,
+        "Touchscreen": rng.choice([0, 1]), "X_res": 1920, "Y_res": 1080,
+    } for _ in range(n)]
+
+
+async def client(host, port, bodies, deadline, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    i = 0
+    try:
+        while time.perf_counter() < deadline:
+            body = bodies[i % len(bodies)]
+            i += 1
+            started = time.perf_counter()
+            writer.write(
+                f"POST /predict HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+            )
+            await writer.drain()
+            status = int((await reader.readline()).split()[1])
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b""):
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, concurrency, duration, n_specs=1000):
+    bodies = [json.dumps(spec).encode("utf-8") for spec in make_specs(n_specs)]
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, bodies[k::concurrency] or bodies, deadline, latencies, errors)
+        for k in range(concurrency)
+    ))
+    elapsed = time.perf_counter() - started
+    ms = np.array(latencies) * 1000.0
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "req_per_sec": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3) if len(ms) else None,
+        "p99_ms": round(float(np.percentile(ms, 99)), 3) if len(ms) else None,
+    }
+
+
+def start_local_service(max_batch, max_wait_ms):
+    """Run a PredictionService on an ephemeral port in a daemon thread; returns it once listening."""
+    service = PredictionService(max_batch, max_wait_ms)
+    ready = threading.Event()
+
+    def run():
+        async def serve():
+            started = asyncio.Event()
+            task = asyncio.create_task(service.serve("127.0.0.1", 0, started))
+            await started.wait()
+            ready.set()
+            await task
+        asyncio.run(serve())
+
+    threading.Thread(target=run, daemon=True).start()
+    ready.wait()
+    return service
+
+
+def report(label, result, stats=None):
+    line = (f"{label:<28} {result['req_per_sec']:>10,.1f} req/s   p50 {result['p50_ms']:>8.3f} ms"
+            f"   p99 {result['p99_ms']:>8.3f} ms   errors {result['errors']}")
+    if stats:
+        line += f"   mean batch {stats['mean_batch_size']}"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None, help="target a running service instead of starting one")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per run")
+    parser.add_argument("--max-batch", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    if args.url:
+        target = urlsplit(args.url)
+        result = asyncio.run(run_load(target.hostname, target.port or 80, args.concurrency, args.duration))
+        report(args.url, result)
+        return
+
+    print(f"{args.concurrency} concurrent clients, {args.duration}s per run")
+    for label, max_batch in (("unbatched (max-batch 1)", 1), (f"micro-batched ({args.max_batch})", args.max_batch)):
+        service = start_local_service(max_batch, args.max_wait_ms)
+        result = asyncio.run(run_load("127.0.0.1", service.port, args.concurrency, args.duration))
+        report(label, result, service.batcher.stats())
+
+
+if __name__ == "__main__":
+    main()
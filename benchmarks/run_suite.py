@@ -0,0 +1,264 @@
+# run_suite.py
+# Offline benchmark suite: single-row latency, batch throughput, raw-feed cleaning,
+# training time and peak memory on synthetic feeds, checked against a baseline.
+#
+# Run from the repo root:
+#   python benchmarks/run_suite.py --save-baseline          # record this machine's baseline
+#   python benchmarks/run_suite.py                          # compare; exit 1 on a regression
+#   python benchmarks/run_suite.py --sizes 10000 --only batch cleaning --threshold 0.3
+#
+# Results are written as JSON (default benchmarks/results/latest.json). A metric
+# regresses when it is more than --threshold (a fraction) worse than the baseline:
+# slower, lower throughput or higher peak memory. Tail latencies are reported but
+# don't gate the run, since they are dominated by machine noise.
+
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+import warnings
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.registry import get_model, get_feature_names
+from src.cleaning import clean_raw, load_raw
+from src.encoder import get_encoder
+from src.utils import predict_specs, preprocess_input, predict_price, predict_batch
+
+from bench_inference import make_samples
+from synthetic import RAW_PATH, synthetic_raw
+
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+DEFAULT_OUT = os.path.join(RESULTS_DIR, "latest.json")
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+DEFAULT_SIZES = (10000, 1000000)
+DEFAULT_THRESHOLD = 0.25
+SINGLE_ROW_CALLS = 5000
+TARGET = "Price_euros"
+
+
+def size_label(n):
+    if n >= 1000000 and n % 1000000 == 0:
+        return f"{n // 1000000}m"
+    if n >= 1000 and n % 1000 == 0:
+        return f"{n // 1000}k"
+    return str(n)
+
+
+def best_seconds(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_mb(fn):
+    """Peak traced allocation (Python objects and NumPy buffers) during fn(), in MB."""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+class Context:
+    """Model, features and synthetic data shared by the benchmarks (built on demand)."""
+
+    def __init__(self, sizes, repeat):
+        self.sizes = sizes
+        self.repeat = repeat
+        self.model = get_model()
+        self.feature_names = get_feature_names()
+        self.source = load_raw(RAW_PATH)
+        self._raw = {}
+        self._clean = {}
+
+    def raw(self, n):
+        if n not in self._raw:
+            self._raw[n] = synthetic_raw(n, source=self.source)
+        return self._raw[n]
+
+    def clean(self, n):
+        if n not in self._clean:
+            self._clean[n] = clean_raw(self.raw(n).copy())
+        return self._clean[n]
+
+
+def metric(value, unit, better, gate=True):
+    return {"value": round(float(value), 4), "unit": unit, "better": better, "gate": gate}
+
+
+# ---------- Benchmarks ----------
+
+def bench_single_row(ctx):
+    samples = make_samples(get_encoder(ctx.feature_names), SINGLE_ROW_CALLS)
+    paths = {
+        "predict_specs": lambda s: predict_specs(ctx.model, s, ctx.feature_names),
+        "preprocess_predict_price": lambda s: predict_price(ctx.model, preprocess_input(s, ctx.feature_names)),
+    }
+    results = {}
+    for name, fn in paths.items():
+        for s in samples[:200]:  # warm up
+            fn(s)
+        timings = np.empty(len(samples))
+        for i, s in enumerate(samples):
+            start = time.perf_counter()
+            fn(s)
+            timings[i] = time.perf_counter() - start
+        p50, p99 = np.percentile(timings * 1e6, [50, 99])
+        results[f"single_row.{name}.p50_us"] = metric(p50, "us", "lower")
+        results[f"single_row.{name}.p99_us"] = metric(p99, "us", "lower", gate=False)
+    return results
+
+
+def bench_batch(ctx):
+    results = {}
+    for n in ctx.sizes:
+        records = ctx.clean(n).drop(columns=[TARGET])
+        run = lambda: predict_batch(ctx.model, records, ctx.feature_names)
+        seconds = best_seconds(run, ctx.repeat)
+        results[f"batch.{size_label(n)}.rows_per_sec"] = metric(n / seconds, "rows/s", "higher")
+        results[f"batch.{size_label(n)}.peak_mb"] = metric(peak_mb(run), "MB", "lower")
+    return results
+
+
+def bench_cleaning(ctx):
+    results = {}
+    for n in ctx.sizes:
+        raw = ctx.raw(n)
+        run = lambda: clean_raw(raw.copy())
+        seconds = best_seconds(run, ctx.repeat)
+        results[f"cleaning.{size_label(n)}.rows_per_sec"] = metric(n / seconds, "rows/s", "higher")
+        results[f"cleaning.{size_label(n)}.peak_mb"] = metric(peak_mb(run), "MB", "lower")
+    return results
+
+
+def train_notebook_models(data):
+    """03_model_training.ipynb's fit: split, get_dummies/align, scaler, both linear models."""
+    from sklearn.linear_model import LinearRegression
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    X = data.drop(columns=[TARGET])
+    y = data[TARGET]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=1)
+    X_train_encoded = pd.get_dummies(X_train)
+    X_test_encoded = pd.get_dummies(X_test)
+    X_train_encoded, X_test_encoded = X_train_encoded.align(X_test_encoded, join="left", axis=1, fill_value=0)
+
+    scaler = StandardScaler()
+    numeric_columns = X_train_encoded.select_dtypes(include=[np.number]).columns
+    X_train_scaled = X_train_encoded.copy()
+    X_train_scaled[numeric_columns] = scaler.fit_transform(X_train_encoded[numeric_columns])
+
+    LinearRegression().fit(X_train_scaled, np.log1p(y_train))
+    LinearRegression().fit(X_train_encoded, y_train)
+
+
+def bench_training(ctx):
+    results = {}
+    for n in ctx.sizes:
+        data = ctx.clean(n)
+        run = lambda: train_notebook_models(data)
+        results[f"training.{size_label(n)}.seconds"] = metric(best_seconds(run, ctx.repeat), "s", "lower")
+        results[f"training.{size_label(n)}.peak_mb"] = metric(peak_mb(run), "MB", "lower")
+    return results
+
+
+BENCHMARKS = {
+    "single_row": bench_single_row,
+    "batch": bench_batch,
+    "cleaning": bench_cleaning,
+    "training": bench_training,
+}
+
+
+# ---------- Baseline comparison ----------
+
+def compare(current, baseline, threshold):
+    """Print a comparison table; returns the gated metrics that regressed."""
+    regressions = []
+    print(f"\n{'metric':<44} {'baseline':>12} {'current':>12} {'change':>9}")
+    for key, cur in current["metrics"].items():
+        base = baseline["metrics"].get(key)
+        if base is None or not base["value"]:
+            print(f"{key:<44} {'-':>12} {cur['value']:>12.4g} {'new':>9}")
+            continue
+        change = (cur["value"] - base["value"]) / base["value"]
+        worse = change > threshold if cur["better"] == "lower" else change < -threshold
+        status = ""
+        if worse:
+            status = "  REGRESSION" if cur["gate"] else "  (worse, not gated)"
+            if cur["gate"]:
+                regressions.append(key)
+        print(f"{key:<44} {base['value']:>12.4g} {cur['value']:>12.4g} {change:>+8.1%}{status}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and compare against a baseline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="synthetic feed sizes")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run a subset")
+    parser.add_argument("--repeat", type=int, default=3, help="best-of repeats for throughput/time")
+    parser.add_argument("--out", default=DEFAULT_OUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed fraction worse than baseline before failing (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="also write the results as the baseline")
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    ctx = Context(args.sizes, args.repeat)
+    metrics = {}
+    for name in args.only or BENCHMARKS:
+        started = time.perf_counter()
+        metrics.update(BENCHMARKS[name](ctx))
+        print(f"{name:<12} done in {time.perf_counter() - started:6.1f}s", file=sys.stderr)
+
+    current = {
+        "meta": {
+            "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "python": platform.python_version(),
+            "machine": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "sizes": args.sizes,
+            "repeat": args.repeat,
+        },
+        "metrics": metrics,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    print(f"Results written to {args.out}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one.")
+        return
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(current, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} metric(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+    print(f"\n✅ No regressions beyond {args.threshold:.0%}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# synthetic.py
+# Synthetic supplier feeds: data/raw/laptop_price.csv resampled to any number of rows.
+#
+# Rows are drawn with replacement, get fresh laptop_IDs and a small price jitter, so
+# cleaning, encoding and training see realistic values at 10k / 1M-row scale.
+#
+# Run from the repo root:  python benchmarks/synthetic.py 1000000 data/raw/synthetic_1m.csv
+
+import os
+import sys
+import argparse
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from src.cleaning import RAW_ENCODING, load_raw, clean_raw
+
+RAW_PATH = os.path.join(ROOT_DIR, "data", "raw", "laptop_price.csv")
+PRICE_JITTER = 0.05
+
+
+def synthetic_raw(n_rows, seed=0, source=None):
+    """n_rows raw-feed rows (laptop_price.csv layout) resampled from the real file."""
+    source = load_raw(RAW_PATH) if source is None else source
+    rng = np.random.default_rng(seed)
+    data = source.iloc[rng.integers(0, len(source), n_rows)].reset_index(drop=True)
+    data["laptop_ID"] = np.arange(1, n_rows + 1)
+    jitter = 1.0 + rng.normal(0.0, PRICE_JITTER, n_rows)
+    data["Price_euros"] = (data["Price_euros"].to_numpy() * jitter).round(2)
+    return data
+
+
+def synthetic_clean(n_rows, seed=0):
+    """Cleaned frame (laptops_clean.csv layout) for a synthetic feed of n_rows."""
+    return clean_raw(synthetic_raw(n_rows, seed))
+
+
+def write_raw_csv(n_rows, path, seed=0):
+    synthetic_raw(n_rows, seed).to_csv(path, index=False, encoding=RAW_ENCODING)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic raw laptop feed")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("output")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    write_raw_csv(args.rows, args.output, args.seed)
+    print(f"Wrote {args.rows:,} rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
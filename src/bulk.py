@@ -0,0 +1,161 @@
+# bulk.py
+# Streaming bulk scoring of raw supplier feeds shaped like data/raw/laptop_price.csv.
+#
+#   parse -> clean -> encode -> predict -> write
+#
+# Each stage is a generator over fixed-size chunks, so memory is bounded by the
+# chunk size no matter how large the input file is. After every written chunk a
+# checkpoint records how many input rows are done and how long the output file
+# is; --resume truncates the output back to that length and skips those rows.
+
+import os
+import sys
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.cleaning import RAW_ENCODING, clean_raw
+from src.encoder import get_encoder
+from src.inference import predict_rows
+from src.metrics import get_metrics
+from src.utils import log_event
+
+DEFAULT_CHUNK_SIZE = 50000
+
+METRICS = get_metrics()
+
+
+def parse_chunks(input_path, chunk_size=DEFAULT_CHUNK_SIZE, skip_rows=0):
+    """Yield (row_offset, raw_chunk) pairs, starting after `skip_rows` data rows."""
+    skip = range(1, skip_rows + 1) if skip_rows else None
+    reader = pd.read_csv(input_path, encoding=RAW_ENCODING, chunksize=chunk_size, skiprows=skip)
+    offset = skip_rows
+    for chunk in reader:
+        yield offset, chunk
+        offset += len(chunk)
+
+
+def clean_chunks(chunks):
+    """Apply the notebook cleaning to each chunk, keeping one row per input row."""
+    for offset, raw in chunks:
+        ids = raw["laptop_ID"].to_numpy() if "laptop_ID" in raw.columns else None
+        yield offset, ids, clean_raw(raw, drop_invalid=False)
+
+
+def encode_chunks(chunks, feature_names, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Encode each cleaned chunk into one reused (chunk_size, n_features) buffer.
+
+    Also yields the positions of rows whose numeric fields did not parse (NaN after
+    cleaning); the encoder would otherwise price them as 0.
+    """
+    encoder = get_encoder(feature_names)
+    buffer = np.zeros((chunk_size, encoder.n_features), dtype=np.float64)
+    for offset, ids, clean in chunks:
+        numeric = [c for c in clean.columns if c in encoder.numeric_index]
+        invalid = np.flatnonzero(clean[numeric].isna().any(axis=1).to_numpy())
+        with METRICS.timer("encode"):
+            encoded = encoder.encode_batch(clean, out=buffer)
+        yield offset, ids, encoded, invalid
+
+
+def predict_chunks(chunks, model):
+    """Score each encoded chunk with one vectorized call; logs outliers like predict_price.
+
+    Rows with a missing or unparseable numeric value get a NaN (empty) prediction
+    and one log entry each instead of failing the chunk.
+    """
+    for offset, ids, encoded, invalid in chunks:
+        METRICS.inc("invalid_rows_total", len(invalid))
+        for i in invalid:
+            log_event("error", "BULK", f"row {offset + i}", "Missing or non-numeric value; prediction left empty")
+        with METRICS.timer("predict"):
+            if len(invalid):
+                preds = np.full(len(encoded), np.nan)
+                valid = np.setdiff1d(np.arange(len(encoded)), invalid)
+                preds[valid] = np.round(predict_rows(model, encoded[valid]), 4)
+            else:
+                preds = np.round(predict_rows(model, encoded), 4)
+        outliers = np.flatnonzero((preds < 100) | (preds > 6990))
+        METRICS.inc("outliers_total", len(outliers))
+        for i in outliers:
+            log_event("warn", "PREDICT", str(float(preds[i])), f"Unrealistic prediction generated: €{float(preds[i])}. (row {offset + i})")
+        yield offset, ids, preds
+
+
+def _write_checkpoint(path, state):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+
+def _read_checkpoint(path, input_path, output_path):
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    if state.get("input") != os.path.abspath(input_path) or state.get("output") != os.path.abspath(output_path):
+        raise ValueError(f"Checkpoint {path} belongs to a different input/output pair.")
+    return state
+
+
+def score_file(input_path, output_path, model, feature_names, chunk_size=DEFAULT_CHUNK_SIZE,
+               checkpoint_path=None, resume=False, progress=True, workers=1):
+    """Score a raw CSV in bounded memory; returns {'rows', 'seconds', 'rows_per_sec'}.
+
+    With workers > 1 the parse/clean/encode/predict stages run in a process pool
+    (see src/parallel.py); writing and checkpointing stay in this process.
+    """
+    checkpoint_path = checkpoint_path or output_path + ".ckpt"
+    state = _read_checkpoint(checkpoint_path, input_path, output_path) if resume else None
+
+    start_row = 0
+    if state is not None:
+        start_row = state["rows_done"]
+        # Drop anything written after the last checkpoint (e.g. a crash mid-chunk)
+        with open(output_path, "r+b") as f:
+            f.truncate(state["output_bytes"])
+        out = open(output_path, "a", encoding="utf-8", newline="")
+        write_header = False
+    else:
+        out = open(output_path, "w", encoding="utf-8", newline="")
+        write_header = True
+
+    rows = 0
+    started = time.perf_counter()
+    if workers > 1:
+        from src.parallel import score_chunks_parallel
+        pipeline = score_chunks_parallel(input_path, model, feature_names, chunk_size, start_row, workers)
+    else:
+        pipeline = predict_chunks(
+            encode_chunks(clean_chunks(parse_chunks(input_path, chunk_size, start_row)), feature_names, chunk_size),
+            model,
+        )
+    try:
+        for offset, ids, preds in pipeline:
+            result = pd.DataFrame({"row": np.arange(offset, offset + len(preds))})
+            if ids is not None:
+                result["laptop_ID"] = ids
+            result["Predicted_Price"] = preds
+            result.to_csv(out, header=write_header, index=False)
+            write_header = False
+            out.flush()
+
+            rows += len(preds)
+            _write_checkpoint(checkpoint_path, {
+                "input": os.path.abspath(input_path),
+                "output": os.path.abspath(output_path),
+                "rows_done": offset + len(preds),
+                "output_bytes": out.tell(),
+            })
+            if progress:
+                elapsed = time.perf_counter() - started
+                print(f"{offset + len(preds):>12,} rows  {rows / elapsed:>12,.0f} rows/sec", file=sys.stderr)
+    finally:
+        pipeline.close()  # shuts the worker pool down if we stop early
+        out.close()
+
+    elapsed = time.perf_counter() - started
+    return {"rows": rows, "seconds": round(elapsed, 3), "rows_per_sec": round(rows / elapsed, 1) if elapsed else None}
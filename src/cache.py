@@ -0,0 +1,174 @@
+# cache.py
+# Bounded LRU + TTL cache of predictions, keyed on the normalized spec.
+#
+# Popular configurations (Dell Notebook 8GB/512 SSD, ...) are asked for over and
+# over. The key is built after normalize_company / normalize_type / normalize_opsys,
+# so alias spellings ("hewlett packard", "HP ") land on the same entry. Entries are
+# tagged with registry.model_version() and the whole cache is dropped as soon as the
+# model or feature files change.
+
+import threading
+from collections import OrderedDict
+from time import monotonic
+
+from src import registry
+from src.encoder import FIELD_ALIASES, get_encoder
+from src.metrics import get_metrics
+from src.utils import normalize_company, normalize_type, normalize_opsys, predict_specs
+
+DEFAULT_MAXSIZE = 4096
+DEFAULT_TTL = 600.0  # seconds
+
+# How often (seconds) to stat the model files for a version change
+VERSION_CHECK_INTERVAL = 1.0
+
+# Fixed order for the known fields; anything else is appended sorted by name
+SPEC_FIELDS = (
+    "Company", "TypeName", "Inches", "Ram", "Weight", "OpSys",
+    "SSD", "HDD", "Hybrid", "Flash_Storage", "Cpu_brand", "Gpu_brand",
+)
+
+_NORMALIZERS = {
+    "Company": lambda v: normalize_company(v, quiet=True),
+    "TypeName": lambda v: normalize_type(v, quiet=True),
+    "OpSys": normalize_opsys,
+}
+
+
+def spec_key(sample_dict, feature_names=None):
+    """Return (normalized spec dict, hashable key) for a user spec.
+
+    Company/TypeName/OpSys go through the same normalizers as user input (unknown
+    values are kept as typed); Cpu/Gpu are renamed to Cpu_brand/Gpu_brand. With
+    feature_names, categories are then spelled the way the model was trained
+    ("No Os" -> "No OS"), so every alias of a value encodes identically.
+    """
+    encoder = get_encoder(feature_names) if feature_names is not None else None
+    spec = {}
+    for field, value in sample_dict.items():
+        field = FIELD_ALIASES.get(field, field)
+        if isinstance(value, str):
+            normalizer = _NORMALIZERS.get(field)
+            if normalizer is not None:
+                value = normalizer(value) or value.strip()
+            if encoder is not None:
+                value = encoder.resolve_category(field, value)
+        spec[field] = value
+
+    key = tuple(spec.get(field) for field in SPEC_FIELDS)
+    extras = sorted(field for field in spec if field not in SPEC_FIELDS)
+    if extras:
+        key += tuple((field, spec[field]) for field in extras)
+    return spec, key
+
+
+class PredictionCache:
+    """Thread-safe LRU of predictions with a per-entry TTL and hit/miss/eviction counters."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, ttl=DEFAULT_TTL, version_fn=registry.model_version, clock=monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._version_fn = version_fn
+        self._clock = clock
+        self._data = OrderedDict()  # key -> (expires_at, prediction)
+        self._lock = threading.Lock()
+        self._version = None
+        self._next_version_check = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _check_version(self, now):
+        # Called under the lock; stats the model files at most once per interval
+        if now < self._next_version_check:
+            return
+        self._next_version_check = now + VERSION_CHECK_INTERVAL
+        try:
+            version = self._version_fn()
+        except Exception:
+            version = None
+        if version != self._version:
+            if self._data:
+                self.invalidations += 1
+            self._data.clear()
+            self._version = version
+
+    def get(self, key):
+        """Cached prediction for `key`, or None on a miss."""
+        with self._lock:
+            now = self._clock()
+            self._check_version(now)
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        if value is None:
+            return
+        with self._lock:
+            now = self._clock()
+            self._check_version(now)
+            self._data[key] = (now + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "model_version": self._version,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    """Process-wide prediction cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PredictionCache()
+                get_metrics().register_collector("cache", _cache.stats)
+    return _cache
+
+
+def predict_cached(sample_dict, model, feature_names, cache=None):
+    """predict_specs behind the prediction cache (failed predictions are not cached)."""
+    cache = get_cache() if cache is None else cache
+    spec, key = spec_key(sample_dict, feature_names)
+    pred = cache.get(key)
+    if pred is None:
+        pred = predict_specs(model, spec, feature_names)
+        cache.put(key, pred)
+    return pred
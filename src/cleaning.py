@@ -0,0 +1,158 @@
+# cleaning.py
+# Raw -> clean transforms from notebooks/01_data_cleaning.ipynb, callable outside the notebook.
+#
+# Same output as the notebook (byte-identical to data/processed/laptops_clean.csv),
+# but vectorized: text columns are factorized first, the precompiled regexes run
+# once per *distinct* string with pandas string ops (str.extractall for the '+'
+# separated Memory parts), and results are broadcast back with the codes.
+
+import re
+import hashlib
+
+import numpy as np
+import pandas as pd
+
+RAW_ENCODING = "ISO-8859-1"
+
+# Product is hashed into this many columns (category_encoders.HashingEncoder, md5)
+N_HASH_COMPONENTS = 10
+HASH_COLUMNS = [f"col_{i}" for i in range(N_HASH_COMPONENTS)]
+
+STORAGE_COLUMNS = ["SSD", "HDD", "Hybrid", "Flash_Storage"]
+
+# Precompiled patterns
+MEMORY_PART_RE = re.compile(r"(?P<part>[^+]+)")       # '256GB SSD + 1TB HDD' -> parts
+DIGITS_RE = re.compile(r"(\d+)")                        # first integer in a part
+# First integer before the first 'x' and first integer between the first and second 'x',
+# i.e. str.split('x').str[0] / .str[1] followed by extract('(\d+)')
+RESOLUTION_RE = re.compile(r"^[^x\d]*(?P<X_res>\d+)?[^x]*(?:x[^x\d]*(?P<Y_res>\d+)?)?")
+FIRST_TOKEN_RE = re.compile(r"^\s*(\S+)")               # x.split()[0]
+
+
+def _by_unique(series):
+    """(codes, uniques) so a transform can run once per distinct value."""
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    return codes, pd.Series(uniques, dtype=object)
+
+
+def parse_memory(memory):
+    """Memory strings -> (n, 4) int64 array of SSD, HDD, Hybrid, Flash_Storage in GB.
+
+    '256GB SSD + 1TB HDD' -> [256, 1024, 0, 0]; a part's first integer, x1024 for TB.
+    """
+    codes, uniques = _by_unique(memory.astype(str))
+    parts = uniques.astype(str).str.extractall(MEMORY_PART_RE)["part"]
+
+    size = parts.str.extract(DIGITS_RE, expand=False).fillna("0").astype(np.int64).to_numpy()
+    size = np.where(parts.str.contains("TB", regex=False).to_numpy(), size * 1024, size)
+
+    # First matching storage type wins, in the notebook's if/elif order
+    kind = np.select(
+        [
+            parts.str.contains("SSD", regex=False).to_numpy(),
+            parts.str.contains("HDD", regex=False).to_numpy(),
+            parts.str.contains("Hybrid", regex=False).to_numpy(),
+            parts.str.contains("Flash", regex=False).to_numpy(),
+        ],
+        [0, 1, 2, 3],
+        default=-1,
+    )
+
+    per_unique = np.zeros((len(uniques), len(STORAGE_COLUMNS)), dtype=np.int64)
+    owner = parts.index.get_level_values(0).to_numpy()
+    known = kind >= 0
+    np.add.at(per_unique, (owner[known], kind[known]), size[known])
+    return per_unique[codes]
+
+
+def parse_resolution(screen, strict=True):
+    """Touchscreen flag plus X_res / Y_res, one regex pass per distinct string.
+
+    With strict=False a resolution without digits comes back as NaN instead of raising.
+    """
+    codes, uniques = _by_unique(screen)
+    uniques = uniques.astype(str)
+    touch = uniques.str.contains("Touchscreen", regex=False).astype(np.int64).to_numpy()
+    res = uniques.str.extract(RESOLUTION_RE)
+    if strict:
+        # astype(int) raises on a missing number, exactly like the notebook
+        x_res = res["X_res"].astype(np.int64).to_numpy()
+        y_res = res["Y_res"].astype(np.int64).to_numpy()
+    else:
+        x_res = pd.to_numeric(res["X_res"], errors="coerce").to_numpy(dtype=np.float64)
+        y_res = pd.to_numeric(res["Y_res"], errors="coerce").to_numpy(dtype=np.float64)
+    return touch[codes], x_res[codes], y_res[codes]
+
+
+def first_token(series, strict=True):
+    """Vectorized `x.split()[0]` (brand name of a Cpu/Gpu string); blank -> None with strict=False."""
+    codes, uniques = _by_unique(series)
+    tokens = uniques.astype(str).str.extract(FIRST_TOKEN_RE, expand=False)
+    if strict and tokens.isna().any():
+        raise IndexError("list index out of range")  # same failure as ''.split()[0]
+    return tokens.astype(object).where(tokens.notna(), None).to_numpy(dtype=object)[codes]
+
+
+def hash_product(products, n_components=N_HASH_COMPONENTS):
+    """Same buckets as HashingEncoder(cols=['Product'], n_components=10): md5(value) % n."""
+    codes, uniques = _by_unique(products)
+    buckets = np.array(
+        [-1 if v is None else int(hashlib.md5(str(v).encode("utf-8")).hexdigest(), 16) % n_components
+         for v in uniques],
+        dtype=np.intp,
+    )
+    hashed = np.zeros((len(products), n_components), dtype=np.int64)
+    rows = np.flatnonzero(buckets[codes] >= 0)
+    hashed[rows, buckets[codes][rows]] = 1
+    return pd.DataFrame(hashed, columns=[f"col_{i}" for i in range(n_components)], index=products.index)
+
+
+def clean_raw(data, drop_invalid=True):
+    """Apply the notebook's cleaning steps to a raw laptop_price.csv frame.
+
+    With drop_invalid=False every input row is kept (bulk scoring needs one output
+    row per input row): a missing or unparseable Ram, Weight or resolution becomes
+    NaN instead of raising, and Price_euros is optional for the same reason.
+    """
+    strict = drop_invalid
+    data = data.drop(columns=["laptop_ID"], errors="ignore")
+
+    # Ram / Weight to numeric
+    ram = data["Ram"].astype(str).str.replace("GB", "", regex=False)
+    weight = data["Weight"].astype(str).str.replace("kg", "", regex=False)
+    if strict:
+        data["Ram"] = ram.astype(int)
+        data["Weight"] = weight.astype(float)
+    else:
+        data["Ram"] = pd.to_numeric(ram, errors="coerce")
+        data["Weight"] = pd.to_numeric(weight, errors="coerce")
+
+    # Memory -> SSD / HDD / Hybrid / Flash_Storage
+    storage = parse_memory(data["Memory"])
+    for i, col in enumerate(STORAGE_COLUMNS):
+        data[col] = storage[:, i]
+    data = data.drop("Memory", axis=1)
+
+    # ScreenResolution -> Touchscreen, X_res, Y_res
+    data["Touchscreen"], data["X_res"], data["Y_res"] = parse_resolution(data["ScreenResolution"], strict)
+    data = data.drop("ScreenResolution", axis=1)
+
+    # CPU / GPU brand
+    data["Cpu_brand"] = first_token(data["Cpu"], strict)
+    data = data.drop("Cpu", axis=1)
+    data["Gpu_brand"] = first_token(data["Gpu"], strict)
+    data = data.drop("Gpu", axis=1)
+
+    # Product -> hashed columns (placed first, like HashingEncoder)
+    hashed = hash_product(data["Product"])
+    data = pd.concat([hashed, data.drop(columns=["Product"])], axis=1)
+
+    if "Price_euros" in data.columns:
+        data["Price_euros"] = pd.to_numeric(data["Price_euros"], errors="coerce")
+    if drop_invalid:
+        data = data.dropna()
+    return data
+
+
+def load_raw(path):
+    return pd.read_csv(path, encoding=RAW_ENCODING)
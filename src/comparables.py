@@ -0,0 +1,301 @@
+# comparables.py
+# "Comparable laptops": the k real listings closest to a spec, from an indexed
+# copy of data/processed/laptops_clean.csv.
+#
+# Listings are partitioned by (Company, TypeName) and each partition keeps a KD-tree
+# over the standardized numeric specs (COMPARABLE_FEATURES), so a query only walks
+# the few dozen listings of its own partition instead of scanning the table. If a
+# partition has fewer than k listings the rest are filled from a tree over all of them.
+#
+# New listings are inserted without a rebuild: they go to the partition's pending
+# list, which queries scan alongside the tree, and the tree is rebuilt once the
+# pending list outgrows REBUILD_FRACTION of it. The standardization (mean/std) is
+# fixed when the index is built; `build` again to refresh it.
+#
+# Missing numeric fields in a query (the app has no resolution inputs) are taken at
+# the dataset mean, i.e. they do not pull neighbours either way.
+#
+#   python -m src.comparables build                    # writes models/comparables.pkl
+#   python -m src.comparables add new_listings.csv     # insert (processed layout)
+#   python -m src.comparables query specs.csv out.csv -k 5
+#   python -m src.comparables info
+
+import os
+import sys
+import argparse
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from scipy.spatial import KDTree
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src import registry
+from src.encoder import FIELD_ALIASES
+
+DATA_PATH = os.path.join(ROOT_DIR, "data", "processed", "laptops_clean.csv")
+INDEX_PATH = os.path.join(registry.MODELS_DIR, "comparables.pkl")
+
+COMPARABLE_FEATURES = ("Ram", "Inches", "Weight", "SSD", "HDD", "X_res", "Y_res")
+PARTITION_FIELDS = ("Company", "TypeName")
+DISPLAY_COLUMNS = ("Company", "TypeName", "Cpu_brand", "Gpu_brand", "OpSys", "Inches", "Ram",
+                   "SSD", "HDD", "Weight", "X_res", "Y_res", "Price_euros")
+DEFAULT_K = 5
+REBUILD_FRACTION = 0.25
+REBUILD_MIN = 16
+LEAF_SIZE = 16
+
+
+def partition_key(company, typename):
+    return (str(company).strip().lower(), str(typename).strip().lower())
+
+
+class _Partition:
+    """KD-tree over some listing ids plus a brute-force-scanned list of pending inserts."""
+
+    def __init__(self, ids, points):
+        self._build(ids, points)
+
+    def _build(self, ids, points):
+        self.ids = np.asarray(ids, dtype=np.intp)
+        self.tree = KDTree(points[self.ids], leafsize=LEAF_SIZE) if len(self.ids) else None
+        self.pending = []
+
+    def __len__(self):
+        return len(self.ids) + len(self.pending)
+
+    def state(self):
+        return self.ids, list(self.pending), self.tree
+
+    @classmethod
+    def restore(cls, ids, pending, tree):
+        part = cls.__new__(cls)
+        part.ids, part.pending, part.tree = ids, list(pending), tree
+        return part
+
+    def insert(self, i, points):
+        self.pending.append(i)
+        if len(self.pending) > max(REBUILD_MIN, REBUILD_FRACTION * len(self.ids)):
+            self._build(np.concatenate([self.ids, self.pending]), points)
+
+    def query(self, Q, k, points):
+        """(distances, ids) of shape (len(Q), min(k, len(self))), nearest first."""
+        k = min(k, len(self))
+        dist = np.empty((len(Q), 0))
+        ids = np.empty((len(Q), 0), dtype=np.intp)
+        if self.tree is not None and k:
+            kt = min(k, len(self.ids))
+            d, j = self.tree.query(Q, k=kt)
+            dist, ids = d.reshape(len(Q), kt), self.ids[j.reshape(len(Q), kt)]
+        if self.pending and k:
+            pending = np.asarray(self.pending, dtype=np.intp)
+            d = np.sqrt(((Q[:, None, :] - points[pending][None, :, :]) ** 2).sum(axis=2))
+            dist = np.hstack([dist, d])
+            ids = np.hstack([ids, np.broadcast_to(pending, d.shape)])
+            order = np.argsort(dist, axis=1, kind="stable")[:, :k]
+            dist, ids = np.take_along_axis(dist, order, 1), np.take_along_axis(ids, order, 1)
+        return dist, ids
+
+
+class ComparablesIndex:
+    """Listings + per-(Company, TypeName) KD-trees over standardized numeric specs."""
+
+    def __init__(self, listings, features=COMPARABLE_FEATURES, meta=None):
+        missing = [c for c in (*features, *PARTITION_FIELDS) if c not in listings.columns]
+        if missing:
+            raise ValueError(f"Listings are missing columns {missing}")
+        self.features = tuple(features)
+        self.columns = [c for c in DISPLAY_COLUMNS if c in listings.columns]
+        values = listings[list(self.features)].to_numpy(dtype=np.float64)
+        self.mean = values.mean(axis=0)
+        self.scale = values.std(axis=0)
+        self.scale[self.scale == 0] = 1.0
+        self.meta = dict(meta or {}, features=list(self.features))
+
+        self.rows = listings[self.columns].to_dict("records")
+        self.points = self.transform(values)
+        self.partitions = {}
+        keys = [partition_key(c, t) for c, t in zip(listings["Company"], listings["TypeName"])]
+        groups = {}
+        for i, key in enumerate(keys):
+            groups.setdefault(key, []).append(i)
+        for key, ids in groups.items():
+            self.partitions[key] = _Partition(ids, self.points)
+        self.everything = _Partition(np.arange(len(self.rows)), self.points)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def transform(self, values):
+        return (np.asarray(values, dtype=np.float64) - self.mean) / self.scale
+
+    def vector(self, spec):
+        """Standardized query point of a spec; missing / None features sit at the mean (0)."""
+        spec = {FIELD_ALIASES.get(k, k): v for k, v in spec.items()}
+        values = [spec.get(f) for f in self.features]
+        return np.array([0.0 if v is None else (float(v) - m) / s
+                         for v, m, s in zip(values, self.mean, self.scale)])
+
+    # ---------- Queries ----------
+
+    def _results(self, dist, ids, same):
+        return [dict(self.rows[i], distance=round(float(d), 4), same_partition=same) for d, i in zip(dist, ids)]
+
+    def _fill(self, q, k, found):
+        """Top up a short partition result from the whole index, skipping ids already found."""
+        dist, ids = self.everything.query(q[None, :], k + len(found), self.points)
+        keep = ~np.isin(ids[0], found)
+        return dist[0][keep][:k - len(found)], ids[0][keep][:k - len(found)]
+
+    def query(self, spec, k=DEFAULT_K):
+        """The k listings nearest to `spec`, nearest first, same Company/TypeName preferred."""
+        return self.query_batch([spec], k)[0]
+
+    def query_batch(self, specs, k=DEFAULT_K):
+        """query() for many specs: each partition's tree is searched once for all of its specs."""
+        specs = [{FIELD_ALIASES.get(f, f): v for f, v in spec.items()} for spec in specs]
+        Q = np.array([self.vector(spec) for spec in specs]).reshape(len(specs), len(self.features))
+        groups = {}
+        for n, spec in enumerate(specs):
+            groups.setdefault(partition_key(spec.get("Company"), spec.get("TypeName")), []).append(n)
+
+        results = [None] * len(specs)
+        for key, members in groups.items():
+            part = self.partitions.get(key)
+            if part is not None:
+                dist, ids = part.query(Q[members], k, self.points)
+            else:
+                dist, ids = np.empty((len(members), 0)), np.empty((len(members), 0), dtype=np.intp)
+            for row, n in enumerate(members):
+                found = self._results(dist[row], ids[row], True)
+                if len(found) < k:
+                    more_dist, more_ids = self._fill(Q[n], k, ids[row])
+                    found += self._results(more_dist, more_ids, False)
+                results[n] = found
+        return results
+
+    # ---------- Updates ----------
+
+    def add(self, listings):
+        """Insert new listings (a DataFrame in the processed layout); returns how many were added."""
+        missing = [c for c in (*self.features, *PARTITION_FIELDS) if c not in listings.columns]
+        if missing:
+            raise ValueError(f"Listings are missing columns {missing}")
+        points = self.transform(listings[list(self.features)].to_numpy(dtype=np.float64))
+        start = len(self.rows)
+        self.points = np.vstack([self.points, points])
+        self.rows.extend(listings.reindex(columns=self.columns).to_dict("records"))
+        for i, (company, typename) in enumerate(zip(listings["Company"], listings["TypeName"]), start):
+            key = partition_key(company, typename)
+            part = self.partitions.get(key)
+            if part is None:
+                self.partitions[key] = _Partition([i], self.points)
+            else:
+                part.insert(i, self.points)
+            self.everything.insert(i, self.points)
+        self.meta["added"] = self.meta.get("added", 0) + len(listings)
+        return len(listings)
+
+    def save(self, path=INDEX_PATH):
+        """Persist the trees as built (plain dict of arrays, lists and scipy KD-trees)."""
+        import joblib
+        state = {
+            "features": self.features, "columns": self.columns, "mean": self.mean, "scale": self.scale,
+            "meta": self.meta, "points": self.points,
+            "data": {c: [row.get(c) for row in self.rows] for c in self.columns},
+            "partitions": {key: part.state() for key, part in self.partitions.items()},
+            "everything": self.everything.state(),
+        }
+        tmp = path + ".tmp"
+        joblib.dump(state, tmp, compress=3)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        import joblib
+        state = joblib.load(path)
+        index = cls.__new__(cls)
+        index.features, index.columns = tuple(state["features"]), list(state["columns"])
+        index.mean, index.scale, index.meta, index.points = state["mean"], state["scale"], state["meta"], state["points"]
+        data = state["data"]
+        index.rows = [dict(zip(index.columns, values)) for values in zip(*(data[c] for c in index.columns))]
+        index.partitions = {key: _Partition.restore(*part) for key, part in state["partitions"].items()}
+        index.everything = _Partition.restore(*state["everything"])
+        return index
+
+    def summary(self):
+        sizes = [len(p) for p in self.partitions.values()]
+        return dict(self.meta, listings=len(self), partitions=len(self.partitions),
+                    largest_partition=max(sizes, default=0),
+                    pending=sum(len(p.pending) for p in self.partitions.values()))
+
+
+def build_index(data_path=DATA_PATH, path=INDEX_PATH):
+    """Index every listing in the processed CSV and persist it."""
+    listings = pd.read_csv(data_path)
+    meta = {"source": os.path.relpath(data_path, ROOT_DIR), "source_digest": registry.file_digest(data_path),
+            "built": datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+    index = ComparablesIndex(listings, meta=meta)
+    index.save(path)
+    return index
+
+
+def get_comparables(path=INDEX_PATH):
+    """The persisted index (reloaded only when the file changes), or None if it was never built."""
+    try:
+        return registry.load_artifact(path, loader=ComparablesIndex.load)
+    except (OSError, EOFError, KeyError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Comparable-laptop nearest-neighbour index")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="index the processed dataset")
+    build.add_argument("--data", default=DATA_PATH)
+    add = sub.add_parser("add", help="insert new listings (processed CSV layout)")
+    add.add_argument("input")
+    query = sub.add_parser("query", help="k nearest listings for every spec row in a CSV")
+    query.add_argument("input")
+    query.add_argument("output")
+    query.add_argument("-k", type=int, default=DEFAULT_K)
+    sub.add_parser("info")
+    for p in sub.choices.values():
+        p.add_argument("--index", default=INDEX_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        index = build_index(args.data, args.index)
+        print(f"Indexed {len(index):,} listings in {len(index.partitions)} partitions -> {args.index}")
+        return
+
+    index = get_comparables(args.index)
+    if index is None:
+        print(f"⚠️ No comparables index at {args.index}; run `python -m src.comparables build` first.")
+        sys.exit(1)
+    try:
+        if args.command == "add":
+            added = index.add(pd.read_csv(args.input))
+            index.save(args.index)
+            print(f"Added {added:,} listings ({len(index):,} total) -> {args.index}")
+        elif args.command == "query":
+            specs = pd.read_csv(args.input)
+            specs = specs.astype(object).where(specs.notna(), None).to_dict("records")
+            rows = [dict(query=n, rank=r + 1, **match)
+                    for n, matches in enumerate(index.query_batch(specs, args.k))
+                    for r, match in enumerate(matches)]
+            pd.DataFrame(rows).to_csv(args.output, index=False)
+            print(f"Wrote {len(rows):,} comparables for {len(specs):,} specs -> {args.output}")
+        else:
+            import json
+            print(json.dumps(index.summary(), indent=2, default=str))
+    except (OSError, ValueError) as e:
+        print(f"⚠️ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,27 @@
 # utils.py
 
+import os
+import sys
 import pandas as pd
 import joblib
-from datetime import datetime
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.logwriter import get_log_writer
 
 # Paths
 MODEL_PATH = "models/laptop_price_model.pkl"
 FEATURES_PATH = "models/feature_names.pkl"
-LOG_FILE = "logs/input_errors.log"
 
 # load model + features
 model = joblib.load(MODEL_PATH)
 feature_names = joblib.load(FEATURES_PATH)
 
 def log_error(field, value, message):
-    """Save invalid user attempts to a log file."""
-    with open(LOG_FILE, "a") as f:
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        f.write(f"[{timestamp}] Field: {field}, value: '{value}', Error: {message}\n")
+    """Save invalid user attempts to the log file (queued; written in the background)."""
+    get_log_writer().write("error", field, value, message)
 
 
 def safe_numeric(prompt, cast_type=float, default=None, min_val=None, max_val=None, field=""):
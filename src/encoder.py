@@ -0,0 +1,218 @@
+# encoder.py
+# Compiled replacement for `pd.get_dummies(...).reindex(columns=feature_names, fill_value=0)`.
+
+import threading
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from src.metrics import get_metrics
+from src.vocabulary import Vocabulary
+
+METRICS = get_metrics()
+
+# Fields one-hot encoded at training time (see 03_model_training.ipynb)
+CATEGORICAL_FIELDS = ("Company", "TypeName", "OpSys", "Cpu_brand", "Gpu_brand")
+
+# Input keys that map onto a different training-time column
+FIELD_ALIASES = {"Cpu": "Cpu_brand", "Gpu": "Gpu_brand"}
+
+
+class FeatureEncoder:
+    """Encode spec dicts straight into the column layout of feature_names.pkl.
+
+    Built once from the feature list: every `<field>_<value>` dummy column gets an
+    entry in a per-field category -> column-index table, every other column is a
+    fixed numeric slot. Unknown categories and missing fields stay 0, exactly like
+    the reindex(fill_value=0) they replace.
+    """
+
+    def __init__(self, feature_names):
+        self.vocabulary = Vocabulary(feature_names)
+        self.feature_names = self.vocabulary.to_list()
+        self.n_features = len(self.feature_names)
+
+        self.category_index = {field: {} for field in CATEGORICAL_FIELDS}
+        self.numeric_index = {}
+        for i, name in enumerate(self.feature_names):
+            for field in CATEGORICAL_FIELDS:
+                if name.startswith(field + "_"):
+                    self.category_index[field][name[len(field) + 1:]] = i
+                    break
+            else:
+                self.numeric_index[name] = i
+
+        # Case-insensitive view of the category tables, e.g. "no os" -> "No OS"
+        self.category_spelling = {
+            field: {value.lower(): value for value in table}
+            for field, table in self.category_index.items()
+        }
+
+        self._local = threading.local()
+
+    def resolve_category(self, field, value):
+        """Spell `value` the way the model saw it in training, matching case-insensitively."""
+        table = self.category_index.get(field)
+        if table is None or value in table:
+            return value
+        return self.category_spelling[field].get(value.lower(), value)
+
+    def _row_buffer(self):
+        """Per-thread reusable row (Streamlit serves sessions from several threads)."""
+        row = getattr(self._local, "row", None)
+        if row is None:
+            row = np.zeros((1, self.n_features), dtype=np.float64)
+            self._local.row = row
+        return row
+
+    def encode(self, sample_dict, out=None):
+        """Write one spec dict into a (1, n_features) float64 row and return it.
+
+        Without `out` the row is a per-thread buffer that the next call overwrites,
+        so copy it if you need to keep it around.
+        """
+        row = self._row_buffer() if out is None else out
+        row.fill(0.0)
+        flat = row.reshape(-1)
+        for key, value in sample_dict.items():
+            key = FIELD_ALIASES.get(key, key)
+            if value is None:
+                continue
+            if isinstance(value, str):
+                i = self.category_index.get(key, {}).get(value)
+                if i is not None:
+                    flat[i] = 1.0
+            else:
+                i = self.numeric_index.get(key)
+                if i is not None:
+                    flat[i] = value
+        return row
+
+    def encode_batch(self, frame, out=None):
+        """Encode a DataFrame (or list of dicts) into an (n_rows, n_features) float64 matrix.
+
+        Missing (NaN) numeric cells encode as 0, the same as a field left out of encode().
+        Pass a preallocated `out` with at least len(frame) rows to reuse it across chunks.
+        """
+        if not isinstance(frame, pd.DataFrame):
+            frame = pd.DataFrame.from_records(list(frame))
+        n_rows = len(frame)
+        if out is None:
+            out = np.zeros((n_rows, self.n_features), dtype=np.float64)
+        else:
+            out = out[:n_rows]
+            out.fill(0.0)
+
+        for col in frame.columns:
+            series = frame[col]
+            key = FIELD_ALIASES.get(col, col)
+            if pd.api.types.is_numeric_dtype(series):
+                i = self.numeric_index.get(key)
+                if i is not None:
+                    # Missing cells (keys absent from some records) are 0, like reindex(fill_value=0)
+                    column = out[:, i]
+                    column[:] = series.to_numpy(dtype=np.float64)
+                    column[np.isnan(column)] = 0.0
+                continue
+
+            lookup = self.category_index.get(key)
+            if not lookup:
+                continue
+            codes = series.map(lookup).to_numpy(dtype=np.float64)
+            rows = np.flatnonzero(~np.isnan(codes))
+            out[rows, codes[rows].astype(np.intp)] = 1.0
+            if METRICS.enabled:
+                seen = int(series.notna().sum())
+                METRICS.inc("categories_seen_total", seen, field=key)
+                METRICS.inc("categories_dropped_total", seen - len(rows), field=key)
+        return out
+
+    def encode_pairs(self, sample_dict):
+        """Sparse form of encode(): (column indices, values) of the non-zero entries."""
+        indices, values = [], []
+        for key, value in sample_dict.items():
+            key = FIELD_ALIASES.get(key, key)
+            if value is None:
+                continue
+            if isinstance(value, str):
+                i = self.category_index.get(key, {}).get(value)
+                if i is not None:
+                    indices.append(i)
+                    values.append(1.0)
+            else:
+                i = self.numeric_index.get(key)
+                if i is not None and value != 0:
+                    indices.append(i)
+                    values.append(float(value))
+        return np.asarray(indices, dtype=np.int32), np.asarray(values, dtype=np.float64)
+
+    def encode_batch_sparse(self, frame, dtype=np.float64):
+        """Encode a DataFrame (or list of dicts) into an (n_rows, n_features) scipy CSR matrix.
+
+        Same layout as encode_batch, but only non-zero entries are stored: one per
+        matched categorical value and one per non-zero numeric value.
+        """
+        from scipy import sparse
+
+        if not isinstance(frame, pd.DataFrame):
+            frame = pd.DataFrame.from_records(list(frame))
+        n_rows = len(frame)
+        rows, cols, vals = [], [], []
+        for col in frame.columns:
+            series = frame[col]
+            key = FIELD_ALIASES.get(col, col)
+            if pd.api.types.is_numeric_dtype(series):
+                i = self.numeric_index.get(key)
+                if i is None:
+                    continue
+                values = series.to_numpy(dtype=np.float64)
+                nz = np.flatnonzero((values != 0) & ~np.isnan(values))
+                rows.append(nz)
+                cols.append(np.full(len(nz), i, dtype=np.int32))
+                vals.append(values[nz])
+                continue
+
+            lookup = self.category_index.get(key)
+            if not lookup:
+                continue
+            codes = series.map(lookup).to_numpy(dtype=np.float64)
+            hit = np.flatnonzero(~np.isnan(codes))
+            rows.append(hit)
+            cols.append(codes[hit].astype(np.int32))
+            vals.append(np.ones(len(hit)))
+            if METRICS.enabled:
+                seen = int(series.notna().sum())
+                METRICS.inc("categories_seen_total", seen, field=key)
+                METRICS.inc("categories_dropped_total", seen - len(hit), field=key)
+
+        if not rows:
+            return sparse.csr_matrix((n_rows, self.n_features), dtype=dtype)
+        matrix = sparse.coo_matrix(
+            (np.concatenate(vals).astype(dtype, copy=False), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(n_rows, self.n_features),
+        )
+        return matrix.tocsr()
+
+    def record_categories(self, sample_dict):
+        """Metrics only: count categorical values, and those with no dummy column
+        (what reindex(fill_value=0) silently zeroes)."""
+        for key, value in sample_dict.items():
+            key = FIELD_ALIASES.get(key, key)
+            table = self.category_index.get(key)
+            if table is not None and isinstance(value, str):
+                METRICS.inc("categories_seen_total", field=key)
+                if value not in table:
+                    METRICS.inc("categories_dropped_total", field=key)
+
+
+@lru_cache(maxsize=8)
+def _encoder_for(names):
+    return FeatureEncoder(names)
+
+
+def get_encoder(feature_names):
+    """Return the compiled encoder for this feature list or Vocabulary (built once per layout)."""
+    if isinstance(feature_names, Vocabulary):
+        return _encoder_for(feature_names.names)
+    return _encoder_for(tuple(feature_names))
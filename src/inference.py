@@ -0,0 +1,126 @@
+# inference.py
+# Closed-form scoring for linear models, with a model.predict fallback for anything else.
+
+import warnings
+import weakref
+
+import numpy as np
+
+from src.encoder import FIELD_ALIASES, get_encoder
+
+
+def is_linear_model(model, n_features):
+    """True for sklearn linear regressors with one coefficient per feature."""
+    coef = getattr(model, "coef_", None)
+    return (
+        type(model).__module__.startswith("sklearn.linear_model")
+        and coef is not None
+        and hasattr(model, "intercept_")
+        and np.ndim(coef) == 1
+        and len(coef) == n_features
+    )
+
+
+def additive_price(intercept, category_coef, numeric_coef, sample_dict):
+    """intercept + the coefficient of each categorical value + numeric value * coef.
+
+    category_coef is {field: {value: coef}}, numeric_coef {feature: coef}; unknown
+    fields and categories contribute 0, like the reindex(fill_value=0) encoding.
+    """
+    price = intercept
+    for key, value in sample_dict.items():
+        key = FIELD_ALIASES.get(key, key)
+        if value is None:
+            continue
+        if isinstance(value, str):
+            table = category_coef.get(key)
+            if table is not None:
+                price += table.get(value, 0.0)
+        else:
+            price += numeric_coef.get(key, 0.0) * value
+    return price
+
+
+def sklearn_predict(model, X):
+    """model.predict on rows laid out like feature_names.
+
+    The rows are plain NumPy arrays, so sklearn's "fitted with feature names" warning
+    is noise here; it is silenced for this call only.
+    """
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="X does not have valid feature names")
+        return model.predict(X)
+
+
+class InferenceEngine:
+    """Price spec dicts without going through sklearn when the model is linear.
+
+    For a LinearRegression a prediction is intercept + coef . x, and a one-hot row
+    only switches on one coefficient per categorical field. The engine pulls coef_ and
+    intercept_ out once and prices a request as
+
+        intercept + sum(active categorical coefficients) + sum(numeric value * coef)
+
+    with no dense feature vector. Non-linear models fall back to model.predict.
+    """
+
+    def __init__(self, model, feature_names):
+        self.model = model
+        self.encoder = get_encoder(feature_names)
+        self.is_linear = is_linear_model(model, self.encoder.n_features)
+
+        if self.is_linear:
+            self.coef = coef = np.asarray(model.coef_, dtype=np.float64)
+            self.intercept = float(model.intercept_)
+            # Plain floats keep the per-request loop out of NumPy scalar overhead
+            self.numeric_coef = {name: float(coef[i]) for name, i in self.encoder.numeric_index.items()}
+            self.category_coef = {
+                field: {value: float(coef[i]) for value, i in table.items()}
+                for field, table in self.encoder.category_index.items()
+            }
+
+    def predict_one(self, sample_dict):
+        """Predict a single spec dict (raw float, unrounded)."""
+        if not self.is_linear:
+            return float(sklearn_predict(self.model, self.encoder.encode(sample_dict))[0])
+
+        return additive_price(self.intercept, self.category_coef, self.numeric_coef, sample_dict)
+
+    def predict_pairs(self, indices, values):
+        """Predict one row given as (column indices, values), e.g. from encoder.encode_pairs."""
+        if self.is_linear:
+            return self.intercept + float(self.coef[indices] @ values)
+        row = np.zeros((1, self.encoder.n_features), dtype=np.float64)
+        row[0, indices] = values
+        return float(sklearn_predict(self.model, row)[0])
+
+
+def _is_sparse(encoded):
+    return hasattr(encoded, "tocsr") and hasattr(encoded, "nnz")
+
+
+def predict_rows(model, encoded):
+    """model.predict for rows laid out like feature_names, as a plain dot product when linear.
+
+    Only NumPy arrays and scipy sparse matrices take the fast path: a DataFrame may
+    carry its own column order, so it still goes through sklearn's validation.
+    """
+    if isinstance(encoded, np.ndarray) and is_linear_model(model, encoded.shape[-1]):
+        return encoded @ np.asarray(model.coef_, dtype=np.float64) + float(model.intercept_)
+    if _is_sparse(encoded) and is_linear_model(model, encoded.shape[-1]):
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        return np.asarray(encoded.tocsr() @ coef).ravel() + float(model.intercept_)
+    return np.asarray(sklearn_predict(model, encoded), dtype=np.float64)
+
+
+_ENGINES = weakref.WeakKeyDictionary()
+
+
+def get_engine(model, feature_names):
+    """Return the engine for this model + feature layout (built once per model object)."""
+    encoder = get_encoder(feature_names)
+    engine = _ENGINES.get(model)
+    if engine is None or engine.encoder is not encoder:
+        engine = InferenceEngine(model, feature_names)
+        _ENGINES[model] = engine
+    return engine
@@ -0,0 +1,91 @@
+# latency.py
+# Per-request stage timings (encode -> predict -> render) checked against a p95 budget.
+#
+# The durations are recorded as metrics stage timers (request_encode, request_predict,
+# request_render, request_total; see src/metrics.py), so the budget, the Diagnostics
+# panel and /metrics share one rolling window and one percentile implementation.
+
+import os
+import threading
+from contextlib import contextmanager
+from time import perf_counter
+
+from src.metrics import get_metrics
+
+STAGES = ("encode", "predict", "render")
+
+# Metrics stage name of a request stage: "encode" -> "request_encode"
+REQUEST_PREFIX = "request_"
+
+# p95 target for a whole request, in milliseconds (override with LAPTOP_PRICE_P95_MS)
+DEFAULT_P95_TARGET_MS = float(os.environ.get("LAPTOP_PRICE_P95_MS", "50"))
+
+
+class RequestTimer:
+    """Collects stage durations for one request."""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + (perf_counter() - start) * 1000.0
+
+    @property
+    def total_ms(self):
+        return sum(self.stages.values())
+
+
+class LatencyBudget:
+    """Request timings kept as metrics stage timers, with a configurable p95 target.
+
+    Requests are always recorded, whether or not the rest of the metrics are enabled.
+    """
+
+    def __init__(self, p95_target_ms=DEFAULT_P95_TARGET_MS, metrics=None):
+        self.p95_target_ms = p95_target_ms
+        self.metrics = get_metrics() if metrics is None else metrics
+        self._names = {name: REQUEST_PREFIX + name for name in STAGES + ("total",)}
+
+    def start(self):
+        return RequestTimer()
+
+    def record(self, timer):
+        durations = {self._names[name]: timer.stages.get(name, 0.0) / 1000.0 for name in STAGES}
+        durations[self._names["total"]] = timer.total_ms / 1000.0
+        self.metrics.observe_many(durations)
+
+    def summary(self):
+        """{stage: {count, p50_ms, p95_ms, max_ms}} plus the budget verdict."""
+        timers = self.metrics.stage_stats(list(self._names.values()))
+        stats = {
+            name: {key: timers[metric][key] for key in ("count", "p50_ms", "p95_ms", "max_ms")}
+            for name, metric in self._names.items()
+        }
+        p95_total = stats["total"]["p95_ms"]
+        return {
+            "p95_target_ms": self.p95_target_ms,
+            "within_budget": p95_total is None or p95_total <= self.p95_target_ms,
+            "stages": stats,
+        }
+
+    def reset(self):
+        self.metrics.reset(self._names.values())
+
+
+_budget = None
+_budget_lock = threading.Lock()
+
+
+def get_budget():
+    """Process-wide budget shared by every Streamlit session."""
+    global _budget
+    if _budget is None:
+        with _budget_lock:
+            if _budget is None:
+                _budget = LatencyBudget()
+    return _budget
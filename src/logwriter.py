@@ -0,0 +1,167 @@
+# logwriter.py
+# Background writer for logs/input_errors.log.
+#
+# log_event used to makedirs + open/append/close the log on every call, which in
+# bulk scoring meant one file open per out-of-range row. Now the caller only puts
+# a tuple on an in-memory queue; a daemon thread batches records into JSON lines
+#
+#   {"ts": "2025-01-31 12:00:00", "level": "WARN", "field": "Ram", "value": "abc", "message": "..."}
+#
+# and appends them when `flush_records` are waiting, every `flush_interval`
+# seconds, on flush(), and at interpreter (or pool worker) exit. The file rotates
+# to .1, .2, ... once it would grow past `max_bytes`.
+
+import os
+import json
+import time
+import queue
+import atexit
+import threading
+from datetime import datetime
+
+from src.registry import ROOT_DIR
+
+DEFAULT_LOG_FILE = os.path.join(ROOT_DIR, "logs", "input_errors.log")
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+DEFAULT_FLUSH_RECORDS = 512
+DEFAULT_FLUSH_INTERVAL = 1.0
+
+
+class _Control:
+    """Queue marker asking the writer thread to flush (and optionally stop)."""
+
+    def __init__(self, stop=False):
+        self.stop = stop
+        self.done = threading.Event()
+
+
+class LogWriter:
+    def __init__(self, path=DEFAULT_LOG_FILE, max_bytes=DEFAULT_MAX_BYTES, backup_count=DEFAULT_BACKUP_COUNT,
+                 flush_records=DEFAULT_FLUSH_RECORDS, flush_interval=DEFAULT_FLUSH_INTERVAL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.flush_records = flush_records
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._atexit_registered = False
+        self._finalizer = None
+        if hasattr(os, "register_at_fork"):
+            # The writer thread doesn't survive fork(); a child starts its own on first write
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def write(self, kind, field, value, message):
+        """Queue one event; formatting and file I/O happen on the writer thread."""
+        if self._thread is None:
+            self._start()
+        self._queue.put((time.time(), kind, field, value, message))
+
+    def flush(self, timeout=5.0):
+        """Block until everything queued so far is on disk."""
+        if self._thread is not None:
+            self._control(_Control(), timeout)
+
+    def close(self, timeout=5.0):
+        """Flush and stop the writer thread (a later write() starts a new one)."""
+        if self._thread is not None:
+            self._control(_Control(stop=True), timeout)
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _control(self, marker, timeout):
+        self._queue.put(marker)
+        marker.done.wait(timeout)
+
+    def _after_fork(self):
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _start(self):
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+            self._thread.start()
+            # Exit hooks are registered once per process, not on every restart after close()
+            if not self._atexit_registered:
+                atexit.register(self.close)
+                self._atexit_registered = True
+            # Pool workers leave through multiprocessing's exit hooks, not atexit (and a
+            # multiprocessing child starts with those cleared)
+            if self._finalizer is None or not self._finalizer.still_active():
+                from multiprocessing import util
+                self._finalizer = util.Finalize(self, self.close, exitpriority=10)
+
+    def _run(self):
+        pending = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+
+            if isinstance(item, tuple):
+                pending.append(item)
+                if len(pending) < self.flush_records:
+                    continue
+            if pending:
+                self._write(pending)
+                pending = []
+            deadline = time.monotonic() + self.flush_interval
+            if isinstance(item, _Control):
+                item.done.set()
+                if item.stop:
+                    return
+
+    def _write(self, records):
+        lines = []
+        for ts, kind, field, value, message in records:
+            lines.append(json.dumps({
+                "ts": datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S"),
+                "level": str(kind).upper(),
+                "field": str(field),
+                "value": str(value),
+                "message": str(message),
+            }, ensure_ascii=False))
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            if size and size + len(data) > self.max_bytes:
+                self._rotate()
+            with open(self.path, "ab") as f:
+                f.write(data)
+            self.written += len(records)
+        except Exception as e:
+            # Never crash on logging, but show debug info in console.
+            print(f"⚠️ Logging event failed: {e}")
+
+    def _rotate(self):
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_log_writer():
+    """Process-wide writer for logs/input_errors.log."""
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = LogWriter()
+    return _writer
@@ -0,0 +1,170 @@
+# matrix_store.py
+# Binary, memory-mappable copy of the encoded training matrix.
+#
+# 03_model_training.ipynb re-parses data/processed/laptops_clean.csv and re-runs
+# get_dummies/align on every run. Exporting once to
+#
+#   <dir>/X.npy      float64 feature matrix, column-major (one contiguous block per feature)
+#                    (or X.npz, a scipy CSR matrix, when exported with --sparse)
+#   <dir>/y.npy      float64 target (Price_euros)
+#   <dir>/meta.json  format version, feature_names, their hash, row count, source CSV hash
+#
+# lets later runs np.load(..., mmap_mode="r") it in milliseconds without copying.
+# The store is versioned against the feature list: loading it with a different
+# feature layout raises instead of silently misaligning columns.
+#
+#   python -m src.matrix_store export [--csv PATH] [--out DIR]
+#   python -m src.matrix_store info [--out DIR]
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from datetime import datetime
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.registry import file_digest
+
+FORMAT_VERSION = 1
+TARGET = "Price_euros"
+
+PROCESSED_CSV = os.path.join(ROOT_DIR, "data", "processed", "laptops_clean.csv")
+STORE_DIR = os.path.join(ROOT_DIR, "data", "processed", "matrix")
+
+
+def feature_hash(feature_names):
+    """Stable hash of the column layout (names and order)."""
+    return hashlib.sha256("\n".join(feature_names).encode("utf-8")).hexdigest()
+
+
+def encode_frame(data, feature_names, sparse=False):
+    """(X, y) for a laptops_clean.csv-style frame, X laid out like feature_names."""
+    from src.encoder import get_encoder
+
+    y = data[TARGET].to_numpy(dtype=np.float64) if TARGET in data.columns else None
+    encoder = get_encoder(feature_names)
+    features = data.drop(columns=[TARGET], errors="ignore")
+    X = encoder.encode_batch_sparse(features) if sparse else encoder.encode_batch(features)
+    return X, y
+
+
+def export_matrix(csv_path=PROCESSED_CSV, out_dir=STORE_DIR, feature_names=None, sparse=False):
+    """Encode the processed CSV once and write X.npy / y.npy / meta.json; returns the meta dict."""
+    import pandas as pd
+
+    if feature_names is None:
+        from src.registry import get_feature_names
+        feature_names = get_feature_names()
+    feature_names = list(feature_names)
+
+    data = pd.read_csv(csv_path)
+    X, y = encode_frame(data, feature_names, sparse)
+
+    os.makedirs(out_dir, exist_ok=True)
+    # Unlink meta.json before touching the arrays: a store without it reads as
+    # missing, so a crash mid re-export never pairs old metadata with new files
+    for stale in ("meta.json", "X.npy", "X.npz"):
+        if os.path.exists(os.path.join(out_dir, stale)):
+            os.remove(os.path.join(out_dir, stale))
+    if sparse:
+        from scipy.sparse import save_npz
+        save_npz(os.path.join(out_dir, "X.npz"), X)
+    else:
+        np.save(os.path.join(out_dir, "X.npy"), np.asfortranarray(X))
+    np.save(os.path.join(out_dir, "y.npy"), y)
+
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "feature_names": feature_names,
+        "feature_hash": feature_hash(feature_names),
+        "n_rows": int(X.shape[0]),
+        "n_features": int(X.shape[1]),
+        "dtype": str(X.dtype),
+        "layout": "csr" if sparse else "dense",
+        "target": TARGET,
+        "source": os.path.relpath(csv_path, ROOT_DIR),
+        "source_sha256": file_digest(csv_path),
+        "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    # meta.json is removed first and replaced atomically last, so a store with
+    # meta.json is always complete
+    tmp = os.path.join(out_dir, "meta.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(tmp, os.path.join(out_dir, "meta.json"))
+    return meta
+
+
+def read_meta(store_dir=STORE_DIR):
+    with open(os.path.join(store_dir, "meta.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_matrix(store_dir=STORE_DIR, feature_names=None, mmap=True):
+    """Return (X, y, meta); X/y are read-only memory maps unless mmap=False.
+
+    A store exported with sparse=True returns X as a scipy CSR matrix (read into memory).
+
+    Raises ValueError if the store's format version or feature layout doesn't
+    match (pass the model's feature_names to check against it).
+    """
+    meta = read_meta(store_dir)
+    if meta.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Matrix store format {meta.get('format_version')} != {FORMAT_VERSION}; re-export it.")
+    if feature_names is not None and meta["feature_hash"] != feature_hash(list(feature_names)):
+        raise ValueError("Matrix store was exported for a different feature list; re-export it.")
+
+    mode = "r" if mmap else None
+    if meta.get("layout") == "csr":
+        from scipy.sparse import load_npz
+        X = load_npz(os.path.join(store_dir, "X.npz")).tocsr()
+    else:
+        X = np.load(os.path.join(store_dir, "X.npy"), mmap_mode=mode)
+    y = np.load(os.path.join(store_dir, "y.npy"), mmap_mode=mode)
+    if X.shape != (meta["n_rows"], meta["n_features"]):
+        raise ValueError(f"X.npy shape {X.shape} does not match meta.json.")
+    return X, y, meta
+
+
+def is_stale(csv_path=PROCESSED_CSV, store_dir=STORE_DIR, feature_names=None, sparse=None):
+    """True if the store is missing, outdated w.r.t. the CSV, for another feature list,
+    or (when `sparse` is given) in the other layout."""
+    try:
+        meta = read_meta(store_dir)
+    except (OSError, ValueError):
+        return True
+    if meta.get("format_version") != FORMAT_VERSION or meta.get("source_sha256") != file_digest(csv_path):
+        return True
+    if sparse is not None and (meta.get("layout") == "csr") != sparse:
+        return True
+    return feature_names is not None and meta["feature_hash"] != feature_hash(list(feature_names))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export/inspect the binary feature-matrix store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="encode the processed CSV into X.npy / y.npy / meta.json")
+    export.add_argument("--csv", default=PROCESSED_CSV)
+    export.add_argument("--out", default=STORE_DIR)
+    export.add_argument("--sparse", action="store_true", help="store X as a scipy CSR matrix")
+    info = sub.add_parser("info", help="print the store's metadata")
+    info.add_argument("--out", default=STORE_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        meta = export_matrix(args.csv, args.out, sparse=args.sparse)
+        print(f"Wrote {meta['n_rows']} x {meta['n_features']} matrix to {args.out}")
+    else:
+        meta = read_meta(args.out)
+        meta = {k: v for k, v in meta.items() if k != "feature_names"}
+        print(json.dumps(meta, indent=2))
+
+
+if __name__ == "__main__":
+    main()
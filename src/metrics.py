@@ -0,0 +1,327 @@
+# metrics.py
+# Opt-in instrumentation for the inference hot path.
+#
+# Off by default: per-row paths then only check `active`/`enabled` once, and timed()
+# calls straight through. Turn it on with LAPTOP_PRICE_METRICS=1 or
+# get_metrics().enable() to collect
+#
+#   - stage timers: encode, predict, postprocess (count, sum, max, p50/p95 window)
+#   - counters: requests, outlier warnings, categorical values seen / dropped per field
+#     ("dropped" = no dummy column, i.e. what reindex(fill_value=0) silently zeroes)
+#   - collectors: stats pulled from other components at export time (prediction cache)
+#
+# The Streamlit latency budget (src/latency.py) records its per-request stages here
+# too, as request_encode / request_predict / request_render / request_total, so
+# there is one set of windows and one percentile implementation for both.
+#
+# snapshot() returns JSON-ready dicts, to_prometheus() the text exposition format.
+# profile_next(n) (or LAPTOP_PRICE_PROFILE=n) runs the next n requests under
+# cProfile and dumps the stats to reports/profiles/ for `python -m pstats`.
+
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from time import perf_counter
+
+import numpy as np
+
+from src.registry import ROOT_DIR
+
+PREFIX = "laptop_price"
+STAGES = ("encode", "predict", "postprocess")
+DEFAULT_WINDOW = 1000
+PROFILE_DIR = os.path.join(ROOT_DIR, "reports", "profiles")
+
+
+class _NullContext:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL = _NullContext()
+
+
+class _StageTimer:
+    __slots__ = ("metrics", "stage", "started")
+
+    def __init__(self, metrics, stage):
+        self.metrics = metrics
+        self.stage = stage
+
+    def __enter__(self):
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.stage, perf_counter() - self.started)
+        return False
+
+
+class _Request:
+    __slots__ = ("metrics", "profiling")
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def __enter__(self):
+        if self.metrics.enabled:
+            self.metrics.inc("requests_total")
+        self.profiling = self.metrics._profile_start()
+        return self
+
+    def __exit__(self, *exc):
+        if self.profiling:
+            self.metrics._profile_stop()
+        return False
+
+
+class Metrics:
+    """Counters, stage timers and the cProfile hook; thread-safe."""
+
+    def __init__(self, enabled=False, window=DEFAULT_WINDOW):
+        self.enabled = enabled
+        self.active = enabled  # enabled, or a profile is pending
+        self.window = window
+        self.last_profile = None
+        self._lock = threading.Lock()
+        self._counters = {}    # (name, ((label, value), ...)) -> number
+        self._timers = {}      # stage -> [count, sum_s, max_s, deque of recent seconds]
+        self._collectors = {}  # name -> callable returning a dict
+        self._profiler = None
+        self._profile_left = 0
+        self._profile_busy = False
+        self._profile_path = None
+
+    # ---------- Recording ----------
+
+    def enable(self):
+        self.enabled = self.active = True
+
+    def disable(self):
+        self.enabled = False
+        self.active = self._profile_left > 0
+
+    def inc(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def timer(self, stage):
+        """Context manager timing one stage (no-op while disabled)."""
+        return _StageTimer(self, stage) if self.enabled else _NULL
+
+    def timed(self, stage, fn, *args):
+        """fn(*args), timed as `stage`; cheaper than timer() on per-row paths."""
+        if not self.enabled:
+            return fn(*args)
+        started = perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            self.observe(stage, perf_counter() - started)
+
+    def observe(self, stage, seconds):
+        with self._lock:
+            self._observe(stage, seconds)
+
+    def observe_many(self, durations):
+        """Record several {stage: seconds} at once (one request's stages stay together)."""
+        with self._lock:
+            for stage, seconds in durations.items():
+                self._observe(stage, seconds)
+
+    def _observe(self, stage, seconds):
+        timer = self._timers.get(stage)
+        if timer is None:
+            timer = self._timers[stage] = [0, 0.0, 0.0, deque(maxlen=self.window)]
+        timer[0] += 1
+        timer[1] += seconds
+        timer[2] = max(timer[2], seconds)
+        timer[3].append(seconds)
+
+    def request(self):
+        """Wrap one top-level prediction: counts it and drives profile_next()."""
+        return _Request(self) if self.active else _NULL
+
+    def register_collector(self, name, fn):
+        """Export fn()'s numeric values as gauges named <name>_<key>."""
+        with self._lock:
+            self._collectors[name] = fn
+
+    def reset(self, stages=None):
+        """Clear everything, or only the given stage timers."""
+        with self._lock:
+            if stages is not None:
+                for stage in stages:
+                    self._timers.pop(stage, None)
+                return
+            self._counters.clear()
+            self._timers.clear()
+
+    # ---------- Profiling ----------
+
+    def profile_next(self, n_requests, path=None):
+        """Profile the next n requests (in whichever thread runs them first)."""
+        import cProfile
+
+        if path is None:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            path = os.path.join(PROFILE_DIR, f"profile-{stamp}-{n_requests}req.prof")
+        with self._lock:
+            self._profiler = cProfile.Profile()
+            self._profile_left = n_requests
+            self._profile_path = path
+            self.active = True
+        return path
+
+    def _profile_start(self):
+        with self._lock:
+            if self._profile_left <= 0 or self._profile_busy:
+                return False
+            self._profile_busy = True
+            profiler = self._profiler
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is already active in this thread
+            with self._lock:
+                self._profile_busy = False
+            return False
+        return True
+
+    def _profile_stop(self):
+        self._profiler.disable()
+        with self._lock:
+            self._profile_busy = False
+            self._profile_left -= 1
+            if self._profile_left > 0:
+                return
+            profiler, path = self._profiler, self._profile_path
+            self._profiler = None
+            self.active = self.enabled
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        profiler.dump_stats(path)
+        self.last_profile = path
+        print(f"📊 Profile written to {path}")
+
+    # ---------- Export ----------
+
+    def _copy_timers(self, stages=None):
+        """{stage: (count, sum_s, max_s, recent seconds array)}, copied under the lock."""
+        with self._lock:
+            names = self._timers if stages is None else [s for s in stages if s in self._timers]
+            return {stage: (t[0], t[1], t[2], np.fromiter(t[3], dtype=np.float64))
+                    for stage, t in ((name, self._timers[name]) for name in names)}
+
+    def stage_stats(self, stages=None):
+        """{stage: {count, sum_ms, mean_ms, p50_ms, p95_ms, max_ms}}; stages never observed
+        (when asked for by name) come back with count 0 and None timings."""
+        timers = self._copy_timers(stages)
+        stats = {}
+        for stage in (timers if stages is None else stages):
+            if stage not in timers:
+                stats[stage] = {"count": 0, "sum_ms": 0.0, "mean_ms": None,
+                                "p50_ms": None, "p95_ms": None, "max_ms": None}
+                continue
+            count, total, peak, recent = timers[stage]
+            p50, p95 = percentiles(recent, (50, 95))
+            stats[stage] = {
+                "count": count,
+                "sum_ms": round(total * 1e3, 3),
+                "mean_ms": round(total / count * 1e3, 4) if count else None,
+                "p50_ms": None if p50 is None else round(p50 * 1e3, 4),
+                "p95_ms": None if p95 is None else round(p95 * 1e3, 4),
+                "max_ms": round(peak * 1e3, 4),
+            }
+        return stats
+
+    def snapshot(self):
+        """JSON-ready view of every stage timer, counter and collector."""
+        stages = self.stage_stats()
+        with self._lock:
+            counters = dict(self._counters)
+            collectors = dict(self._collectors)
+
+        flat = {}
+        for (name, labels), value in counters.items():
+            if labels:
+                flat.setdefault(name, {})[",".join(str(v) for _, v in labels)] = value
+            else:
+                flat[name] = value
+
+        seen = flat.get("categories_seen_total", {})
+        dropped = flat.get("categories_dropped_total", {})
+        drop_rate = {field: round(dropped.get(field, 0) / n, 6) for field, n in seen.items() if n}
+        if seen:
+            drop_rate["all"] = round(sum(dropped.values()) / max(sum(seen.values()), 1), 6)
+
+        return {
+            "enabled": self.enabled,
+            "stages": stages,
+            "counters": flat,
+            "unknown_category_rate": drop_rate,
+            "collectors": {name: _numeric_items(fn()) for name, fn in collectors.items()},
+        }
+
+    def to_prometheus(self):
+        """Prometheus text exposition of the same data."""
+        timers = self._copy_timers()
+        with self._lock:
+            counters = dict(self._counters)
+            collectors = dict(self._collectors)
+
+        lines = []
+        if timers:
+            name = f"{PREFIX}_stage_seconds"
+            lines.append(f"# TYPE {name} summary")
+            for stage, (count, total, _, recent) in sorted(timers.items()):
+                if len(recent):
+                    for q, value in zip(("0.5", "0.95", "0.99"), percentiles(recent, (50, 95, 99))):
+                        lines.append(f'{name}{{stage="{stage}",quantile="{q}"}} {value:.9g}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {total:.9g}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {count}')
+
+        typed = set()
+        for (name, labels), value in sorted(counters.items()):
+            full = f"{PREFIX}_{name}"
+            if full not in typed:
+                lines.append(f"# TYPE {full} counter")
+                typed.add(full)
+            label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+            lines.append(f"{full}{{{label_text}}} {value}" if labels else f"{full} {value}")
+
+        for collector, fn in sorted(collectors.items()):
+            for key, value in _numeric_items(fn()).items():
+                full = f"{PREFIX}_{collector}_{key}"
+                lines.append(f"# TYPE {full} gauge")
+                lines.append(f"{full} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def percentiles(values, qs):
+    """np.percentile of a window as plain floats, or Nones for an empty window."""
+    if len(values) == 0:
+        return [None] * len(qs)
+    return [float(v) for v in np.percentile(values, qs)]
+
+
+def _numeric_items(stats):
+    return {k: v for k, v in stats.items() if isinstance(v, (int, float)) and not isinstance(v, bool)}
+
+
+_metrics = Metrics(enabled=os.environ.get("LAPTOP_PRICE_METRICS", "") not in ("", "0"))
+if os.environ.get("LAPTOP_PRICE_PROFILE"):
+    _metrics.profile_next(int(os.environ["LAPTOP_PRICE_PROFILE"]))
+
+
+def get_metrics():
+    """Process-wide metrics shared by the CLI, the service and every Streamlit session."""
+    return _metrics
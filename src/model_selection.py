@@ -0,0 +1,237 @@
+# model_selection.py
+# Model selection over a grid of models x preprocessing variants, with k-fold CV
+# fanned out over a process pool.
+#
+# 03_model_training.ipynb compares two hand-trained LinearRegressions on one split:
+#   "Linear Regression (Scaled Data)"    numeric columns standardized, log1p(price) target
+#   "Linear Regression (Unscaled Data)"  raw features, raw price
+# Here every (model, variant) candidate is cross-validated instead. The encoded
+# matrix comes from the binary store (src.matrix_store, re-exported only when the
+# CSV or feature list changed); workers memory-map it once in the pool initializer,
+# so tasks only carry fold indices and all folds share the same pages.
+#
+# Outputs:
+#   reports/model_results_summary.csv   model, MAE, RMSE, R² (fold means; the notebook's format)
+#   reports/model_timings.csv           the same plus R² spread, fit time, batch and
+#                                       single-row predict cost per candidate
+#
+#   python -m src.model_selection
+#   python -m src.model_selection --folds 10 --workers 4 --models "Linear Regression" Ridge
+
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src import matrix_store
+from src.parallel import default_workers
+from src.vocabulary import Vocabulary
+
+REPORTS_DIR = os.path.join(ROOT_DIR, "reports")
+SUMMARY_PATH = os.path.join(REPORTS_DIR, "model_results_summary.csv")
+TIMINGS_PATH = os.path.join(REPORTS_DIR, "model_timings.csv")
+
+RANDOM_STATE = 1  # the notebook's split seed
+DEFAULT_FOLDS = 5
+SINGLE_ROW_CALLS = 20
+
+
+def _linear():
+    from sklearn.linear_model import LinearRegression
+    return LinearRegression()
+
+
+def _ridge():
+    from sklearn.linear_model import Ridge
+    return Ridge(alpha=1.0)
+
+
+def _random_forest():
+    from sklearn.ensemble import RandomForestRegressor
+    return RandomForestRegressor(n_estimators=200, random_state=RANDOM_STATE, n_jobs=1)
+
+
+def _gradient_boosting():
+    from sklearn.ensemble import GradientBoostingRegressor
+    return GradientBoostingRegressor(random_state=RANDOM_STATE)
+
+
+MODELS = {
+    "Linear Regression": _linear,
+    "Ridge": _ridge,
+    "Random Forest": _random_forest,
+    "Gradient Boosting": _gradient_boosting,
+}
+
+# variant -> (standardize numeric columns, fit on log1p(price))
+VARIANTS = {
+    "Scaled Data": (True, True),
+    "Unscaled Data": (False, False),
+    "Scaled Data, raw target": (True, False),
+    "Unscaled Data, log target": (False, True),
+}
+
+
+def candidate_name(model, variant):
+    return f"{model} ({variant})"
+
+
+def build_estimator(model, variant, numeric_idx):
+    """Unfitted estimator for one candidate; preprocessing is refit inside each fold."""
+    from sklearn.compose import ColumnTransformer, TransformedTargetRegressor
+    from sklearn.pipeline import make_pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    scale, log_target = VARIANTS[variant]
+    estimator = MODELS[model]()
+    if scale:
+        scaler = ColumnTransformer([("scale", StandardScaler(), numeric_idx)], remainder="passthrough")
+        estimator = make_pipeline(scaler, estimator)
+    if log_target:
+        estimator = TransformedTargetRegressor(
+            regressor=estimator, func=np.log1p, inverse_func=np.expm1, check_inverse=False)
+    return estimator
+
+
+# Per-worker state, set once by _init_worker
+_X = None
+_y = None
+_numeric_idx = None
+
+
+def _init_worker(store_dir, numeric_idx):
+    global _X, _y, _numeric_idx
+    import warnings
+    warnings.filterwarnings("ignore")
+    _X, _y, _ = matrix_store.load_matrix(store_dir)
+    _numeric_idx = numeric_idx
+
+
+def _run_fold(model, variant, fold, train_idx, test_idx):
+    """Worker task: fit one candidate on one fold; returns its metrics and timings."""
+    from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+    X_train, y_train = np.asarray(_X[train_idx]), _y[train_idx]
+    X_test, y_test = np.asarray(_X[test_idx]), _y[test_idx]
+    estimator = build_estimator(model, variant, _numeric_idx)
+
+    start = time.perf_counter()
+    estimator.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pred = estimator.predict(X_test)
+    predict_seconds = time.perf_counter() - start
+
+    single = []
+    for i in range(min(SINGLE_ROW_CALLS, len(X_test))):
+        start = time.perf_counter()
+        estimator.predict(X_test[i:i + 1])
+        single.append(time.perf_counter() - start)
+
+    return {
+        "model": candidate_name(model, variant),
+        "fold": fold,
+        "MAE": mean_absolute_error(y_test, pred),
+        "RMSE": np.sqrt(mean_squared_error(y_test, pred)),
+        "R²": r2_score(y_test, pred),
+        "fit_seconds": fit_seconds,
+        "predict_us_per_row": predict_seconds / len(X_test) * 1e6,
+        "single_row_us": float(np.median(single)) * 1e6,
+    }
+
+
+def ensure_matrix(csv_path=matrix_store.PROCESSED_CSV, store_dir=matrix_store.STORE_DIR, feature_names=None):
+    """The store's meta, re-exporting X.npy / y.npy first if they are stale (or sparse:
+    folds are sliced from a shared dense memory map)."""
+    if feature_names is None:
+        from src.registry import get_feature_names
+        feature_names = get_feature_names()
+    if matrix_store.is_stale(csv_path, store_dir, feature_names, sparse=False):
+        print(f"Encoding {csv_path} into {store_dir} ...")
+        return matrix_store.export_matrix(csv_path, store_dir, feature_names)
+    return matrix_store.read_meta(store_dir)
+
+
+def run_selection(models=None, variants=None, folds=DEFAULT_FOLDS, workers=None,
+                  csv_path=matrix_store.PROCESSED_CSV, store_dir=matrix_store.STORE_DIR):
+    """Cross-validate every candidate; returns (summary, per_fold) DataFrames."""
+    from sklearn.model_selection import KFold
+    from src.train import numeric_columns
+
+    models = list(models or MODELS)
+    variants = list(variants or VARIANTS)
+    for name in models:
+        if name not in MODELS:
+            raise ValueError(f"Unknown model '{name}' (expected one of {list(MODELS)}).")
+    for name in variants:
+        if name not in VARIANTS:
+            raise ValueError(f"Unknown variant '{name}' (expected one of {list(VARIANTS)}).")
+
+    meta = ensure_matrix(csv_path, store_dir)
+    vocabulary = Vocabulary(meta["feature_names"])
+    numeric_idx = vocabulary.indices(numeric_columns(vocabulary)).tolist()
+    splits = list(KFold(folds, shuffle=True, random_state=RANDOM_STATE).split(np.arange(meta["n_rows"])))
+    tasks = [(m, v, k, train, test) for m in models for v in variants for k, (train, test) in enumerate(splits)]
+
+    workers = workers or default_workers()
+    if workers == 1:
+        _init_worker(store_dir, numeric_idx)
+        rows = [_run_fold(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(store_dir, numeric_idx)) as executor:
+            futures = [executor.submit(_run_fold, *task) for task in tasks]
+            rows = [future.result() for future in as_completed(futures)]
+
+    per_fold = pd.DataFrame(rows).sort_values(["model", "fold"]).reset_index(drop=True)
+    grouped = per_fold.groupby("model", sort=False)
+    summary = grouped[["MAE", "RMSE", "R²", "fit_seconds", "predict_us_per_row", "single_row_us"]].mean()
+    summary.insert(3, "R²_std", grouped["R²"].std(ddof=0))
+    summary = summary.sort_values("R²", ascending=False).reset_index()
+    return summary.round(4), per_fold
+
+
+def write_reports(summary, summary_path=SUMMARY_PATH, timings_path=TIMINGS_PATH):
+    os.makedirs(os.path.dirname(os.path.abspath(summary_path)), exist_ok=True)
+    summary[["model", "MAE", "RMSE", "R²"]].to_csv(summary_path, index=False)
+    os.makedirs(os.path.dirname(os.path.abspath(timings_path)), exist_ok=True)
+    summary.to_csv(timings_path, index=False)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cross-validated model selection over a candidate grid")
+    parser.add_argument("--models", nargs="+", choices=list(MODELS), help="subset of models")
+    parser.add_argument("--variants", nargs="+", choices=list(VARIANTS), help="subset of preprocessing variants")
+    parser.add_argument("--folds", type=int, default=DEFAULT_FOLDS)
+    parser.add_argument("--workers", type=int, default=0, help="processes (0 = one per CPU core)")
+    parser.add_argument("--csv", default=matrix_store.PROCESSED_CSV)
+    parser.add_argument("--store", default=matrix_store.STORE_DIR, help="matrix store directory")
+    parser.add_argument("--out", default=SUMMARY_PATH)
+    parser.add_argument("--timings", default=TIMINGS_PATH)
+    args = parser.parse_args(argv)
+
+    import warnings
+    warnings.filterwarnings("ignore")
+
+    started = time.perf_counter()
+    summary, _ = run_selection(args.models, args.variants, args.folds, args.workers or None, args.csv, args.store)
+    write_reports(summary, args.out, args.timings)
+
+    with pd.option_context("display.width", 160, "display.max_columns", None):
+        print(summary.to_string(index=False))
+    best = summary.iloc[0]
+    print(f"\nBest by R²: {best['model']} (R² {best['R²']}, single-row predict {best['single_row_us']:.0f} µs)")
+    print(f"Saved {args.out} and {args.timings} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
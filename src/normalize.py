@@ -0,0 +1,49 @@
+# normalize.py
+# Compiled alias lookup for the free-text normalizers in src/utils.py.
+#
+# _normalize_from_aliases used to walk every alias with `alias in s` on each call.
+# AliasIndex compiles an ordered alias table once into
+#
+#   - a dict of exact results for every alias string, and
+#   - one regex of zero-width lookaheads, (?=(alias_a|alias_b|...)), which reports
+#     the alias starting at every position of the input in a single pass.
+#
+# Alternatives are listed in table order, so at each position the regex picks the
+# highest-priority alias that starts there; taking the best priority over all
+# positions gives the same "first table entry contained in the string wins"
+# result as the original linear scan.
+
+import re
+
+
+class AliasIndex:
+    """First-match-wins containment lookup over an ordered [(alias, value), ...] table."""
+
+    def __init__(self, entries):
+        self.priority = {}
+        self.values = []
+        for alias, value in entries:
+            if alias not in self.priority:
+                self.priority[alias] = len(self.values)
+                self.values.append(value)
+        self.pattern = re.compile(
+            "(?=(" + "|".join(re.escape(alias) for alias in self.priority) + "))"
+        ) if self.priority else None
+        self.exact = {alias: self._scan(alias) for alias in self.priority}
+
+    def _scan(self, s):
+        if self.pattern is None:
+            return None
+        best = None
+        for match in self.pattern.finditer(s):
+            rank = self.priority[match.group(1)]
+            if best is None or rank < best:
+                best = rank
+                if rank == 0:
+                    break
+        return None if best is None else self.values[best]
+
+    def search(self, s):
+        """Value of the first table entry contained in `s`, or None."""
+        value = self.exact.get(s)
+        return value if value is not None else self._scan(s)
@@ -0,0 +1,113 @@
+# parallel.py
+# Multi-process scoring: shard a batch or a raw CSV across a ProcessPoolExecutor.
+#
+# Workers receive the model and feature list once, through the pool initializer,
+# and then only see shards: raw CSV line blocks (parsed, cleaned, encoded and
+# predicted inside the worker, so parsing scales too) or spec DataFrames. Results
+# are yielded in input order, and at most `max_in_flight` shards are outstanding,
+# so memory stays bounded by workers x chunk size.
+
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_CHUNK_SIZE = 50000
+
+# Per-worker state, set once by _init_worker
+_model = None
+_feature_names = None
+
+
+def default_workers():
+    return os.cpu_count() or 1
+
+
+def _init_worker(model, feature_names):
+    global _model, _feature_names
+    _model = model
+    _feature_names = feature_names
+
+
+def _score_lines(header, block, offset):
+    """Worker task: raw CSV lines -> (laptop_IDs or None, rounded predictions)."""
+    from src.bulk import predict_chunks, encode_chunks, clean_chunks
+    from src.cleaning import RAW_ENCODING
+
+    raw = pd.read_csv(io.BytesIO(header + block), encoding=RAW_ENCODING)
+    stages = predict_chunks(encode_chunks(clean_chunks([(offset, raw)]), _feature_names, len(raw)), _model)
+    _, ids, preds = next(stages)
+    return ids, preds
+
+
+def _predict_frame(frame):
+    """Worker task: spec DataFrame -> predictions (same as predict_batch)."""
+    from src.utils import predict_batch
+    return predict_batch(_model, frame, _feature_names, chunk_size=len(frame) or 1)
+
+
+def _ordered(executor, tasks, max_in_flight):
+    """Submit (fn, args) tasks with bounded look-ahead and yield results in order."""
+    pending = deque()
+    for fn, args in tasks:
+        pending.append(executor.submit(fn, *args))
+        if len(pending) >= max_in_flight:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def iter_line_blocks(input_path, chunk_size=DEFAULT_CHUNK_SIZE, skip_rows=0):
+    """Yield (header, block, row_offset, n_rows) with `chunk_size` raw CSV lines per block.
+
+    Splits on line boundaries, so fields must not contain embedded newlines
+    (true for laptop_price.csv-style feeds).
+    """
+    with open(input_path, "rb") as f:
+        header = f.readline()
+        for _ in islice(f, skip_rows):
+            pass
+        offset = skip_rows
+        while True:
+            lines = list(islice(f, chunk_size))
+            if not lines:
+                break
+            yield header, b"".join(lines), offset, len(lines)
+            offset += len(lines)
+
+
+def score_chunks_parallel(input_path, model, feature_names, chunk_size=DEFAULT_CHUNK_SIZE,
+                          skip_rows=0, workers=None, max_in_flight=None):
+    """Parallel drop-in for bulk's parse -> clean -> encode -> predict stages.
+
+    Yields (row_offset, laptop_IDs or None, predictions) in file order.
+    """
+    workers = workers or default_workers()
+    max_in_flight = max_in_flight or 2 * workers
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model, feature_names)) as executor:
+        blocks = iter_line_blocks(input_path, chunk_size, skip_rows)
+        tasks = ((_score_lines, (header, block, offset)) for header, block, offset, _ in blocks)
+        offset = skip_rows
+        for ids, preds in _ordered(executor, tasks, max_in_flight):
+            yield offset, ids, preds
+            offset += len(preds)
+
+
+def predict_batch_parallel(model, records, feature_names, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """predict_batch sharded across processes; returns predictions in input order."""
+    if not isinstance(records, pd.DataFrame):
+        records = pd.DataFrame.from_records(list(records))
+    workers = workers or default_workers()
+    shards = ((_predict_frame, (records.iloc[start:start + chunk_size],))
+              for start in range(0, len(records), chunk_size))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model, feature_names)) as executor:
+        parts = list(_ordered(executor, shards, 2 * workers))
+    if any(part is None for part in parts):
+        return None
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.float64)
@@ -1,8 +1,60 @@
 # predict.py
+#
+#   python src/predict.py                            # interactive, one laptop
+#   python src/predict.py bulk feed.csv scored.csv   # stream-score a raw CSV feed
 
-from streamlit.utils import get_user_inputs, predict_price
+import os
+import sys
+import argparse
 
-if __name__ == "__main__":
+# Allow `python src/predict.py` from the repo root as well as `python -m src.predict`
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.registry import get_model, get_feature_names
+from src.utils import get_user_inputs, predict_specs
+
+
+def run_interactive(args):
     user_input = get_user_inputs()
-    price = predict_price(user_input)
+    price = predict_specs(get_model(), user_input, get_feature_names())
     print(f"\n💰 Predicted Laptop Price: €{price}")
+
+
+def run_bulk(args):
+    from src.bulk import score_file
+    from src.parallel import default_workers
+
+    if args.workers == 0:
+        args.workers = default_workers()
+    summary = score_file(
+        args.input, args.output, get_model(), get_feature_names(),
+        chunk_size=args.chunk_size, checkpoint_path=args.checkpoint, resume=args.resume,
+        progress=not args.quiet, workers=args.workers,
+    )
+    print(f"Scored {summary['rows']:,} rows in {summary['seconds']}s ({summary['rows_per_sec']:,} rows/sec) -> {args.output}")
+
+
+def build_parser():
+    from src.bulk import DEFAULT_CHUNK_SIZE
+
+    parser = argparse.ArgumentParser(description="Laptop price prediction")
+    parser.set_defaults(func=run_interactive)
+    sub = parser.add_subparsers(dest="command")
+
+    bulk = sub.add_parser("bulk", help="score a raw CSV (laptop_price.csv layout) in chunks")
+    bulk.add_argument("input", help="raw CSV to score")
+    bulk.add_argument("output", help="where to write row, laptop_ID, Predicted_Price")
+    bulk.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="rows per chunk (bounds memory)")
+    bulk.add_argument("--checkpoint", default=None, help="checkpoint file (default: <output>.ckpt)")
+    bulk.add_argument("--workers", type=int, default=1, help="scoring processes (0 = one per CPU core)")
+    bulk.add_argument("--resume", action="store_true", help="continue from the checkpointed row offset")
+    bulk.add_argument("--quiet", action="store_true", help="no per-chunk progress on stderr")
+    bulk.set_defaults(func=run_bulk)
+    return parser
+
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    args.func(args)
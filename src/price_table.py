@@ -0,0 +1,186 @@
+# price_table.py
+# Precomputed price surface for a linear model: per-feature contribution tables.
+#
+# A LinearRegression prices a spec as
+#
+#   intercept + sum(contribution of each categorical value) + sum(coef * numeric value)
+#
+# so the whole surface the Streamlit widgets can reach decomposes into one small
+# table per feature. `build` materializes them into models/price_table.npz:
+#
+#   base                      intercept
+#   cat/<field>/values        category spellings the model knows, e.g. "Dell"
+#   cat/<field>/contrib       their contributions (unknown categories contribute 0)
+#   num/<feature>/coef        per-unit contribution of a numeric feature
+#   num/<feature>/grid        the widget's quantized values (slider / number_input steps)
+#   meta                      JSON: model_version it was built from, feature count
+#
+# Pricing a spec is then dict lookups and adds, and a what-if curve (price vs RAM,
+# vs SSD) is one vector add. The table records the model version it was built
+# from; get_price_table() returns None once the model changes, so callers fall back
+# to predict_specs until it is rebuilt.
+#
+#   python -m src.price_table build
+#   python -m src.price_table info
+
+import os
+import sys
+import json
+import argparse
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src import registry
+from src.encoder import FIELD_ALIASES, get_encoder
+from src.inference import additive_price, is_linear_model
+
+PRICE_TABLE_PATH = os.path.join(registry.MODELS_DIR, "price_table.npz")
+
+
+def _steps(start, stop, step):
+    return np.round(np.arange(start, stop + step / 2, step), 6)
+
+
+# Quantized values of the app's numeric widgets (streamlit/app.py)
+WIDGET_GRIDS = {
+    "Ram": _steps(4, 128, 4),
+    "Inches": _steps(10.0, 20.0, 0.1),
+    "Weight": _steps(0.5, 5.0, 0.1),
+    "SSD": _steps(0, 4000, 128),
+    "HDD": _steps(0, 6000, 500),
+    "Flash_Storage": _steps(0, 1000, 128),
+    "Hybrid": _steps(0, 2000, 500),
+}
+
+
+class PriceTable:
+    """Additive price surface: base + categorical lookups + numeric coefficient terms."""
+
+    def __init__(self, base, categories, coefs, grids, meta):
+        self.base = float(base)
+        self.categories = categories  # field -> {value: contribution}
+        self.coefs = coefs            # numeric feature -> coefficient
+        self.grids = grids            # numeric feature -> quantized widget values
+        self.meta = meta
+
+    @classmethod
+    def from_model(cls, model, feature_names, grids=WIDGET_GRIDS):
+        if not is_linear_model(model, len(feature_names)):
+            raise ValueError("Price tables need a linear model with one coefficient per feature.")
+        encoder = get_encoder(feature_names)
+        coef = np.asarray(model.coef_, dtype=np.float64)
+        categories = {
+            field: {value: float(coef[i]) for value, i in table.items()}
+            for field, table in encoder.category_index.items()
+        }
+        coefs = {name: float(coef[i]) for name, i in encoder.numeric_index.items()}
+        grids = {name: np.asarray(grid, dtype=np.float64) for name, grid in grids.items() if name in coefs}
+        return cls(model.intercept_, categories, coefs, grids, {"n_features": len(feature_names)})
+
+    # ---------- Lookups ----------
+
+    def price(self, spec):
+        """Raw (unrounded) price of a spec dict, identical to the linear engine's."""
+        return additive_price(self.base, self.categories, self.coefs, spec)
+
+    def sweep(self, spec, feature, values=None):
+        """(values, prices): the spec's price as `feature` moves over its widget grid."""
+        if feature not in self.coefs:
+            raise KeyError(f"'{feature}' is not a numeric feature of this model")
+        values = self.grids[feature] if values is None else np.asarray(values, dtype=np.float64)
+        rest = self.price({k: v for k, v in spec.items() if FIELD_ALIASES.get(k, k) != feature})
+        return values, rest + self.coefs[feature] * values
+
+    def contributions(self, spec):
+        """Per-field contribution of each value in the spec (what drives the price)."""
+        parts = {}
+        for key, value in spec.items():
+            key = FIELD_ALIASES.get(key, key)
+            if isinstance(value, str) and key in self.categories:
+                parts[key] = self.categories[key].get(value, 0.0)
+            elif value is not None and not isinstance(value, str) and key in self.coefs:
+                parts[key] = self.coefs[key] * value
+        return parts
+
+    # ---------- Persistence ----------
+
+    def save(self, path=PRICE_TABLE_PATH, model_version=None):
+        arrays = {"base": np.float64(self.base)}
+        for field, table in self.categories.items():
+            arrays[f"cat/{field}/values"] = np.asarray(list(table), dtype=str)
+            arrays[f"cat/{field}/contrib"] = np.asarray(list(table.values()), dtype=np.float64)
+        for name, coef in self.coefs.items():
+            arrays[f"num/{name}/coef"] = np.float64(coef)
+            if name in self.grids:
+                arrays[f"num/{name}/grid"] = self.grids[name]
+        meta = dict(self.meta, model_version=model_version)
+        arrays["meta"] = np.asarray(json.dumps(meta))
+
+        tmp = path + ".tmp.npz"
+        np.savez_compressed(tmp, **arrays)
+        os.replace(tmp, path)
+        self.meta = meta
+
+    @classmethod
+    def load(cls, path=PRICE_TABLE_PATH):
+        categories, coefs, grids = {}, {}, {}
+        with np.load(path, allow_pickle=False) as data:
+            for key in data.files:
+                kind, _, rest = key.partition("/")
+                name, _, part = rest.rpartition("/")
+                if kind == "cat" and part == "values":
+                    categories[name] = dict(zip(data[key].tolist(), data[f"cat/{name}/contrib"].tolist()))
+                elif kind == "num" and part == "coef":
+                    coefs[name] = float(data[key])
+                elif kind == "num" and part == "grid":
+                    grids[name] = data[key]
+            return cls(float(data["base"]), categories, coefs, grids, json.loads(str(data["meta"])))
+
+
+def build_price_table(path=PRICE_TABLE_PATH):
+    """Materialize the current model's table and record which model version it matches."""
+    model, feature_names = registry.get_model(), registry.get_feature_names()
+    table = PriceTable.from_model(model, feature_names)
+    table.save(path, registry.model_version())
+    return table
+
+
+def get_price_table(path=PRICE_TABLE_PATH):
+    """The table for the current model, or None if it is missing or built from another model."""
+    try:
+        table = registry.load_artifact(path, loader=PriceTable.load)
+    except (OSError, ValueError, KeyError):
+        return None
+    if table.meta.get("model_version") != registry.model_version():
+        return None
+    return table
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build/inspect the precomputed price table")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("build", "info"):
+        sub.add_parser(name).add_argument("--out", default=PRICE_TABLE_PATH)
+    args = parser.parse_args(argv)
+
+    import warnings
+    warnings.filterwarnings("ignore", message="Trying to unpickle estimator")
+
+    if args.command == "build":
+        table = build_price_table(args.out)
+        print(f"Wrote {args.out} ({os.path.getsize(args.out):,} bytes)")
+    else:
+        table = PriceTable.load(args.out)
+    info = dict(table.meta, categories={f: len(t) for f, t in table.categories.items()},
+                grids={f: len(g) for f, g in table.grids.items()})
+    if args.command == "info":
+        info["current"] = table.meta.get("model_version") == registry.model_version()
+    print(json.dumps(info, indent=2))
+
+
+if __name__ == "__main__":
+    main()
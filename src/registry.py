@@ -0,0 +1,117 @@
+# registry.py
+# Process-wide, lazily loaded model artifacts.
+#
+# Artifacts are unpickled on first use and then served from memory. Every lookup
+# does a cheap os.stat(); only when mtime/size moved do we hash the file, and only
+# when the content hash actually changed do we unpickle it again. Streamlit reruns
+# and repeated CLI/batch calls therefore never pay for joblib.load twice.
+
+import os
+import hashlib
+import threading
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(ROOT_DIR, "models")
+
+MODEL_PATH = os.path.join(MODELS_DIR, "best_model.pkl")
+FEATURES_PATH = os.path.join(MODELS_DIR, "feature_names.pkl")
+SCALER_PATH = os.path.join(MODELS_DIR, "scaler.pkl")
+
+_HASH_CHUNK = 1 << 20
+
+_lock = threading.Lock()
+_cache = {}  # abs path -> _Entry
+
+
+class _Entry:
+    __slots__ = ("stat_key", "digest", "value")
+
+    def __init__(self, stat_key, digest, value):
+        self.stat_key = stat_key
+        self.digest = digest
+        self.value = value
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def file_digest(path):
+    """SHA-256 of a file's contents (hex)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_CHUNK), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def load_artifact(path, loader=None):
+    """Return the unpickled artifact at `path`, reloading only if the file changed.
+
+    `loader(path)` replaces joblib.load for non-pickle artifacts (e.g. .npz tables).
+    """
+    path = os.path.abspath(path)
+    stat_key = _stat_key(path)
+    entry = _cache.get(path)
+    if entry is not None and entry.stat_key == stat_key:
+        return entry.value
+
+    with _lock:
+        entry = _cache.get(path)
+        if entry is not None and entry.stat_key == stat_key:
+            return entry.value
+
+        digest = file_digest(path)
+        if entry is not None and entry.digest == digest:
+            # Touched/copied but identical bytes -> keep the loaded object
+            entry.stat_key = stat_key
+            return entry.value
+
+        if loader is None:
+            import joblib  # deferred so importing the registry stays cheap
+            loader = joblib.load
+
+        value = loader(path)
+        _cache[path] = _Entry(stat_key, digest, value)
+        return value
+
+
+def artifact_digest(path):
+    """Content hash of a loaded artifact (loads it if needed)."""
+    load_artifact(path)
+    return _cache[os.path.abspath(path)].digest
+
+
+def get_model():
+    return load_artifact(MODEL_PATH)
+
+
+def get_feature_names():
+    return load_artifact(FEATURES_PATH)
+
+
+def get_vocabulary():
+    """The current feature layout as a Vocabulary (O(1) name -> column lookups)."""
+    from src.encoder import get_encoder
+    return get_encoder(get_feature_names()).vocabulary
+
+
+def get_scaler():
+    return load_artifact(SCALER_PATH)
+
+
+def model_version():
+    """Identifies the current model + feature layout; changes whenever either file does."""
+    return artifact_digest(MODEL_PATH)[:16] + ":" + artifact_digest(FEATURES_PATH)[:16]
+
+
+def source_version():
+    """model_version() from the file hashes alone, without unpickling (no joblib/sklearn import)."""
+    return file_digest(MODEL_PATH)[:16] + ":" + file_digest(FEATURES_PATH)[:16]
+
+
+def clear():
+    """Drop every cached artifact (next lookup reloads from disk)."""
+    with _lock:
+        _cache.clear()
@@ -0,0 +1,548 @@
+# reports.py
+# Incremental, parallel build of reports/figures/*.png and the feature-importance
+# CSV, replacing a top-to-bottom rerun of 02_exploratory_analysis.ipynb and
+# 03_model_training.ipynb.
+#
+# Every target declares the aggregates it is drawn from, and every aggregate the
+# data columns and model artifacts it reads. reports/manifest.json records, per
+# target, the hashes of those inputs: the data file, the slice of columns it
+# uses, the artifacts, the code of its render/aggregate functions, and the outputs
+# as written. A build only renders targets whose recorded hashes no longer match:
+#
+#   - unchanged tree: file hashes only, no pandas / matplotlib import
+#   - data file changed: the used column slices are hashed, so editing Weight
+#     rebuilds price_by_weight.png but not price_by_ram.png
+#   - an output deleted or edited by hand is rebuilt
+#
+# Aggregates (price groups per company, the correlation matrix, the notebook's
+# train/test fits) are computed once in the parent for all stale targets that need
+# them; the figures are rendered in worker processes on the headless Agg backend.
+#
+#   python -m src.reports build                 # stale targets only
+#   python -m src.reports build --force --workers 4
+#   python -m src.reports status
+
+import os
+import sys
+import json
+import time
+import hashlib
+import inspect
+import argparse
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src import registry
+
+DATA_PATH = os.path.join(ROOT_DIR, "data", "processed", "laptops_clean.csv")
+REPORTS_DIR = os.path.join(ROOT_DIR, "reports")
+FIGURES_DIR = os.path.join(REPORTS_DIR, "figures")
+MANIFEST_PATH = os.path.join(REPORTS_DIR, "manifest.json")
+
+TARGET = "Price_euros"
+RANDOM_STATE = 1  # the notebook's split
+TEST_SIZE = 0.2
+
+
+# ---------- Aggregates (computed once in the parent, shared by every target) ----------
+
+def _prices(frame):
+    return frame[TARGET].to_numpy()
+
+
+def _prices_by_company(frame):
+    return {name: group.to_numpy() for name, group in frame.groupby("Company", sort=False)[TARGET]}
+
+
+def _prices_by_type(frame):
+    return {name: group.to_numpy() for name, group in frame.groupby("TypeName", sort=False)[TARGET]}
+
+
+def _correlation(frame):
+    return frame.corr(numeric_only=True)
+
+
+def _ram_vs_price(frame):
+    return frame["Ram"].to_numpy(), frame[TARGET].to_numpy()
+
+
+def _weight_vs_price(frame):
+    return frame["Weight"].to_numpy(), frame[TARGET].to_numpy()
+
+
+def _notebook_fits(frame):
+    """03_model_training.ipynb's split and its two linear models, refit once.
+
+    Model A: numeric columns standardized, fit on log1p(price). Model B: raw
+    features, raw price. Returns the test targets, both models' test predictions,
+    and model A's coefficients (the notebook's feature importance; it titled the
+    chart after whichever model it kept, though the bars are always model A's).
+    """
+    import numpy as np
+    import pandas as pd
+    from sklearn.linear_model import LinearRegression
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    X, y = frame.drop(columns=[TARGET]), frame[TARGET]
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+    X_train, X_test = pd.get_dummies(X_train), pd.get_dummies(X_test)
+    X_train, X_test = X_train.align(X_test, join="left", axis=1, fill_value=0)
+
+    numeric = X_train.select_dtypes(include=[np.number]).columns
+    scaler = StandardScaler()
+    X_train_scaled, X_test_scaled = X_train.copy(), X_test.copy()
+    X_train_scaled[numeric] = scaler.fit_transform(X_train[numeric])
+    X_test_scaled[numeric] = scaler.transform(X_test[numeric])
+
+    model_a = LinearRegression().fit(X_train_scaled, np.log1p(y_train))
+    pred_a = np.expm1(model_a.predict(X_test_scaled))
+    pred_b = LinearRegression().fit(X_train, y_train).predict(X_test)
+    return {
+        "y_test": y_test.to_numpy(), "pred_A": pred_a, "pred_B": pred_b,
+        "features": list(X_train.columns), "coef_A": model_a.coef_,
+    }
+
+
+def _best_model_holdout(frame):
+    """The deployed model (models/best_model.pkl) on the notebook's test split."""
+    from sklearn.model_selection import train_test_split
+    from src.encoder import get_encoder
+    from src.inference import predict_rows
+
+    X, y = frame.drop(columns=[TARGET]), frame[TARGET]
+    _, X_test, _, y_test = train_test_split(X, y, test_size=TEST_SIZE, random_state=RANDOM_STATE)
+    feature_names = registry.get_feature_names()
+    matrix = get_encoder(feature_names).encode_batch(X_test)
+    return {"y_test": y_test.to_numpy(), "pred": predict_rows(registry.get_model(), matrix)}
+
+
+class Aggregate:
+    """A value derived from the data (`columns`, None = all) and model `artifacts`."""
+
+    __slots__ = ("compute", "columns", "artifacts")
+
+    def __init__(self, compute, columns=None, artifacts=()):
+        self.compute = compute
+        self.columns = columns
+        self.artifacts = artifacts
+
+
+AGGREGATES = {
+    "prices": Aggregate(_prices, (TARGET,)),
+    "prices_by_company": Aggregate(_prices_by_company, ("Company", TARGET)),
+    "prices_by_type": Aggregate(_prices_by_type, ("TypeName", TARGET)),
+    "correlation": Aggregate(_correlation),
+    "ram_vs_price": Aggregate(_ram_vs_price, ("Ram", TARGET)),
+    "weight_vs_price": Aggregate(_weight_vs_price, ("Weight", TARGET)),
+    "notebook_fits": Aggregate(_notebook_fits),
+    "best_model_holdout": Aggregate(_best_model_holdout, artifacts=(registry.MODEL_PATH, registry.FEATURES_PATH)),
+}
+
+
+# ---------- Renderers (run in the workers; matplotlib is on the Agg backend) ----------
+
+def _save(fig, path, dpi=100):
+    tmp = path + ".tmp"
+    fig.savefig(tmp, dpi=dpi, format=os.path.splitext(path)[1][1:])
+    os.replace(tmp, path)
+
+
+def _render_price_distribution(agg, paths):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    fig = plt.figure(figsize=(8, 5))
+    sns.histplot(agg["prices"], bins=50, kde=True)
+    plt.title("Distribution of Laptop Prices")
+    plt.xlabel("Price (Euros)")
+    plt.ylabel("Count")
+    _save(fig, paths[0])
+
+
+def _render_correlation_heatmap(agg, paths):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    fig = plt.figure(figsize=(22, 8))
+    sns.heatmap(agg["correlation"], annot=True, fmt=".2f", cmap="coolwarm")
+    plt.title("Correlation Heatmap")
+    _save(fig, paths[0])
+
+
+def _boxplot(groups, xlabel, title, path, figsize):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    fig = plt.figure(figsize=figsize)
+    sns.boxplot(data=groups)
+    plt.xticks(rotation=45)
+    plt.xlabel(xlabel)
+    plt.ylabel(TARGET)
+    plt.title(title)
+    plt.tight_layout()
+    _save(fig, path)
+
+
+def _render_price_by_company(agg, paths):
+    _boxplot(agg["prices_by_company"], "Company", "Laptop Price by Company", paths[0], (12, 6))
+
+
+def _render_price_by_type(agg, paths):
+    _boxplot(agg["prices_by_type"], "TypeName", "Laptop Price by Type", paths[0], (10, 6))
+
+
+def _scatter(x, y, xlabel, title, path):
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    fig = plt.figure(figsize=(8, 5))
+    sns.scatterplot(x=x, y=y)
+    plt.xlabel(xlabel)
+    plt.ylabel(TARGET)
+    plt.title(title)
+    _save(fig, path)
+
+
+def _render_price_by_ram(agg, paths):
+    _scatter(*agg["ram_vs_price"], "Ram", "Price vs RAM", paths[0])
+
+
+def _render_price_by_weight(agg, paths):
+    _scatter(*agg["weight_vs_price"], "Weight", "Price vs Weight", paths[0])
+
+
+def _actual_vs_predicted(y_test, pred, color, title, path):
+    import matplotlib.pyplot as plt
+    fig = plt.figure(figsize=(8, 8))
+    plt.scatter(y_test, pred, alpha=0.5, s=20, color=color)
+    lims = [min(y_test.min(), pred.min()), max(y_test.max(), pred.max())]
+    plt.plot(lims, lims, "r--", linewidth=1)  # identity line
+    plt.xlabel("Actual Price (Euros)")
+    plt.ylabel("Predicted Price (Euros)")
+    plt.title(title)
+    plt.xlim(lims)
+    plt.ylim(lims)
+    plt.grid(True)
+    _save(fig, path, dpi=150)
+
+
+def _render_model_a(agg, paths):
+    fits = agg["notebook_fits"]
+    _actual_vs_predicted(fits["y_test"], fits["pred_A"], "blue", "Actual vs Predicted — Model A", paths[0])
+
+
+def _render_model_b(agg, paths):
+    fits = agg["notebook_fits"]
+    _actual_vs_predicted(fits["y_test"], fits["pred_B"], "green", "Actual vs Predicted — Model B", paths[0])
+
+
+def _render_best_model(agg, paths):
+    best = agg["best_model_holdout"]
+    _actual_vs_predicted(best["y_test"], best["pred"], "purple", "Actual vs Predicted — Best Model (deployed)", paths[0])
+
+
+def _render_feature_importance(agg, paths):
+    import pandas as pd
+    import matplotlib.pyplot as plt
+    fits = agg["notebook_fits"]
+    importance = pd.DataFrame({"Feature": fits["features"], "Coefficient": fits["coef_A"]})
+    importance["Abs_Coefficient"] = importance["Coefficient"].abs()
+    importance = importance.sort_values(by="Abs_Coefficient", ascending=False)
+    tmp = paths[0] + ".tmp"
+    importance.to_csv(tmp, index=False)
+    os.replace(tmp, paths[0])
+
+    fig = plt.figure(figsize=(10, 6))
+    plt.barh(importance["Feature"][:10], importance["Coefficient"][:10])
+    plt.xlabel("Coefficient Value")
+    plt.title("Top 10 Influential Factors in Laptop Prices (Linear Model A)")
+    plt.gca().invert_yaxis()
+    plt.tight_layout()
+    _save(fig, paths[1], dpi=300)
+
+
+class ReportTarget:
+    """Output files (relative to the repo root) drawn by `render` from the `needs` aggregates."""
+
+    __slots__ = ("outputs", "render", "needs")
+
+    def __init__(self, outputs, render, needs):
+        self.outputs = outputs
+        self.render = render
+        self.needs = needs
+
+
+def _figure(name):
+    return os.path.join("reports", "figures", name)
+
+
+TARGETS = {
+    "price_distribution": ReportTarget((_figure("price_distribution.png"),), _render_price_distribution, ("prices",)),
+    "correlation_heatmap": ReportTarget((_figure("correlation_heatmap.png"),), _render_correlation_heatmap, ("correlation",)),
+    "price_by_company": ReportTarget((_figure("price_by_company.png"),), _render_price_by_company, ("prices_by_company",)),
+    "price_by_type": ReportTarget((_figure("price_by_type.png"),), _render_price_by_type, ("prices_by_type",)),
+    "price_by_ram": ReportTarget((_figure("price_by_ram.png"),), _render_price_by_ram, ("ram_vs_price",)),
+    "price_by_weight": ReportTarget((_figure("price_by_weight.png"),), _render_price_by_weight, ("weight_vs_price",)),
+    "actual_vs_predicted_model_A": ReportTarget(
+        (_figure("actual_vs_predicted_model_A.png"),), _render_model_a, ("notebook_fits",)),
+    "actual_vs_predicted_model_B": ReportTarget(
+        (_figure("actual_vs_predicted_model_B.png"),), _render_model_b, ("notebook_fits",)),
+    "actual_vs_predicted_best_model": ReportTarget(
+        (_figure("actual_vs_predicted_best_model.png"),), _render_best_model, ("best_model_holdout",)),
+    "linear_regression_feature_importance": ReportTarget(
+        (os.path.join("reports", "linear_regression_feature_importance.csv"),
+         _figure("linear_regression_feature_importance.png")),
+        _render_feature_importance, ("notebook_fits",)),
+}
+
+
+# ---------- Input hashing ----------
+
+def _rel(path):
+    return os.path.relpath(path, ROOT_DIR)
+
+
+def _global_names(code):
+    """Global names read by a code object, including its nested comprehensions and lambdas."""
+    yield from code.co_names
+    for const in code.co_consts:
+        if inspect.iscode(const):
+            yield from _global_names(const)
+
+
+def _sources(fn, seen):
+    """Source of `fn` and of the module-level functions it calls, transitively, plus the
+    values of the module-level constants they read (TARGET, RANDOM_STATE, TEST_SIZE, ...)."""
+    seen.add(fn)
+    yield inspect.getsource(fn)
+    for name in dict.fromkeys(_global_names(fn.__code__)):
+        value = globals().get(name)
+        if inspect.isfunction(value):
+            if value not in seen:
+                yield from _sources(value, seen)
+        elif isinstance(value, (bool, int, float, str, tuple)) and name not in seen:
+            seen.add(name)
+            yield f"{name} = {value!r}\n"
+
+
+def _aggregate_spec(name):
+    agg = AGGREGATES[name]
+    return f"{name}: columns={agg.columns!r} artifacts={[_rel(p) for p in agg.artifacts]!r}\n"
+
+
+def code_digest(target):
+    """Hash of the code that draws the target: its renderer, helpers, aggregates, the
+    constants they read and the aggregates' declarations (editing any of them rebuilds it)."""
+    h, seen = hashlib.sha256(), set()
+    for fn in (target.render, *(AGGREGATES[name].compute for name in target.needs)):
+        if fn not in seen:
+            for source in _sources(fn, seen):
+                h.update(source.encode("utf-8"))
+    for name in target.needs:
+        h.update(_aggregate_spec(name).encode("utf-8"))
+    return h.hexdigest()
+
+
+def input_files(target, data_path=DATA_PATH):
+    paths = [data_path] + [p for name in target.needs for p in AGGREGATES[name].artifacts]
+    return {_rel(p): registry.file_digest(p) for p in dict.fromkeys(paths)}
+
+
+def slice_columns(target, frame):
+    columns = []
+    for name in target.needs:
+        wanted = AGGREGATES[name].columns
+        columns += list(frame.columns) if wanted is None else list(wanted)
+    return list(dict.fromkeys(columns))
+
+
+def slice_digest(target, frame):
+    """Hash of just the columns the target's aggregates read."""
+    import pandas as pd
+    columns = slice_columns(target, frame)
+    h = hashlib.sha256(json.dumps(columns).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(frame[columns], index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def output_digests(target):
+    digests = {}
+    for path in target.outputs:
+        full = os.path.join(ROOT_DIR, path)
+        digests[path] = registry.file_digest(full) if os.path.exists(full) else None
+    return digests
+
+
+def read_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(manifest, path=MANIFEST_PATH):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+class _Frame:
+    """The data file, read at most once per build and only if a slice hash is needed."""
+
+    def __init__(self, path):
+        self.path = path
+        self.value = None
+
+    def get(self):
+        if self.value is None:
+            import pandas as pd
+            self.value = pd.read_csv(self.path)
+        return self.value
+
+
+def why_stale(name, entry, frame, data_path=DATA_PATH):
+    """None if the recorded build of `name` is still current, else the reason it is not.
+
+    Refreshes entry["files"] when the data file changed but the target's slice did not.
+    """
+    target = TARGETS[name]
+    if not entry:
+        return "never built"
+    if entry.get("code") != code_digest(target):
+        return "code changed"
+    if entry.get("outputs") != output_digests(target):
+        return "output missing or modified"
+    files = input_files(target, data_path)
+    recorded = entry.get("files", {})
+    for path, digest in files.items():
+        if recorded.get(path) != digest and path != _rel(data_path):
+            return f"{path} changed"
+    if recorded.get(_rel(data_path)) != files[_rel(data_path)]:
+        if entry.get("slice") != slice_digest(target, frame.get()):
+            return "data changed"
+        entry["files"] = files
+    return None
+
+
+# ---------- Build ----------
+
+def _init_worker():
+    import warnings
+    warnings.filterwarnings("ignore")
+    import matplotlib
+    matplotlib.use("Agg")
+    import seaborn as sns
+    sns.set(style="whitegrid")
+
+
+def _render(name, aggregates):
+    """Worker task: draw one target; returns (name, seconds)."""
+    import matplotlib.pyplot as plt
+    target = TARGETS[name]
+    for path in target.outputs:
+        os.makedirs(os.path.dirname(os.path.join(ROOT_DIR, path)), exist_ok=True)
+    start = time.perf_counter()
+    try:
+        target.render(aggregates, [os.path.join(ROOT_DIR, p) for p in target.outputs])
+    finally:
+        plt.close("all")
+    return name, time.perf_counter() - start
+
+
+def build_reports(names=None, force=False, workers=None, data_path=DATA_PATH, manifest_path=MANIFEST_PATH):
+    """Rebuild the stale (or, with force, all) targets; returns {name: reason or None if fresh}.
+
+    A target that fails to render raises RuntimeError, after the ones that did render
+    have been recorded in the manifest.
+    """
+    names = list(names or TARGETS)
+    for name in names:
+        if name not in TARGETS:
+            raise ValueError(f"Unknown report '{name}' (expected one of {list(TARGETS)}).")
+    manifest = read_manifest(manifest_path)
+    frame = _Frame(data_path)
+    status = {name: "forced" if force else why_stale(name, manifest.get(name), frame, data_path) for name in names}
+    stale = [name for name in names if status[name]]
+    failures = {}
+    if stale:
+        data = frame.get()
+        needed = dict.fromkeys(agg for name in stale for agg in TARGETS[name].needs)
+        aggregates = {agg: AGGREGATES[agg].compute(data) for agg in needed}
+        tasks = [(name, {agg: aggregates[agg] for agg in TARGETS[name].needs}) for name in stale]
+
+        from src.parallel import default_workers
+        workers = min(workers or default_workers(), len(tasks))
+        timings = {}
+        if workers == 1:
+            _init_worker()
+            for name, needs in tasks:
+                try:
+                    timings[name] = _render(name, needs)[1]
+                except Exception as e:
+                    failures[name] = e
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+                futures = {executor.submit(_render, *task): task[0] for task in tasks}
+                for future in as_completed(futures):
+                    try:
+                        timings[futures[future]] = future.result()[1]
+                    except Exception as e:
+                        failures[futures[future]] = e
+
+        # Record every target that did render, even if others failed
+        built = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        for name in (name for name in stale if name in timings):
+            target = TARGETS[name]
+            manifest[name] = {
+                "built": built, "seconds": round(timings[name], 3), "code": code_digest(target),
+                "files": input_files(target, data_path), "slice": slice_digest(target, data),
+                "outputs": output_digests(target),
+            }
+    write_manifest(manifest, manifest_path)
+    if failures:
+        details = "; ".join(f"{name}: {e}" for name, e in failures.items())
+        raise RuntimeError(f"{len(failures)} of {len(stale)} reports failed ({details})")
+    return status
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental report/figure build")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="render stale reports")
+    build.add_argument("--force", action="store_true", help="rebuild everything")
+    build.add_argument("--workers", type=int, default=0, help="render processes (0 = one per CPU core)")
+    status = sub.add_parser("status", help="list each report and why it is stale")
+    for p in (build, status):
+        p.add_argument("--only", nargs="+", choices=list(TARGETS), help="subset of reports")
+        p.add_argument("--data", default=DATA_PATH)
+    args = parser.parse_args(argv)
+
+    import warnings
+    warnings.filterwarnings("ignore")
+
+    if args.command == "status":
+        manifest, frame = read_manifest(), _Frame(args.data)
+        for name in args.only or TARGETS:
+            print(f"  {name:<40} {why_stale(name, manifest.get(name), frame, args.data) or 'up to date'}")
+        return
+
+    started = time.perf_counter()
+    try:
+        status = build_reports(args.only, args.force, args.workers or None, args.data)
+    except (OSError, ValueError, RuntimeError) as e:
+        print(f"⚠️ {e}")
+        sys.exit(1)
+    manifest = read_manifest()
+    for name, reason in status.items():
+        note = f"rebuilt ({reason}, {manifest[name]['seconds']:.2f}s)" if reason else "up to date"
+        print(f"  {name:<40} {note}")
+    rebuilt = sum(1 for reason in status.values() if reason)
+    print(f"{rebuilt} of {len(status)} reports rebuilt in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
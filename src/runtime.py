@@ -0,0 +1,220 @@
+# runtime.py
+# Compact, sklearn-free runtime model: one versioned, checksummed .npz artifact and
+# a scorer that needs only NumPy.
+#
+# Serving from the pickles means importing pandas, scikit-learn and joblib (over a
+# second of cold start) to unpickle best_model.pkl / feature_names.pkl /
+# scaler.pkl. `export` compiles them once into models/model_runtime.npz:
+#
+#   header           JSON: format_version, model_version of the source pickles,
+#                    categorical fields / aliases, input / target transforms, checksum
+#   feature_names    the vocabulary, in column order
+#   coef, intercept  the linear model
+#   scaler_columns, scaler_mean, scaler_scale
+#                    StandardScaler parameters (applied at predict time only for
+#                    models trained on scaled input, like the notebook's model A)
+#
+# The checksum is a SHA-256 over every array and the rest of the header (the
+# log_target / scaled_input flags change the output too), verified on load. This module imports
+# only the standard library and NumPy at module level; export pulls in the rest.
+#
+#   python -m src.runtime export
+#   python -m src.runtime predict '{"Company": "Dell", "TypeName": "Notebook", "Ram": 8}'
+#   python -m src.runtime info
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+FORMAT_VERSION = 2  # 2: the checksum also covers the header
+RUNTIME_PATH = os.path.join(ROOT_DIR, "models", "model_runtime.npz")
+ARRAY_NAMES = ("feature_names", "coef", "intercept", "scaler_columns", "scaler_mean", "scaler_scale")
+
+
+def checksum(arrays, header):
+    """SHA-256 over the header (minus its checksum) and the named arrays' dtype, shape
+    and bytes, in a fixed order."""
+    fields = {key: value for key, value in header.items() if key != "checksum"}
+    h = hashlib.sha256(json.dumps(fields, sort_keys=True).encode("utf-8"))
+    for name in ARRAY_NAMES:
+        a = np.ascontiguousarray(arrays[name])
+        h.update(f"{name}:{a.dtype.str}:{a.shape}".encode("utf-8"))
+        h.update(a.tobytes())
+    return h.hexdigest()
+
+
+class RuntimeModel:
+    """Scores spec dicts or encoded rows from a model_runtime.npz with NumPy only."""
+
+    def __init__(self, header, arrays):
+        self.header = header
+        self.feature_names = arrays["feature_names"].tolist()
+        self.coef = arrays["coef"].astype(np.float64)
+        self.intercept = float(arrays["intercept"])
+        self.aliases = header["field_aliases"]
+        self.log_target = header["log_target"]
+
+        index = {name: i for i, name in enumerate(self.feature_names)}
+        mean = np.zeros(len(self.coef))
+        scale = np.ones(len(self.coef))
+        if header["scaled_input"]:
+            for name, m, s in zip(arrays["scaler_columns"].tolist(), arrays["scaler_mean"], arrays["scaler_scale"]):
+                mean[index[name]], scale[index[name]] = m, s
+        self.mean, self.scale = mean, scale
+
+        # Same decomposition as src.inference.InferenceEngine: one coefficient per
+        # active category, coef * (scaled) value per numeric feature
+        fields = header["categorical_fields"]
+        self.category_coef = {field: {} for field in fields}
+        self.numeric = {}
+        for name, i in index.items():
+            for field in fields:
+                if name.startswith(field + "_"):
+                    self.category_coef[field][name[len(field) + 1:]] = float(self.coef[i])
+                    break
+            else:
+                self.numeric[name] = (float(self.coef[i]), float(mean[i]), float(scale[i]))
+
+    @classmethod
+    def load(cls, path=RUNTIME_PATH, verify=True):
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(str(data["header"]))
+            arrays = {name: data[name] for name in ARRAY_NAMES}
+        if header.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Runtime artifact format {header.get('format_version')} != {FORMAT_VERSION}; re-export it.")
+        if verify and checksum(arrays, header) != header.get("checksum"):
+            raise ValueError(f"Checksum mismatch in {path}; the artifact is corrupt, re-export it.")
+        return cls(header, arrays)
+
+    def _finish(self, raw):
+        return np.expm1(raw) if self.log_target else raw
+
+    def predict_one(self, spec):
+        """Raw (unrounded) price of one spec dict.
+
+        Categories must be spelled as in training, exactly like src.inference.additive_price;
+        normalize user input with src.cache.spec_key first.
+        """
+        price = self.intercept
+        for key, value in spec.items():
+            key = self.aliases.get(key, key)
+            if value is None:
+                continue
+            if isinstance(value, str):
+                table = self.category_coef.get(key)
+                if table is not None:
+                    price += table.get(value, 0.0)
+            else:
+                term = self.numeric.get(key)
+                if term is not None:
+                    coef, mean, scale = term
+                    price += coef * (value - mean) / scale
+        return float(self._finish(price))
+
+    def predict(self, specs):
+        return np.array([self.predict_one(spec) for spec in specs], dtype=np.float64)
+
+    def predict_matrix(self, X):
+        """Prices for rows already laid out like feature_names (unscaled)."""
+        X = np.asarray(X, dtype=np.float64)
+        return self._finish(((X - self.mean) / self.scale) @ self.coef + self.intercept)
+
+
+def export_runtime(path=RUNTIME_PATH, scaled_input=False, log_target=False):
+    """Compile the registry's model, scaler and feature list into one .npz artifact.
+
+    The deployed model (the notebook's model B) takes raw features and predicts the
+    raw price; pass scaled_input / log_target for a model trained like model A.
+    """
+    from datetime import datetime
+    from src import registry
+    from src.encoder import CATEGORICAL_FIELDS, FIELD_ALIASES
+    from src.inference import is_linear_model
+
+    model, feature_names = registry.get_model(), list(registry.get_feature_names())
+    if not is_linear_model(model, len(feature_names)):
+        raise ValueError("Only linear models with one coefficient per feature can be compiled.")
+    try:
+        scaler = registry.get_scaler()
+        scaler_columns = [str(c) for c in scaler.feature_names_in_]
+        scaler_mean, scaler_scale = scaler.mean_, scaler.scale_
+    except (OSError, AttributeError):
+        if scaled_input:
+            raise
+        scaler_columns, scaler_mean, scaler_scale = [], np.zeros(0), np.ones(0)
+
+    arrays = {
+        "feature_names": np.asarray(feature_names, dtype=str),
+        "coef": np.asarray(model.coef_, dtype=np.float64),
+        "intercept": np.float64(model.intercept_),
+        "scaler_columns": np.asarray(scaler_columns, dtype=str),
+        "scaler_mean": np.asarray(scaler_mean, dtype=np.float64),
+        "scaler_scale": np.asarray(scaler_scale, dtype=np.float64),
+    }
+    header = {
+        "format_version": FORMAT_VERSION,
+        "model_version": registry.model_version(),
+        "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "model_type": type(model).__name__,
+        "n_features": len(feature_names),
+        "categorical_fields": list(CATEGORICAL_FIELDS),
+        "field_aliases": dict(FIELD_ALIASES),
+        "scaled_input": bool(scaled_input),
+        "log_target": bool(log_target),
+    }
+    header["checksum"] = checksum(arrays, header)
+    tmp = path + ".tmp.npz"
+    np.savez(tmp, header=np.asarray(json.dumps(header)), **arrays)
+    os.replace(tmp, path)
+    return header
+
+
+def is_current(runtime):
+    """True if the artifact was compiled from the pickles currently in models/ (hashes only)."""
+    from src import registry
+    return runtime.header.get("model_version") == registry.source_version()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile / use the NumPy-only runtime model")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export = sub.add_parser("export", help="compile the pickled artifacts into one .npz")
+    export.add_argument("--scaled-input", action="store_true", help="model was trained on scaler.pkl output")
+    export.add_argument("--log-target", action="store_true", help="model predicts log1p(price)")
+    predict = sub.add_parser("predict", help="score JSON spec objects (arguments, or one per stdin line)")
+    predict.add_argument("specs", nargs="*")
+    sub.add_parser("info", help="print the artifact header")
+    for p in sub.choices.values():
+        p.add_argument("--path", default=RUNTIME_PATH)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        import warnings
+        warnings.filterwarnings("ignore", message="Trying to unpickle estimator")
+        header = export_runtime(args.path, args.scaled_input, args.log_target)
+        print(f"Wrote {args.path} ({os.path.getsize(args.path):,} bytes, checksum {header['checksum'][:16]})")
+        return
+
+    try:
+        runtime = RuntimeModel.load(args.path)
+    except (OSError, ValueError) as e:
+        print(f"⚠️ {e}")
+        sys.exit(1)
+    if args.command == "info":
+        print(json.dumps(dict(runtime.header, current=is_current(runtime)), indent=2))
+        return
+    for line in args.specs or sys.stdin:
+        if line.strip():
+            print(round(runtime.predict_one(json.loads(line)), 4))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,370 @@
+# service.py
+# Asyncio HTTP prediction service (stdlib only).
+#
+#   POST /predict        {"Company": "Dell", "TypeName": "Notebook", "Ram": 8, ...} -> {"price": 812.3}
+#   POST /predict/batch  [{...}, {...}]                                          -> {"prices": [...]}
+#   POST /comparables    {...} or [{...}, ...] (?k=5, at most 50) -> {"comparables": [[listing, ...], ...]}
+#   GET  /health         -> {"status": "ok", "model_version": "..."}
+#   GET  /stats          -> micro-batching counters
+#   GET  /metrics        -> stage timers and counters (Prometheus text; ?format=json for JSON)
+#
+# Concurrent /predict calls are micro-batched: the first request opens a window of
+# --max-wait-ms (or until --max-batch requests are queued), then the whole batch
+# is encoded into one matrix and scored with a single vectorized predict.
+# Specs are normalized exactly like the Streamlit app (src.cache.spec_key).
+#
+#   python -m src.service --port 8000
+
+import os
+import sys
+import json
+import math
+import asyncio
+import argparse
+import numbers
+
+import numpy as np
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src import registry
+from src.cache import spec_key
+from src.comparables import DEFAULT_K, get_comparables
+from src.encoder import get_encoder
+from src.inference import predict_rows
+from src.metrics import get_metrics
+from src.utils import log_event
+
+DEFAULT_MAX_BATCH = 64
+DEFAULT_MAX_WAIT_MS = 2.0
+MAX_BODY_BYTES = 10 * 1024 * 1024
+MAX_COMPARABLES = 50  # largest k accepted by /comparables
+
+METRICS = get_metrics()
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class BadRequest(Exception):
+    pass
+
+
+def check_spec(spec, encoder):
+    """Raise BadRequest unless every numeric field in `spec` is a finite real number and
+    every categorical field a string.
+
+    The encoder only looks up strings as categories and only copies numbers into
+    numeric columns, so {"Ram": "8"} or {"Company": ["Dell"]} would otherwise be
+    dropped silently and priced as if the field were missing.
+    """
+    for field, value in spec.items():
+        if value is None:
+            continue
+        if field in encoder.category_index:
+            if not isinstance(value, str):
+                raise BadRequest(f"Field {field!r} must be a string, got {value!r}")
+        elif field in encoder.numeric_index:
+            if isinstance(value, bool) or not isinstance(value, numbers.Real) or not math.isfinite(value):
+                raise BadRequest(f"Field {field!r} must be a finite number, got {value!r}")
+
+
+def _log_outliers(preds):
+    # Same rule and message as predict_price (dataset: ~€100–€6990)
+    outliers = preds[(preds < 100) | (preds > 6990)]
+    METRICS.inc("outliers_total", len(outliers))
+    for pred in outliers:
+        pred = float(pred)
+        log_event("warn", "PREDICT", str(pred), f"Unrealistic prediction generated: €{pred}.")
+
+
+class MicroBatcher:
+    """Collects single predictions for a few milliseconds and scores them together."""
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.queue = asyncio.Queue()
+        self.batches = 0
+        self.requests = 0
+        self.largest_batch = 0
+
+    async def predict(self, spec):
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((spec, future))
+        return await future
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self.score(batch)
+
+    def score(self, batch):
+        """Encode every spec into one matrix and resolve each future with its price."""
+        self.batches += 1
+        self.requests += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        try:
+            model, feature_names = registry.get_model(), registry.get_feature_names()
+            encoder = get_encoder(feature_names)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        METRICS.inc("requests_total", len(batch))
+        matrix = np.zeros((len(batch), encoder.n_features), dtype=np.float64)
+        ok = []
+        with METRICS.timer("encode"):
+            for i, (spec, future) in enumerate(batch):
+                try:
+                    spec = spec_key(spec, feature_names)[0]
+                    check_spec(spec, encoder)
+                    if METRICS.enabled:
+                        encoder.record_categories(spec)
+                    encoder.encode(spec, out=matrix[i:i + 1])
+                    ok.append(i)
+                except BadRequest as e:
+                    future.set_exception(e)
+                except Exception as e:
+                    future.set_exception(BadRequest(f"Could not encode spec: {e}"))
+        if not ok:
+            return
+
+        try:
+            with METRICS.timer("predict"):
+                preds = np.round(predict_rows(model, matrix[ok]), 4)
+        except Exception as e:
+            log_event("error", "PREDICT", f"{len(ok)} rows", f"Prediction failure: {e}")
+            for i in ok:
+                batch[i][1].set_exception(e)
+            return
+
+        _log_outliers(preds)
+        for i, pred in zip(ok, preds):
+            future = batch[i][1]
+            if not future.done():
+                future.set_result(float(pred))
+
+    def stats(self):
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": round(self.requests / self.batches, 2) if self.batches else None,
+            "largest_batch": self.largest_batch,
+            "max_batch": self.max_batch,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
+
+
+class PredictionService:
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, max_wait_ms=DEFAULT_MAX_WAIT_MS):
+        self.batcher = MicroBatcher(max_batch, max_wait_ms)
+
+    async def route(self, method, path, body):
+        path, _, query = path.partition("?")
+        path = path.rstrip("/") or "/"
+        if path == "/metrics":
+            # Prometheus text by default, ?format=json for the snapshot dict
+            return 200, METRICS.snapshot() if "format=json" in query else METRICS.to_prometheus()
+        if path == "/health":
+            return 200, {"status": "ok", "model_version": registry.model_version()}
+        if path == "/stats":
+            return 200, self.batcher.stats()
+        if path not in ("/predict", "/predict/batch", "/comparables"):
+            return 404, {"error": f"Unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+
+        try:
+            payload = json.loads(body or b"null")
+        except ValueError:
+            return 400, {"error": "Body is not valid JSON"}
+
+        if path == "/comparables":
+            return self.comparables(payload, query)
+
+        if path == "/predict":
+            if not isinstance(payload, dict):
+                return 400, {"error": "Expected a JSON object with laptop specs"}
+            try:
+                return 200, {"price": await self.batcher.predict(payload)}
+            except BadRequest as e:
+                return 400, {"error": str(e)}
+
+        if not isinstance(payload, list) or not all(isinstance(p, dict) for p in payload):
+            return 400, {"error": "Expected a JSON array of laptop spec objects"}
+        try:
+            return 200, {"prices": await self.predict_many(payload)}
+        except BadRequest as e:
+            return 400, {"error": str(e)}
+
+    async def predict_many(self, specs):
+        """Explicit batches skip the batcher: each spec is normalized, validated and encoded
+        like a /predict call, then the matrix is scored off the event loop."""
+        feature_names = registry.get_feature_names()
+        encoder = get_encoder(feature_names)
+        METRICS.inc("requests_total", len(specs))
+        matrix = np.zeros((len(specs), encoder.n_features), dtype=np.float64)
+        with METRICS.timer("encode"):
+            for i, spec in enumerate(specs):
+                spec = spec_key(spec, feature_names)[0]
+                try:
+                    check_spec(spec, encoder)
+                except BadRequest as e:
+                    raise BadRequest(f"Spec {i}: {e}") from None
+                if METRICS.enabled:
+                    encoder.record_categories(spec)
+                encoder.encode(spec, out=matrix[i:i + 1])
+
+        with METRICS.timer("predict"):
+            preds = await asyncio.get_running_loop().run_in_executor(
+                None, predict_rows, registry.get_model(), matrix)
+        preds = np.round(preds, 4)
+        if not np.isfinite(preds).all():
+            raise RuntimeError("Batch prediction produced a non-finite price")
+        _log_outliers(preds)
+        return preds.tolist()
+
+    def comparables(self, payload, query):
+        """k nearest real listings for one spec or a list of specs (one index query for the batch)."""
+        specs = [payload] if isinstance(payload, dict) else payload
+        if not isinstance(specs, list) or not all(isinstance(p, dict) for p in specs):
+            return 400, {"error": "Expected a JSON object or array of laptop spec objects"}
+        params = dict(part.partition("=")[::2] for part in query.split("&") if part)
+        try:
+            k = int(params.get("k", DEFAULT_K))
+        except ValueError:
+            return 400, {"error": "k must be an integer"}
+        index = get_comparables()
+        if index is None:
+            return 404, {"error": "No comparables index; run `python -m src.comparables build`"}
+        feature_names = registry.get_feature_names()
+        encoder = get_encoder(feature_names)
+        specs = [spec_key(spec, feature_names)[0] for spec in specs]
+        try:
+            for spec in specs:
+                check_spec(spec, encoder)
+        except BadRequest as e:
+            return 400, {"error": str(e)}
+        k = min(max(1, k), MAX_COMPARABLES, len(index))
+        with METRICS.timer("comparables"):
+            return 200, {"comparables": index.query_batch(specs, k)}
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                try:
+                    length = int(headers.get("content-length") or 0)
+                    if length < 0:
+                        raise ValueError(length)
+                except ValueError:
+                    length = None
+                if length is None:
+                    status, payload = 400, {"error": "Invalid Content-Length"}
+                    keep_alive = False
+                elif length > MAX_BODY_BYTES:
+                    status, payload = 413, {"error": "Request body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    try:
+                        status, payload = await self.route(method, path, body)
+                    except Exception as e:
+                        log_event("error", "SERVICE", path, f"Request failed: {e}")
+                        status, payload = 500, {"error": "Prediction failed"}
+                    keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                if isinstance(payload, str):
+                    data, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+                else:
+                    try:
+                        # NaN / Infinity are not JSON; never send them
+                        data = json.dumps(payload, allow_nan=False).encode("utf-8")
+                    except ValueError:
+                        log_event("error", "SERVICE", path, "Response contained a non-finite number")
+                        status, data = 500, json.dumps({"error": "Prediction failed"}).encode("utf-8")
+                    content_type = "application/json"
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: {content_type}\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8000, ready=None):
+        """Run until cancelled; `ready` (an asyncio.Event) is set once the socket is listening."""
+        batcher_task = asyncio.create_task(self.batcher.run())
+        server = await asyncio.start_server(self.handle, host, port)
+        self.port = server.sockets[0].getsockname()[1]
+        if ready is not None:
+            ready.set()
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher_task.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Laptop price prediction HTTP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH, help="largest micro-batch")
+    parser.add_argument("--max-wait-ms", type=float, default=DEFAULT_MAX_WAIT_MS, help="micro-batch window")
+    args = parser.parse_args(argv)
+
+    import warnings
+    warnings.filterwarnings("ignore", message="Trying to unpickle estimator")
+    registry.get_model()  # load before accepting traffic
+    registry.get_feature_names()
+
+    service = PredictionService(args.max_batch, args.max_wait_ms)
+    print(f"Serving on http://{args.host}:{args.port} (max batch {args.max_batch}, window {args.max_wait_ms} ms)")
+    try:
+        asyncio.run(service.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+# stream_train.py
+# Out-of-core training: datasets larger than RAM, streamed in fixed-size chunks.
+#
+#   vocabulary pass -> fit pass(es) -> holdout pass
+#
+# 1. The category vocabulary is fixed before fitting (scanned from the data and
+#    seeded with models/feature_names.pkl so existing columns keep their order, or
+#    loaded as-is with --vocab), so every chunk encodes into the same layout.
+# 2. Each chunk is encoded into one reused float32 buffer (or a scipy CSR matrix
+#    with --sparse), and its training rows are folded into either
+#      normal  - accumulated normal equations (src.train.TrainingState), solved
+#                exactly like LinearRegression.fit; or
+#      sgd     - averaged SGDRegressor.partial_fit on scaled chunks for a few
+#                epochs, mapped back to raw-feature coefficients.
+# 3. A fixed, hash-selected holdout (independent of chunk size and file order
+#    within a run) is streamed again to compute MAE / RMSE / R².
+#
+# Only per-feature statistics and one chunk are held in memory, so peak memory
+# scales with --chunk-size, not the dataset. Artifacts are written in the
+# best_model.pkl / scaler.pkl / feature_names.pkl format the app loads, to
+# models/stream/ by default so a run never replaces the deployed model by accident.
+# With --out models they replace it, and the artifacts compiled from it
+# (price_table.npz, model_runtime.npz) are rebuilt in the same run.
+#
+#   python -m src.stream_train data/processed/laptops_clean.csv
+#   python -m src.stream_train data/processed/laptops_clean.csv --out models   # deploy
+#   python -m src.stream_train history_*.csv --method sgd --epochs 5 --chunk-size 100000
+#   python -m src.stream_train feed.csv --raw --no-export
+
+import os
+import sys
+import json
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.encoder import CATEGORICAL_FIELDS, get_encoder
+from src.registry import FEATURES_PATH, MODELS_DIR
+from src.train import (
+    TARGET, DEFAULT_CHUNK_SIZE, TrainingState,
+    make_linear_model, make_scaler, numeric_columns, refresh_derived_artifacts, write_artifacts,
+)
+
+PROCESSED_CSV = os.path.join(ROOT_DIR, "data", "processed", "laptops_clean.csv")
+CANDIDATE_DIR = os.path.join(MODELS_DIR, "stream")
+DEFAULT_HOLDOUT = 0.2
+DEFAULT_EPOCHS = 5
+HOLDOUT_SEED = 1
+METHODS = ("normal", "sgd")
+
+
+# ---------- Chunk stream ----------
+
+def read_chunks(paths, chunk_size=DEFAULT_CHUNK_SIZE, raw=False, usecols=None):
+    """Yield (row_offset, cleaned_chunk) over several CSVs; offsets continue across files."""
+    from src.cleaning import RAW_ENCODING, clean_raw
+
+    offset = 0
+    for path in paths:
+        if raw:
+            reader = pd.read_csv(path, encoding=RAW_ENCODING, chunksize=chunk_size)
+        else:
+            reader = pd.read_csv(path, chunksize=chunk_size, usecols=usecols)
+        for chunk in reader:
+            if raw:
+                chunk = clean_raw(chunk, drop_invalid=False)
+            yield offset, chunk
+            offset += len(chunk)
+
+
+def holdout_mask(offset, n_rows, fraction, seed=HOLDOUT_SEED):
+    """Rows offset..offset+n_rows that belong to the holdout, chosen by a row-number hash."""
+    if fraction <= 0:
+        return np.zeros(n_rows, dtype=bool)
+    h = np.arange(offset, offset + n_rows, dtype=np.uint64) + np.uint64(seed)
+    h *= np.uint64(0x9E3779B97F4A7C15)
+    h ^= h >> np.uint64(29)
+    h *= np.uint64(0xBF58476D1CE4E5B9)
+    h ^= h >> np.uint64(32)
+    return (h >> np.uint64(11)).astype(np.float64) / float(1 << 53) < fraction
+
+
+def encoded_chunks(paths, feature_names, chunk_size=DEFAULT_CHUNK_SIZE, raw=False,
+                   holdout=DEFAULT_HOLDOUT, dtype=np.float32, sparse=False):
+    """Yield (X, y, is_holdout) per chunk, X a view of one reused (chunk_size, p) buffer,
+    or a scipy CSR matrix with sparse=True.
+
+    Rows with a missing value are skipped (the notebook trains on complete rows only).
+    """
+    encoder = get_encoder(feature_names)
+    buffer = None if sparse else np.zeros((chunk_size, encoder.n_features), dtype=dtype)
+    for offset, chunk in read_chunks(paths, chunk_size, raw):
+        hold = holdout_mask(offset, len(chunk), holdout)
+        valid = chunk.notna().all(axis=1).to_numpy()
+        if not valid.all():
+            chunk, hold = chunk[valid], hold[valid]
+        if chunk.empty:
+            continue
+        features = chunk.drop(columns=[TARGET])
+        if sparse:
+            X = encoder.encode_batch_sparse(features, dtype)
+        else:
+            X = encoder.encode_batch(features, out=buffer)
+        yield X, chunk[TARGET].to_numpy(dtype=np.float64), hold
+
+
+# ---------- Vocabulary ----------
+
+def scan_vocabulary(paths, chunk_size=DEFAULT_CHUNK_SIZE, raw=False, seed_names=()):
+    """Fixed feature layout for the whole stream: `seed_names`, then any new columns.
+
+    New numeric columns come first, then each field's new categories sorted, the
+    same order pd.get_dummies gives. Only the categorical columns are parsed for
+    laptops_clean.csv-style inputs.
+    """
+    names = list(seed_names)
+    known = set(names)
+    categories = {field: set() for field in CATEGORICAL_FIELDS}
+
+    usecols = None
+    if not raw:
+        for path in paths:
+            header = pd.read_csv(path, nrows=0).columns
+            numeric = [c for c in header if c != TARGET and c not in CATEGORICAL_FIELDS]
+            names += [c for c in numeric if c not in known]
+            known.update(numeric)
+        usecols = lambda col: col in CATEGORICAL_FIELDS
+
+    for _, chunk in read_chunks(paths, chunk_size, raw, usecols=usecols):
+        if raw:
+            numeric = [c for c in chunk.columns if c != TARGET and c not in CATEGORICAL_FIELDS and c not in known]
+            names += numeric
+            known.update(numeric)
+        for field in CATEGORICAL_FIELDS:
+            if field in chunk.columns:
+                categories[field].update(str(v) for v in chunk[field].dropna().unique())
+
+    for field in CATEGORICAL_FIELDS:
+        names += [name for name in (f"{field}_{v}" for v in sorted(categories[field])) if name not in known]
+    return names
+
+
+# ---------- Fitting ----------
+
+class ColumnMoments:
+    """Running per-column mean and variance (Chan et al. merge), O(p) memory."""
+
+    def __init__(self, n_features):
+        self.n = 0
+        self.mean = np.zeros(n_features)
+        self.m2 = np.zeros(n_features)
+
+    def update(self, X):
+        n_b = X.shape[0]
+        if n_b == 0:
+            return
+        if hasattr(X, "tocsr"):
+            mean_b = np.asarray(X.mean(axis=0, dtype=np.float64)).ravel()
+            m2_b = np.asarray(X.multiply(X).sum(axis=0, dtype=np.float64)).ravel() - n_b * mean_b ** 2
+        else:
+            mean_b = X.mean(axis=0, dtype=np.float64)
+            m2_b = ((X - mean_b) ** 2).sum(axis=0)
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.m2 += m2_b + delta ** 2 * (self.n * n_b / n)
+        self.mean += delta * (n_b / n)
+        self.n = n
+
+    @property
+    def var(self):
+        return self.m2 / self.n if self.n else np.zeros_like(self.m2)
+
+
+def fit_normal_equations(chunks, feature_names):
+    """Exact least squares from accumulated normal equations; returns (model, scaler, rows)."""
+    state = TrainingState(feature_names)
+    for X, y, hold in chunks():
+        train = ~hold
+        state.update_arrays(X[train], y[train])
+    return state.to_model(), state.to_scaler(), state.n
+
+
+def fit_sgd(chunks, feature_names, epochs=DEFAULT_EPOCHS, seed=0, sparse=False):
+    """Averaged SGDRegressor.partial_fit over scaled chunks; returns (model, scaler, rows).
+
+    One extra pass collects per-column mean/variance. Numeric columns are then
+    standardized like the notebook's scaler (dummies stay 0/1: standardizing a rare
+    category blows it up and destabilizes SGD), the target is standardized too, and
+    the result is mapped back to raw-feature coefficients so it exports as a plain
+    LinearRegression. Sparse chunks are only scaled, not centered, so they stay sparse.
+    """
+    from scipy.sparse import diags
+    from sklearn.linear_model import SGDRegressor
+
+    x_moments = ColumnMoments(len(feature_names))
+    y_moments = ColumnMoments(1)
+    for X, y, hold in chunks():
+        train = ~hold
+        x_moments.update(X[train])
+        y_moments.update(y[train, None])
+    if x_moments.n == 0:
+        raise ValueError("No training rows.")
+
+    index = get_encoder(feature_names).numeric_index
+    numeric = [index[c] for c in numeric_columns(feature_names)]
+    x_mean = np.zeros(len(feature_names))
+    x_scale = np.ones(len(feature_names))
+    if not sparse:
+        x_mean[numeric] = x_moments.mean[numeric]
+    x_scale[numeric] = np.sqrt(x_moments.var[numeric])
+    x_scale[x_scale == 0] = 1.0
+    y_mean = float(y_moments.mean[0])
+    y_scale = float(np.sqrt(y_moments.var[0])) or 1.0
+
+    rng = np.random.default_rng(seed)
+    sgd = SGDRegressor(average=True, random_state=seed)
+    for _ in range(epochs):
+        for X, y, hold in chunks():
+            train = np.flatnonzero(~hold)
+            if len(train) == 0:
+                continue
+            train = rng.permutation(train)
+            if sparse:
+                X_scaled = X[train] @ diags(1.0 / x_scale)
+            else:
+                X_scaled = (X[train] - x_mean) / x_scale
+            sgd.partial_fit(X_scaled, (y[train] - y_mean) / y_scale)
+
+    coef = sgd.coef_ * y_scale / x_scale
+    intercept = y_mean + y_scale * float(sgd.intercept_[0]) - float(coef @ x_mean)
+    model = make_linear_model(coef, intercept, feature_names)
+    scaler = make_scaler(feature_names, x_moments.mean, x_moments.var, x_moments.n)
+    return model, scaler, x_moments.n
+
+
+def evaluate_holdout(chunks, model):
+    """MAE / RMSE / R² of `model` on the holdout rows, accumulated chunk by chunk."""
+    coef, intercept = model.coef_, float(model.intercept_)
+    n, abs_err, sq_err = 0, 0.0, 0.0
+    y_moments = ColumnMoments(1)
+    for X, y, hold in chunks():
+        if not hold.any():
+            continue
+        err = y[hold] - (X[hold] @ coef + intercept)
+        n += len(err)
+        abs_err += float(np.abs(err).sum())
+        sq_err += float(err @ err)
+        y_moments.update(y[hold, None])
+    if n == 0:
+        return {"rows": 0, "mae": None, "rmse": None, "r2": None}
+    total = float(y_moments.m2[0])
+    return {
+        "rows": n,
+        "mae": round(abs_err / n, 4),
+        "rmse": round(float(np.sqrt(sq_err / n)), 4),
+        "r2": round(1.0 - sq_err / total, 4) if total else None,
+    }
+
+
+def train_streaming(paths, method="normal", chunk_size=DEFAULT_CHUNK_SIZE, raw=False,
+                    holdout=DEFAULT_HOLDOUT, epochs=DEFAULT_EPOCHS, feature_names=None,
+                    dtype=np.float32, seed=0, sparse=False):
+    """Fit on the non-holdout rows of `paths` in bounded memory.
+
+    Returns (model, scaler, feature_names, report). Without `feature_names` the
+    vocabulary is scanned from the data, seeded with the current feature_names.pkl.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}' (expected one of {METHODS}).")
+    started = time.perf_counter()
+    if feature_names is None:
+        seed_names = []
+        if os.path.exists(FEATURES_PATH):
+            import joblib
+            seed_names = joblib.load(FEATURES_PATH)
+        feature_names = scan_vocabulary(paths, chunk_size, raw, seed_names)
+    feature_names = list(feature_names)
+
+    chunks = lambda: encoded_chunks(paths, feature_names, chunk_size, raw, holdout, dtype, sparse)
+    if method == "normal":
+        model, scaler, train_rows = fit_normal_equations(chunks, feature_names)
+    else:
+        model, scaler, train_rows = fit_sgd(chunks, feature_names, epochs, seed, sparse)
+
+    report = {
+        "method": method,
+        "inputs": [os.path.abspath(p) for p in paths],
+        "features": len(feature_names),
+        "chunk_size": chunk_size,
+        "dtype": np.dtype(dtype).name,
+        "layout": "csr" if sparse else "dense",
+        "train_rows": train_rows,
+        "holdout_fraction": holdout,
+        "holdout": evaluate_holdout(chunks, model),
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+    if method == "sgd":
+        report["epochs"] = epochs
+    return model, scaler, feature_names, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Out-of-core training on chunked CSVs")
+    parser.add_argument("inputs", nargs="*", default=[PROCESSED_CSV],
+                        help="laptops_clean.csv-style CSVs (or raw feeds with --raw)")
+    parser.add_argument("--raw", action="store_true", help="inputs are raw laptop_price.csv feeds")
+    parser.add_argument("--method", choices=METHODS, default="normal")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--holdout", type=float, default=DEFAULT_HOLDOUT, help="fraction of rows held out")
+    parser.add_argument("--epochs", type=int, default=DEFAULT_EPOCHS, help="SGD passes over the data")
+    parser.add_argument("--dtype", choices=("float32", "float64"), default="float32", help="chunk encoding")
+    parser.add_argument("--sparse", action="store_true", help="encode chunks as scipy CSR matrices")
+    parser.add_argument("--vocab", help="fixed feature list (a feature_names.pkl) instead of scanning")
+    parser.add_argument("--out", default=CANDIDATE_DIR,
+                        help="artifact directory (default models/stream; --out models deploys the fit)")
+    parser.add_argument("--no-export", action="store_true", help="only report holdout metrics")
+    parser.add_argument("--report", help="also write the report JSON here")
+    args = parser.parse_args(argv)
+
+    feature_names = None
+    if args.vocab:
+        import joblib
+        feature_names = joblib.load(args.vocab)
+
+    try:
+        model, scaler, feature_names, report = train_streaming(
+            args.inputs, args.method, args.chunk_size, args.raw, args.holdout, args.epochs,
+            feature_names, np.dtype(args.dtype), sparse=args.sparse)
+    except (ValueError, FileNotFoundError) as e:
+        print(f"⚠️ {e}")
+        sys.exit(1)
+
+    if not args.no_export:
+        paths = write_artifacts(model, scaler, feature_names, args.out)
+        print(f"Wrote {', '.join(paths.values())}")
+        if os.path.abspath(args.out) == os.path.abspath(MODELS_DIR):
+            print(f"Rebuilt {', '.join(refresh_derived_artifacts())}")
+    if args.report:
+        os.makedirs(os.path.dirname(os.path.abspath(args.report)), exist_ok=True)
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+# train.py
+# Incremental retraining from sufficient statistics, without notebook refits.
+#
+# 03_model_training.ipynb refits LinearRegression on the whole CSV every time. Here
+# we keep, per feature layout,
+#
+#   n, x_mean, y_mean        row count and running means
+#   xx, xy, yy               X^T X, X^T y and y^T y in centered form (co-moments),
+#                            merged chunk by chunk with Chan's parallel update
+#
+# which is all ordinary least squares needs: new CSV chunks are folded in without
+# revisiting old rows, and the coefficients are re-solved from the p x p matrix.
+# The StandardScaler's running mean/var are the numeric entries of x_mean and
+# diag(xx) / n. New category values grow the vocabulary: their columns are
+# appended and were implicitly 0 for every earlier row.
+#
+# The solve reproduces sklearn's LinearRegression: minimum-norm least squares on
+# centered data, so collinear one-hot groups get the same coefficients. Exported
+# artifacts are drop-in replacements for models/best_model.pkl, scaler.pkl and
+# feature_names.pkl; when they are written to models/ the price table and runtime
+# artifact compiled from them are rebuilt too.
+#
+#   python -m src.train update new_listings.csv                   # fold in a CSV, write artifacts
+#   python -m src.train update new_feed.csv --raw                  # raw laptop_price.csv layout
+#   python -m src.train export | info
+
+import os
+import sys
+import json
+import argparse
+
+import numpy as np
+import pandas as pd
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from src.encoder import CATEGORICAL_FIELDS, get_encoder
+from src.registry import MODELS_DIR, MODEL_PATH, FEATURES_PATH, SCALER_PATH, file_digest
+
+TARGET = "Price_euros"
+STATE_PATH = os.path.join(MODELS_DIR, "train_state.npz")
+DEFAULT_CHUNK_SIZE = 50000
+
+# Eigenvalues of the feature correlation matrix below this are treated as exact
+# collinearity (one-hot groups, constant columns), like sklearn's lstsq cutoff.
+NULL_SPACE_TOL = 1e-9
+
+
+def frame_vocabulary(frame):
+    """Feature names a (laptops_clean.csv-style) frame needs: numeric columns, then dummies."""
+    names = []
+    for col in frame.columns:
+        if col == TARGET:
+            continue
+        if col in CATEGORICAL_FIELDS:
+            values = sorted(str(v) for v in frame[col].dropna().unique())
+            names += [f"{col}_{v}" for v in values]
+        elif pd.api.types.is_numeric_dtype(frame[col]) or pd.api.types.is_bool_dtype(frame[col]):
+            names.append(col)
+        else:
+            raise ValueError(f"Column '{col}' is neither numeric nor one of {CATEGORICAL_FIELDS}.")
+    return names
+
+
+class TrainingState:
+    """Sufficient statistics for OLS with an intercept, updatable chunk by chunk."""
+
+    def __init__(self, feature_names=()):
+        self.feature_names = []
+        self.n = 0
+        self.x_mean = np.zeros(0)
+        self.y_mean = 0.0
+        self.xx = np.zeros((0, 0))
+        self.xy = np.zeros(0)
+        self.yy = 0.0
+        self.sources = []
+        self.extend(feature_names)
+
+    # ---------- Vocabulary ----------
+
+    def extend(self, names):
+        """Append new feature columns (zero for every row seen so far)."""
+        known = set(self.feature_names)
+        new = [name for name in names if name not in known]
+        if not new:
+            return []
+        p, k = len(self.feature_names), len(new)
+        self.feature_names += new
+        self.x_mean = np.concatenate([self.x_mean, np.zeros(k)])
+        self.xy = np.concatenate([self.xy, np.zeros(k)])
+        xx = np.zeros((p + k, p + k))
+        xx[:p, :p] = self.xx
+        self.xx = xx
+        return new
+
+    # ---------- Updates ----------
+
+    def update(self, frame):
+        """Fold a cleaned chunk (with Price_euros) into the statistics; returns rows used."""
+        frame = frame.dropna()
+        if frame.empty:
+            return 0
+        self.extend(frame_vocabulary(frame))
+        X = get_encoder(self.feature_names).encode_batch(frame.drop(columns=[TARGET]))
+        self.update_arrays(X, frame[TARGET].to_numpy(dtype=np.float64))
+        return len(frame)
+
+    def update_arrays(self, X, y):
+        """Chan et al. merge of a chunk's mean / co-moments into the running ones.
+
+        X may be a dense array or a scipy sparse matrix; a sparse chunk's co-moments
+        come from X^T X - n mean mean^T, so it is never densified.
+        """
+        n_b = len(y)
+        if n_b == 0:
+            return
+        y_mean_b = float(y.mean())
+        yc = y - y_mean_b
+        if hasattr(X, "tocsr"):
+            X = X.tocsr().astype(np.float64, copy=False)
+            x_mean_b = np.asarray(X.mean(axis=0), dtype=np.float64).ravel()
+            xx_b = np.asarray((X.T @ X).todense(), dtype=np.float64) - n_b * np.outer(x_mean_b, x_mean_b)
+            xy_b = np.asarray(X.T @ yc, dtype=np.float64).ravel()
+        else:
+            x_mean_b = X.mean(axis=0, dtype=np.float64)
+            Xc = X - x_mean_b
+            xx_b = Xc.T @ Xc
+            xy_b = Xc.T @ yc
+
+        n_a, n = self.n, self.n + n_b
+        dx = x_mean_b - self.x_mean
+        dy = y_mean_b - self.y_mean
+        w = n_a * n_b / n
+
+        self.xx += xx_b + w * np.outer(dx, dx)
+        self.xy += xy_b + w * dx * dy
+        self.yy += float(yc @ yc) + w * dy * dy
+        self.x_mean += dx * (n_b / n)
+        self.y_mean += dy * (n_b / n)
+        self.n = n
+
+    # ---------- Solve / export ----------
+
+    def solve(self):
+        """(coef, intercept, rank, singular) of the minimum-norm least-squares fit."""
+        if self.n == 0:
+            raise ValueError("No training rows yet.")
+        p = len(self.feature_names)
+        diag = np.diag(self.xx).copy()
+        d = np.where(diag > 0, 1.0 / np.sqrt(np.where(diag > 0, diag, 1.0)), 1.0)
+
+        # Work on the correlation matrix (well scaled) to find the exact null space,
+        # then take the solution orthogonal to it in the original coordinates.
+        corr = self.xx * np.outer(d, d)
+        eigvals, eigvecs = np.linalg.eigh(corr)
+        keep = eigvals > NULL_SPACE_TOL * max(eigvals.max(), 1.0)
+        rank = int(keep.sum())
+
+        inv = (eigvecs[:, keep] / eigvals[keep]) @ eigvecs[:, keep].T
+        coef = d * (inv @ (d * self.xy))
+        if rank < p:
+            null, _ = np.linalg.qr(d[:, None] * eigvecs[:, ~keep])
+            coef -= null @ (null.T @ coef)
+
+        intercept = self.y_mean - float(self.x_mean @ coef)
+        singular = np.sqrt(np.clip(np.linalg.eigvalsh(self.xx)[::-1], 0.0, None))
+        return coef, intercept, rank, singular
+
+    def to_model(self):
+        """A fitted sklearn LinearRegression equivalent to fitting on every row seen."""
+        coef, intercept, rank, singular = self.solve()
+        return make_linear_model(coef, intercept, self.feature_names, rank, singular)
+
+    def to_scaler(self):
+        """The notebook's StandardScaler over the numeric columns, from the running stats."""
+        if self.n == 0:
+            raise ValueError("No training rows yet.")
+        return make_scaler(self.feature_names, self.x_mean, np.diag(self.xx) / self.n, self.n)
+
+    def summary(self):
+        coef, intercept, rank, _ = self.solve()
+        residual = self.yy - float(self.xy @ coef)
+        return {
+            "rows": self.n,
+            "features": len(self.feature_names),
+            "rank": rank,
+            "train_rmse": round(float(np.sqrt(max(residual, 0.0) / self.n)), 4),
+            "train_r2": round(1.0 - residual / self.yy, 4) if self.yy else None,
+            "sources": len(self.sources),
+        }
+
+    # ---------- Persistence ----------
+
+    def save(self, path=STATE_PATH):
+        tmp = path + ".tmp.npz"
+        np.savez(
+            tmp, feature_names=np.asarray(self.feature_names, dtype=str), n=self.n,
+            x_mean=self.x_mean, y_mean=self.y_mean, xx=self.xx, xy=self.xy, yy=self.yy,
+            sources=json.dumps(self.sources),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=STATE_PATH):
+        with np.load(path, allow_pickle=False) as data:
+            state = cls(data["feature_names"].tolist())
+            state.n = int(data["n"])
+            state.x_mean = data["x_mean"].copy()
+            state.y_mean = float(data["y_mean"])
+            state.xx = data["xx"].copy()
+            state.xy = data["xy"].copy()
+            state.yy = float(data["yy"])
+            state.sources = json.loads(str(data["sources"]))
+        return state
+
+
+def make_linear_model(coef, intercept, feature_names, rank=None, singular=None):
+    """A LinearRegression carrying the given fit, as if .fit() had produced it."""
+    from sklearn.linear_model import LinearRegression
+
+    model = LinearRegression()
+    model.coef_ = np.asarray(coef, dtype=np.float64)
+    model.intercept_ = np.float64(intercept)
+    model.rank_ = len(feature_names) if rank is None else rank
+    if singular is not None:
+        model.singular_ = singular
+    model.n_features_in_ = len(feature_names)
+    model.feature_names_in_ = np.asarray(feature_names, dtype=object)
+    return model
+
+
+def numeric_columns(feature_names):
+    """The non-dummy columns of a feature layout, in layout order (what scaler.pkl covers)."""
+    index = get_encoder(feature_names).numeric_index
+    return sorted(index, key=index.get)
+
+
+def make_scaler(feature_names, mean, var, n_samples):
+    """A fitted StandardScaler over the numeric columns, from per-feature mean / var."""
+    from sklearn.preprocessing import StandardScaler
+
+    index = get_encoder(feature_names).numeric_index
+    columns = numeric_columns(feature_names)
+    idx = [index[c] for c in columns]
+    var = np.asarray(var, dtype=np.float64)[idx]
+
+    scaler = StandardScaler()
+    scaler.mean_ = np.asarray(mean, dtype=np.float64)[idx]
+    scaler.var_ = var
+    scaler.scale_ = np.where(var > 10 * np.finfo(np.float64).eps, np.sqrt(var), 1.0)
+    scaler.n_samples_seen_ = np.int64(n_samples)
+    scaler.n_features_in_ = len(columns)
+    scaler.feature_names_in_ = np.asarray(columns, dtype=object)
+    return scaler
+
+
+def update_from_csv(state, path, chunk_size=DEFAULT_CHUNK_SIZE, raw=False, allow_duplicate=False):
+    """Stream a CSV into `state` chunk by chunk; returns the number of rows used.
+
+    Files are recorded by content hash, so feeding the same file twice is refused
+    (it would double-count its rows) unless allow_duplicate=True.
+    """
+    digest = file_digest(path)
+    if not allow_duplicate and any(src["sha256"] == digest for src in state.sources):
+        raise ValueError(f"{path} was already folded into this training state.")
+
+    if raw:
+        from src.cleaning import RAW_ENCODING, clean_raw
+        reader = pd.read_csv(path, encoding=RAW_ENCODING, chunksize=chunk_size)
+        chunks = (clean_raw(chunk) for chunk in reader)
+    else:
+        chunks = pd.read_csv(path, chunksize=chunk_size)
+
+    rows = sum(state.update(chunk) for chunk in chunks)
+    state.sources.append({"path": os.path.abspath(path), "sha256": digest, "rows": rows})
+    return rows
+
+
+def _dump_atomic(obj, path):
+    import joblib
+
+    tmp = path + ".tmp"
+    joblib.dump(obj, tmp)
+    os.replace(tmp, path)
+
+
+def write_artifacts(model, scaler, feature_names, out_dir=MODELS_DIR):
+    """Write best_model.pkl, scaler.pkl and feature_names.pkl (each replaced atomically).
+
+    The model goes first and the feature list last: the vocabulary only grows, so a
+    hot-reloading reader caught between the two sees a coefficient count that does
+    not match the feature list (and is rejected) rather than new column names
+    paired with the old coefficients.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {
+        "model": os.path.join(out_dir, os.path.basename(MODEL_PATH)),
+        "scaler": os.path.join(out_dir, os.path.basename(SCALER_PATH)),
+        "features": os.path.join(out_dir, os.path.basename(FEATURES_PATH)),
+    }
+    _dump_atomic(model, paths["model"])
+    _dump_atomic(scaler, paths["scaler"])
+    _dump_atomic(list(feature_names), paths["features"])
+    return paths
+
+
+def refresh_derived_artifacts():
+    """Recompile what the app builds from the deployed pickles: the price table and the
+    NumPy runtime model. (The comparables index depends on the data only.)"""
+    import warnings
+    from src.price_table import PRICE_TABLE_PATH, build_price_table
+    from src.runtime import RUNTIME_PATH, export_runtime
+
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="Trying to unpickle estimator")
+        build_price_table(PRICE_TABLE_PATH)
+        export_runtime(RUNTIME_PATH)
+    return [PRICE_TABLE_PATH, RUNTIME_PATH]
+
+
+def export_artifacts(state, out_dir=MODELS_DIR):
+    """Artifacts for the fit on every row folded into `state`."""
+    return write_artifacts(state.to_model(), state.to_scaler(), state.feature_names, out_dir)
+
+
+def load_or_create_state(path=STATE_PATH, vocabulary_path=FEATURES_PATH):
+    """Existing state, or an empty one seeded with the current feature layout."""
+    if os.path.exists(path):
+        return TrainingState.load(path)
+    if vocabulary_path and os.path.exists(vocabulary_path):
+        import joblib
+        return TrainingState(joblib.load(vocabulary_path))
+    return TrainingState()
+
+
+def _export(state, out_dir):
+    paths = export_artifacts(state, out_dir)
+    print(f"Wrote {', '.join(paths.values())}")
+    if os.path.abspath(out_dir) == os.path.abspath(MODELS_DIR):
+        print(f"Rebuilt {', '.join(refresh_derived_artifacts())}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Incremental LinearRegression training")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    update = sub.add_parser("update", help="fold CSV files into the training state and export artifacts")
+    update.add_argument("inputs", nargs="+", help="laptops_clean.csv-style CSVs (or raw with --raw)")
+    update.add_argument("--raw", action="store_true", help="inputs are raw laptop_price.csv feeds")
+    update.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    update.add_argument("--reset", action="store_true", help="start from an empty state")
+    update.add_argument("--allow-duplicate", action="store_true", help="fold in a file seen before")
+    update.add_argument("--no-export", action="store_true", help="only update the state")
+    for p in (update, sub.add_parser("export", help="write artifacts from the saved state"),
+              sub.add_parser("info", help="print the state summary")):
+        p.add_argument("--state", default=STATE_PATH)
+        p.add_argument("--out", default=MODELS_DIR, help="artifact directory")
+    args = parser.parse_args(argv)
+
+    if args.command == "update":
+        state = load_or_create_state("" if args.reset else args.state)
+        for path in args.inputs:
+            try:
+                rows = update_from_csv(state, path, args.chunk_size, args.raw, args.allow_duplicate)
+            except ValueError as e:
+                print(f"⚠️ {e}")
+                sys.exit(1)
+            print(f"Folded {rows:,} rows from {path}")
+        state.save(args.state)
+        if not args.no_export:
+            _export(state, args.out)
+    else:
+        state = TrainingState.load(args.state)
+        if args.command == "export":
+            _export(state, args.out)
+    print(json.dumps(state.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
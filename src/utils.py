@@ -0,0 +1,398 @@
+# utils.py
+# Input parsing, validation and prediction helpers shared by the CLI (src/predict.py)
+# and the Streamlit app. Kept free of Streamlit so the CLI starts without it.
+
+import re
+import numpy as np
+import pandas as pd
+
+from src.encoder import get_encoder
+from src.inference import get_engine, predict_rows
+from src.logwriter import DEFAULT_LOG_FILE, get_log_writer
+from src.metrics import get_metrics
+from src.normalize import AliasIndex
+
+METRICS = get_metrics()
+
+# Paths
+LOG_FILE = DEFAULT_LOG_FILE
+
+# Canonical choices that match your training data casing
+VALID_COMPANIES = ["Dell", "Apple", "Hp", "Lenovo", "Acer", "Asus", "Msi"]
+VALID_TYPES     = ["Notebook", "Ultrabook", "Gaming", "2 In 1 Convertible", "Workstation"]
+VALID_OSS       = ["Windows 10", "Windows 7", "Macos", "Linux", "No Os"]
+
+# Aliases to improve UX (lowercase keys)
+OPSYS_ALIASES = {
+    "windows 10": ["10", "win10", "windows10", "windows 10", "windows 10 home", "windows 10 pro"],
+    "windows 7":  ["7", "win7", "windows7", "windows 7"],
+    "macos":      ["macos", "mac os", "osx", "os x", "mac os x"],
+    "linux":      ["linux", "ubuntu", "debian", "fedora", "mint"],
+    "no os":      ["no os", "none", "no operating system", "without os", "freedos", "dos"]
+}
+# Map canonical (lower) -> dataset casing
+OPSYS_CANON_TO_DATA = {
+    "windows 10": "Windows 10",
+    "windows 7":  "Windows 7",
+    "macos":      "Macos",
+    "linux":      "Linux",
+    "no os":      "No Os"
+}
+
+COMPANY_ALIASES = {
+    "hp": "Hp",
+    "hewlett packard": "Hp",
+    "HP": "Hp",
+    "msi": "Msi",
+    "micro star": "Msi",
+}
+
+TYPE_ALIASES = {
+    "2 in 1": "2 In 1 Convertible",
+    "2-in-1": "2 In 1 Convertible",
+    "convertible": "2 In 1 Convertible",
+    "gaming laptop": "Gaming",
+    "ultrabook laptop": "Ultrabook",
+    "work station": "Workstation",
+}
+
+# Compiled once: exact lookups for canonical names, one containment regex per table
+_COMPANY_CANON = {c.lower(): c for c in VALID_COMPANIES}
+_TYPE_CANON = {t.lower(): t for t in VALID_TYPES}
+_TYPE_INDEX = AliasIndex(TYPE_ALIASES.items())
+_OPSYS_INDEX = AliasIndex(
+    (alias, canonical)
+    for canonical, aliases in OPSYS_ALIASES.items()
+    for alias in [canonical] + aliases
+)
+
+_WS_RE = re.compile(r"\s+")
+_NUMBER_RE = re.compile(r"\d+(\.\d+)?")
+
+def log_event(kind, field, value, message):
+    """Log invalid input or auto-corrections to LOG_FILE (queued; written in the background)."""
+    get_log_writer().write(kind, field, value, message)
+
+# ---------- Smart parsing helpers ----------
+
+NUM_WORDS = {
+    "zero": 0, "none": 0, "nil": 0, "no": 0,
+    "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9, "ten": 10,
+    "twelve": 12, "sixteen": 16, "twenty": 20, "thirty two": 32, "thirty-two": 32,
+    "sixty four": 64, "sixty-four": 64, "one hundred": 100, "one hundred twenty eight": 128,
+}
+
+def _coerce_numeric_token(raw: str):
+    """Try hard to get a number out of a messy string (e.g., '512GB', '1,024', 'zero')."""
+    s = raw.strip().lower()
+    s = s.replace(",", " ")
+    s = s.replace("gb", " ").replace("g", " ").replace("kg", " ")
+    s = _WS_RE.sub(" ", s).strip()
+
+    # Exact word matches
+    if s in NUM_WORDS:
+        return NUM_WORDS[s]
+
+    # Extract first number (int or float)
+    m = _NUMBER_RE.search(s)
+    if m:
+        token = m.group(0)
+        # Return float if it had a decimal point, else int
+        return float(token) if "." in token else int(token)
+
+    return None
+
+def safe_numeric(prompt, cast_type=float, default=None, min_val=None, max_val=None, field=""):
+    """Numeric input with coercion, warnings, and bounds checking."""
+    while True:
+        raw = input(prompt).strip()
+        if raw == "" and default is not None:
+            return default
+
+        coerced = _coerce_numeric_token(raw)
+        if coerced is not None:
+            # Cast to desired type
+            try:
+                val = cast_type(coerced)
+            except Exception:
+                print(f"⚠️ Please enter a valid {cast_type.__name__}.")
+                log_event("error", field, raw, f"Cast to {cast_type.__name__} failed after coercion")
+                continue
+
+            # Bounds
+            if (min_val is not None and val < min_val) or (max_val is not None and val > max_val):
+                if min_val is not None and val < min_val:
+                    print(f"⚠️ Value too low. Minimum allowed is {min_val}. Try again.")
+                    log_event("error", field, raw, f"Below min ({min_val}) after coercion -> {val}")
+                else:
+                    print(f"⚠️ Value too high. Maximum allowed is {max_val}. Try again.")
+                    log_event("error", field, raw, f"Above max ({max_val}) after coercion -> {val}")
+                continue
+
+            # Warn if auto-coerced from a non-pure number
+            if str(raw).strip() != str(val):
+                print(f"⚠️ Interpreted '{raw}' as {val}.")
+                log_event("warn", field, raw, f"Auto-coerced to {val}")
+
+            return val
+
+        # Could not coerce anything numeric
+        print(f"⚠️ Please enter a valid {cast_type.__name__}.")
+        log_event("error", field, raw, "Unparseable numeric input")
+
+def normalize_opsys(raw: str):
+    s = raw.strip().lower().replace("-", " ").replace("_", " ")
+    s = _WS_RE.sub(" ", s)
+    canonical = _OPSYS_INDEX.search(s)
+    if canonical:
+        return OPSYS_CANON_TO_DATA[canonical]  # match dataset casing
+    return None
+
+def normalize_company(raw: str, quiet=False):
+    s = raw.strip().lower()
+    if s in _COMPANY_CANON:
+        return _COMPANY_CANON[s]  # dataset casing
+    if s in COMPANY_ALIASES:
+        fixed = COMPANY_ALIASES[s]
+        if not quiet:
+            print(f"⚠️ Interpreted '{raw}' as '{fixed}'.")
+            log_event("warn", "Company", raw, f"Auto-corrected to {fixed}")
+        return fixed
+    return None
+
+def normalize_type(raw: str, quiet=False):
+    s = raw.strip().lower()
+    if s in _TYPE_CANON:
+        return _TYPE_CANON[s]
+    v = _TYPE_INDEX.search(s)
+    if v is not None:
+        if not quiet:
+            print(f"⚠️ Interpreted '{raw}' as '{v}'.")
+            log_event("warn", "TypeName", raw, f"Auto-corrected to {v}")
+        return v
+    return None
+
+_SERIES_NORMALIZERS = {
+    "Company": lambda v: normalize_company(v, quiet=True),
+    "TypeName": lambda v: normalize_type(v, quiet=True),
+    "OpSys": normalize_opsys,
+}
+
+def normalize_series(series, field):
+    """Silent normalize_company / normalize_type / normalize_opsys over a whole Series.
+
+    Each distinct value is normalized once; unmatched and non-string entries become None.
+    """
+    normalizer = _SERIES_NORMALIZERS[field]
+    codes, uniques = pd.factorize(series)
+    mapped = np.array([normalizer(u) if isinstance(u, str) else None for u in uniques] + [None], dtype=object)
+    return pd.Series(mapped[codes], index=series.index, name=series.name, dtype=object)
+
+def safe_choice_normalized(prompt, field, normalizer, options_list, default=None):
+    """Choice input with normalization + warnings; never crashes."""
+    options_str = ", ".join(options_list)
+    while True:
+        raw = input(f"{prompt} ({options_str}): ").strip()
+        if raw == "" and default is not None:
+            return default
+        fixed = normalizer(raw)
+        if fixed and fixed in options_list:
+            # Warn if normalization changed the value
+            if fixed.lower() != raw.strip().lower():
+                print(f"⚠️ Interpreting '{raw}' as '{fixed}'.")
+                log_event("warn", field, raw, f"Normalized to {fixed}")
+            return fixed
+        print("⚠️ Invalid choice. Please pick from the list (type the full name).")
+        log_event("error", field, raw, "Invalid choice")
+
+# ---------- Public API used by predict.py ----------
+
+def get_user_inputs():
+    """Collect laptop specifications safely with validations."""
+    print("Laptop Price Prediction Demo")
+    print("Please enter your laptop specifications.\n")
+
+    company = safe_choice_normalized("Company", "Company", normalize_company, VALID_COMPANIES, default="Dell")
+    typename = safe_choice_normalized("Type", "TypeName", normalize_type, VALID_TYPES, default="Notebook")
+    inches = safe_numeric("Screen Size (inches): ", float, default=15.6, min_val=10, max_val=20, field="Inches")
+    ram = safe_numeric("RAM (GB): ", int, default=8, min_val=2, max_val=128, field="Ram")
+    weight = safe_numeric("Weight (kg): ", float, default=2.0, min_val=0.5, max_val=5.0, field="Weight")
+    opsys = None
+    while opsys is None:
+        raw_os = input(f"Operating System (e.g., Windows 10, MacOS, Linux) ({', '.join(VALID_OSS)}): ").strip()
+        if raw_os == "":
+            opsys = "Windows 10"
+            break
+        fixed = normalize_opsys(raw_os)
+        if fixed:
+            if fixed.lower() != raw_os.strip().lower():
+                print(f"⚠️ Interpreting '{raw_os}' as '{fixed}'.")
+                log_event("warn", "OpSys", raw_os, f"Normalized to {fixed}")
+            opsys = fixed
+        else:
+            print("⚠️ Invalid OS. Please type a full name like 'Windows 10', 'MacOS', 'Linux', or 'No OS'.")
+            log_event("error", "OpSys", raw_os, "Invalid OS")
+
+    ssd = safe_numeric("SSD size (GB, 0 if none): ", int, default=0, min_val=0, field="SSD")
+    hdd = safe_numeric("HDD size (GB, 0 if none): ", int, default=0, min_val=0, field="HDD")
+    hybrid = safe_numeric("Hybrid storage (GB, 0 if none): ", int, default=0, min_val=0, field="Hybrid")
+    flash = safe_numeric("Flash storage (GB, 0 if none): ", int, default=0, min_val=0, field="Flash_Storage")
+
+    cpu = input("CPU (e.g., Intel Core i5, AMD Ryzen 7): ").strip()
+    gpu = input("GPU (e.g., Nvidia GeForce GTX 1050, Intel HD Graphics): ").strip()
+
+    return {
+        "Company": company,
+        "TypeName": typename,
+        "Inches": inches,
+        "Ram": ram,
+        "Weight": weight,
+        "OpSys": opsys,
+        "SSD": ssd,
+        "HDD": hdd,
+        "Hybrid": hybrid,
+        "Flash_Storage": flash,
+        "Cpu": cpu,
+        "Gpu": gpu
+    }
+ 
+def preprocess_input(sample_dict, feature_names):
+    """Convert user inputs into the same format as training data.
+
+    Returns a (1, n_features) float64 row laid out like feature_names. The row is a
+    reusable buffer owned by the encoder, so predict on it before encoding the next sample.
+    """
+    if feature_names is None:
+        print("⚠️ Feature files not found. Please run the training notebook to generate models first.")
+        return None
+
+    # One-hot encode & align (Cpu/Gpu are renamed to Cpu_brand/Gpu_brand by the encoder)
+    encoder = get_encoder(feature_names)
+    if METRICS.enabled:
+        encoder.record_categories(sample_dict)
+        return METRICS.timed("encode", encoder.encode, sample_dict)
+    return encoder.encode(sample_dict)
+
+def _postprocess(pred):
+    """Round a raw prediction and log it if it's outside the dataset's price range."""
+    pred = round(float(pred), 4)
+
+    # Log outliers (dataset: ~€100–€6990)
+    if pred < 100 or pred > 6990:
+        METRICS.inc("outliers_total")
+        log_event("warn", "PREDICT", str(pred), f"Unrealistic prediction generated: €{pred}.")
+
+    return pred
+
+def _predict_row(model, sample_encoded):
+    return predict_rows(model, sample_encoded)[0]
+
+def _predict_instrumented(predict, *args):
+    """predict(*args) + _postprocess as one metrics request with per-stage timings."""
+    with METRICS.request():
+        pred = METRICS.timed("predict", predict, *args)
+        return METRICS.timed("postprocess", _postprocess, pred)
+
+def predict_price(model, sample_encoded):
+    """Predict laptop price given specs; logs issues if any."""
+    # Safety Checks
+    if model is None:
+        print("⚠️ Model not loaded. Please train first.")
+        return None
+    
+    try:
+        if METRICS.active:
+            return _predict_instrumented(_predict_row, model, sample_encoded)
+        return _postprocess(_predict_row(model, sample_encoded))
+    
+    except Exception as e:
+        print("⚠️ Prediction failed. Please check preprocessing.")
+        log_event("error", "PREDICT", str(sample_encoded), f"Prediction failure: {e}")
+        return None
+
+def predict_specs(model, sample_dict, feature_names):
+    """Predict straight from a spec dict; linear models skip encoding and sklearn entirely."""
+    if model is None:
+        print("⚠️ Model not loaded. Please train first.")
+        return None
+    if feature_names is None:
+        print("⚠️ Feature files not found. Please run the training notebook to generate models first.")
+        return None
+
+    try:
+        engine = get_engine(model, feature_names)
+        if METRICS.active:
+            # Linear models price the spec in one pass, so encoding is timed as part of "predict"
+            if METRICS.enabled:
+                engine.encoder.record_categories(sample_dict)
+            return _predict_instrumented(engine.predict_one, sample_dict)
+        return _postprocess(engine.predict_one(sample_dict))
+
+    except Exception as e:
+        print("⚠️ Prediction failed. Please check preprocessing.")
+        log_event("error", "PREDICT", str(sample_dict), f"Prediction failure: {e}")
+        return None
+
+def predict_table(table, sample_dict):
+    """predict_specs via a precomputed PriceTable (src.price_table): lookups and adds only."""
+    try:
+        if METRICS.active:
+            return _predict_instrumented(table.price, sample_dict)
+        return _postprocess(table.price(sample_dict))
+    except Exception as e:
+        print("⚠️ Prediction failed. Please check preprocessing.")
+        log_event("error", "PREDICT", str(sample_dict), f"Prediction failure: {e}")
+        return None
+
+# ---------- Batch prediction ----------
+
+BATCH_CHUNK_SIZE = 10000
+
+def predict_batch(model, records, feature_names, chunk_size=BATCH_CHUNK_SIZE, sparse=False):
+    """Predict prices for many laptops at once; same outlier logging as predict_price.
+
+    `records` is a list of spec dicts (as returned by get_user_inputs) or a DataFrame.
+    With sparse=True chunks are encoded as scipy CSR matrices instead of dense rows.
+    Returns a NumPy array of prices rounded to 4 decimals, in input order.
+    """
+    if model is None:
+        print("⚠️ Model not loaded. Please train first.")
+        return None
+    if feature_names is None:
+        print("⚠️ Feature files not found. Please run the training notebook to generate models first.")
+        return None
+
+    encoder = get_encoder(feature_names)
+    if not isinstance(records, pd.DataFrame):
+        records = pd.DataFrame.from_records(list(records))
+    n_rows = len(records)
+    preds = np.empty(n_rows, dtype=np.float64)
+    buffer = None if sparse else np.zeros((min(chunk_size, n_rows), encoder.n_features), dtype=np.float64)
+
+    with METRICS.request():
+        try:
+            for start in range(0, n_rows, chunk_size):
+                chunk = records.iloc[start:start + chunk_size]
+                with METRICS.timer("encode"):
+                    if sparse:
+                        encoded = encoder.encode_batch_sparse(chunk)
+                    else:
+                        encoded = encoder.encode_batch(chunk, out=buffer)
+                with METRICS.timer("predict"):
+                    preds[start:start + len(chunk)] = predict_rows(model, encoded)
+        except Exception as e:
+            print("⚠️ Batch prediction failed. Please check preprocessing.")
+            log_event("error", "PREDICT_BATCH", f"{n_rows} rows", f"Prediction failure: {e}")
+            return None
+
+        with METRICS.timer("postprocess"):
+            preds = np.round(preds, 4)
+
+            # Log outliers (dataset: ~€100–€6990), one entry per row like predict_price
+            outliers = preds[(preds < 100) | (preds > 6990)]
+            METRICS.inc("outliers_total", len(outliers))
+            for pred in outliers:
+                pred = float(pred)
+                log_event("warn", "PREDICT", str(pred), f"Unrealistic prediction generated: €{pred}.")
+
+    return preds
@@ -0,0 +1,74 @@
+# vocabulary.py
+# The feature layout (models/feature_names.pkl) as an object with O(1) lookups.
+#
+# feature_names.pkl is a plain list, so `names.index("Ram")` is a linear scan and
+# nothing stops two copies of the layout from drifting apart. A Vocabulary is an
+# immutable, ordered view of the same names with a name -> column dict. It iterates,
+# indexes and compares like the list it wraps (Vocabulary(names) == names), so it
+# can be passed anywhere a feature list is expected.
+
+import numpy as np
+
+
+class Vocabulary:
+    """Ordered, immutable feature names with O(1) name -> column index lookup."""
+
+    __slots__ = ("names", "index")
+
+    def __init__(self, names):
+        if isinstance(names, Vocabulary):
+            names = names.names
+        self.names = tuple(names)
+        self.index = {name: i for i, name in enumerate(self.names)}
+        if len(self.index) != len(self.names):
+            dupes = sorted({n for n in self.names if self.names.count(n) > 1})
+            raise ValueError(f"Duplicate feature names: {dupes}")
+
+    @classmethod
+    def load(cls, path):
+        """Vocabulary from a feature_names.pkl-style pickled list."""
+        import joblib
+        return cls(joblib.load(path))
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __getitem__(self, i):
+        return self.names[i]
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def __eq__(self, other):
+        if isinstance(other, Vocabulary):
+            return self.names == other.names
+        if isinstance(other, (list, tuple)):
+            return self.names == tuple(other)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.names)
+
+    def __repr__(self):
+        return f"Vocabulary({len(self.names)} features)"
+
+    def get(self, name, default=None):
+        """Column index of `name`, or `default` if it is not in the layout."""
+        return self.index.get(name, default)
+
+    def index_of(self, name):
+        try:
+            return self.index[name]
+        except KeyError:
+            raise KeyError(f"'{name}' is not in the feature vocabulary") from None
+
+    def indices(self, names):
+        """Column indices of several names, as an intp array."""
+        return np.fromiter((self.index_of(n) for n in names), dtype=np.intp)
+
+    def to_list(self):
+        """Plain list, the format feature_names.pkl is saved in."""
+        return list(self.names)
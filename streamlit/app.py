@@ -1,12 +1,11 @@
-from time import sleep
 import streamlit as st
-import pandas as pd
-import joblib
-from utils import feature_names, preprocess_input, predict_price, log_event, final_price
+from utils import (
+    load_artifacts, predict_specs, predict_table, log_event, final_price, get_budget, get_cache, spec_key,
+    get_price_table, show_sensitivity, show_diagnostics, get_comparables, show_comparables,
+)
 
-# Load the trained model
-model = joblib.load("models/best_model.pkl")
-# scaler = joblib.load("models/scaler.pkl")
+# Load the trained model (cached per process; only reloaded when the files change)
+model, feature_names = load_artifacts()
 
 # Streamlit UI
 st.title("Laptop Price Prediction App")
@@ -109,7 +108,12 @@ if company == "MSI": company = "Msi"
 if opsys == "Windows 11": opsys = "Windows 10"
 
 # Predict Button
+budget = get_budget()
+cache = get_cache()
+price_table = get_price_table()  # None until `python -m src.price_table build` is run for this model
+comparables = get_comparables()  # None until `python -m src.comparables build` is run
 if st.button("Predict Price"):
+    timer = budget.start()
     try:
         # Build input DataFrame
         received_data = {
@@ -127,36 +131,42 @@ if st.button("Predict Price"):
             "Gpu_brand": gpu
         }
 
-        # NOTE: Applying the same preprocessing (target encoding + scaling) here.
-        input_data = preprocess_input(received_data, feature_names)
-
-        # st.write("Encoded sample shape:", input_data.shape)
-        # st.write("Model expects:", len(feature_names), "features")
-        # missing = set(feature_names) - set(input_data.columns)
-        # extra = set(input_data.columns) - set(feature_names)
-        # st.write("Missing features:", missing)
-        # st.write("Unexpected extra features:", extra)
-
-        # Prediction
-        with st.spinner("Calculating..."):
-            sleep(1.0)
-            prediction = predict_price(model, input_data)
-            # prediction = model.predict(input_data)[0]
-        
+        # Normalize the spec; the normalized tuple is also the prediction cache key.
+        with timer.stage("encode"):
+            spec, cache_key = spec_key(received_data, feature_names)
+
+        # Prediction (repeat configurations are served from the cache)
+        with timer.stage("predict"), st.spinner("Calculating..."):
+            prediction = cache.get(cache_key)
+            if prediction is None:
+                if price_table is not None:
+                    prediction = predict_table(price_table, spec)
+                else:
+                    prediction = predict_specs(model, spec, feature_names)
+                cache.put(cache_key, prediction)
+
         # Sanity bounds (based on your dataset: €100 - €6999)
-        if prediction is not None:
-            if prediction < 100 or prediction > 6999:  # Bounds based on dataset and logic.
-                log_event("warn", "Prediction", str(received_data), f"Unrealistic prediction: {prediction:.2f}")
-                st.warning(f"Prediction seems unrealistic (€{prediction:.2f}). Please re-check your inputs.")
+        with timer.stage("render"):
+            if prediction is not None:
+                if prediction < 100 or prediction > 6999:  # Bounds based on dataset and logic.
+                    log_event("warn", "Prediction", str(received_data), f"Unrealistic prediction: {prediction:.2f}")
+                    st.warning(f"Prediction seems unrealistic (€{prediction:.2f}). Please re-check your inputs.")
+                else:
+                    st.toast("Prediction ready!")
+                    final_price(prediction, company, typename)
+                    if price_table is not None:
+                        show_sensitivity(price_table, spec)
+                    if comparables is not None:
+                        show_comparables(comparables, spec)
+
             else:
-                st.toast("Prediction ready!")
-                sleep(1.0)
-                final_price(prediction, company, typename)
-                
-        else:
-            st.error(f"Prediction failed. Please try again.")
+                st.error(f"Prediction failed. Please try again.")
 
     except Exception as e:
         log_event("error", "StreamlitApp", str(received_data), f"Prediction failed: {e}")
         st.error(f"Something went wrong while generating the prediction. Please check your inputs and try again.")
 
+    budget.record(timer)
+
+# Latency diagnostics (sidebar)
+show_diagnostics(budget, cache)
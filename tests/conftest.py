@@ -0,0 +1,11 @@
+import os
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+
+def pytest_configure(config):
+    # models/*.pkl were pickled with another scikit-learn release
+    config.addinivalue_line("filterwarnings", "ignore:Trying to unpickle estimator")
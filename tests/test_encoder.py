@@ -0,0 +1,91 @@
+# Parity of the compiled FeatureEncoder with the get_dummies + reindex it replaced.
+
+import os
+from itertools import product
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.encoder import CATEGORICAL_FIELDS, FeatureEncoder
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FEATURES_PATH = os.path.join(ROOT_DIR, "models", "feature_names.pkl")
+DATA_PATH = os.path.join(ROOT_DIR, "data", "processed", "laptops_clean.csv")
+
+
+def reference_encode(frame, feature_names):
+    """The original preprocess_input: rename Cpu/Gpu, one-hot, align to the training columns."""
+    frame = frame.rename(columns={"Cpu": "Cpu_brand", "Gpu": "Gpu_brand"})
+    encoded = pd.get_dummies(frame).reindex(columns=feature_names, fill_value=0)
+    return encoded.to_numpy(dtype=np.float64)
+
+
+@pytest.fixture(scope="module")
+def feature_names():
+    return list(joblib.load(FEATURES_PATH))
+
+
+@pytest.fixture(scope="module")
+def encoder(feature_names):
+    return FeatureEncoder(feature_names)
+
+
+@pytest.fixture(scope="module")
+def processed():
+    return pd.read_csv(DATA_PATH).drop(columns=["Price_euros"])
+
+
+def test_processed_csv_batch(encoder, feature_names, processed):
+    expected = reference_encode(processed, feature_names)
+    np.testing.assert_array_equal(encoder.encode_batch(processed), expected)
+
+
+def test_processed_csv_rows(encoder, feature_names, processed):
+    sample = processed.sample(200, random_state=0)
+    expected = reference_encode(sample, feature_names)
+    for row, spec in zip(expected, sample.to_dict("records")):
+        np.testing.assert_array_equal(encoder.encode(spec)[0], row)
+
+
+def test_category_combinations(encoder, feature_names):
+    # Every known value of each field plus one the model has never seen
+    values = [list(encoder.category_index[field]) + ["Unknown"] for field in CATEGORICAL_FIELDS]
+    specs = [dict(zip(CATEGORICAL_FIELDS, combo), Ram=8, Weight=1.5) for combo in product(*values)]
+    frame = pd.DataFrame(specs)
+    expected = reference_encode(frame, feature_names)
+    np.testing.assert_array_equal(encoder.encode_batch(frame), expected)
+    for i in range(0, len(specs), 97):
+        np.testing.assert_array_equal(encoder.encode(specs[i])[0], expected[i])
+
+
+@pytest.mark.parametrize("spec", [
+    {"Company": "Dell", "TypeName": "Notebook", "Cpu": "Intel", "Gpu": "Nvidia", "Ram": 16},
+    {"Company": "dell", "TypeName": "notebook", "OpSys": "no os", "Ram": 8},
+    {"Company": "Hewlett Packard", "Cpu_brand": "Samsung", "Gpu_brand": "ARM", "Weight": 2.2},
+    {"Company": "Apple", "OpSys": "macOS", "Unknown_field": "x", "Inches": 13.3},
+    {"Company": None, "TypeName": "Gaming", "Ram": 4},
+])
+def test_unknown_and_alias_categories(encoder, feature_names, spec):
+    expected = reference_encode(pd.DataFrame([spec]), feature_names)
+    np.testing.assert_array_equal(encoder.encode(spec), expected)
+    np.testing.assert_array_equal(encoder.encode_batch([spec]), expected)
+
+
+def test_encode_pairs_matches_dense(encoder, processed):
+    spec = processed.iloc[0].to_dict()
+    indices, values = encoder.encode_pairs(spec)
+    dense = np.zeros(encoder.n_features)
+    dense[indices] = values
+    np.testing.assert_array_equal(dense, encoder.encode(spec)[0])
+
+
+def test_missing_numeric_fields_encode_as_zero(encoder):
+    # from_records turns keys absent from some records into NaN; encode() skips them
+    specs = [{"Company": "Dell", "Ram": 8, "SSD": 256}, {"Company": "HP", "Ram": 16}, {"Weight": None}]
+    dense = encoder.encode_batch(specs)
+    assert not np.isnan(dense).any()
+    for row, spec in zip(dense, specs):
+        np.testing.assert_array_equal(row, encoder.encode(spec)[0])
+    np.testing.assert_array_equal(encoder.encode_batch_sparse(specs).toarray(), dense)
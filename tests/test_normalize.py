@@ -0,0 +1,171 @@
+# Pins the free-text normalizers to the behaviour they had before AliasIndex
+# replaced the linear `alias in s` scan, quirks included.
+
+import re
+from itertools import product
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.normalize import AliasIndex
+from src.utils import (
+    COMPANY_ALIASES, NUM_WORDS, OPSYS_ALIASES, OPSYS_CANON_TO_DATA, TYPE_ALIASES, VALID_COMPANIES, VALID_TYPES,
+    _coerce_numeric_token, normalize_company, normalize_opsys, normalize_series, normalize_type,
+)
+
+
+# ---------- The previous implementations, verbatim apart from logging ----------
+
+def old_opsys(raw):
+    s = raw.strip().lower().replace("-", " ").replace("_", " ")
+    s = re.sub(r"\s+", " ", s)
+    for canonical, aliases in OPSYS_ALIASES.items():
+        if s == canonical:
+            return OPSYS_CANON_TO_DATA[canonical]
+        for a in aliases:
+            if s == a or a in s:
+                return OPSYS_CANON_TO_DATA[canonical]
+    return None
+
+
+def old_company(raw):
+    s = raw.strip().lower()
+    if s in [c.lower() for c in VALID_COMPANIES]:
+        for c in VALID_COMPANIES:
+            if s == c.lower():
+                return c
+    if s in COMPANY_ALIASES:
+        return COMPANY_ALIASES[s]
+    return None
+
+
+def old_type(raw):
+    s = raw.strip().lower()
+    if s in [t.lower() for t in VALID_TYPES]:
+        for t in VALID_TYPES:
+            if s == t.lower():
+                return t
+    for k, v in TYPE_ALIASES.items():
+        if k in s:
+            return v
+    return None
+
+
+def old_coerce(raw):
+    s = raw.strip().lower()
+    s = s.replace(",", " ")
+    s = s.replace("gb", " ").replace("g", " ").replace("kg", " ")
+    s = re.sub(r"\s+", " ", s).strip()
+    if s in NUM_WORDS:
+        return NUM_WORDS[s]
+    m = re.search(r"\d+(\.\d+)?", s)
+    if m:
+        token = m.group(0)
+        return float(token) if "." in token else int(token)
+    return None
+
+
+# ---------- Pinned outputs ----------
+
+@pytest.mark.parametrize("raw, expected", [
+    ("Windows 10", "Windows 10"), ("  WIN10 ", "Windows 10"), ("windows-10 pro", "Windows 10"),
+    ("Windows_7", "Windows 7"), ("mac os x", "Macos"), ("MacOS", "Macos"), ("OS X", "Macos"),
+    ("ubuntu 20.04", "Linux"), ("Linux Mint", "Linux"), ("no-os", "No Os"), ("FreeDOS", "No Os"),
+    ("none", "No Os"), ("Chrome OS", None), ("", None),
+    # Table order beats position: "windows 10" aliases are checked first
+    ("win 7 or 10", "Windows 10"), ("dos 10", "Windows 10"),
+])
+def test_normalize_opsys(raw, expected):
+    assert normalize_opsys(raw) == expected
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("dell", "Dell"), (" Apple ", "Apple"), ("HP", "Hp"), ("hp", "Hp"), ("Hewlett Packard", "Hp"),
+    ("MSI", "Msi"), ("micro star", "Msi"), ("Samsung", None), ("", None),
+    # Exact lookups only; inner whitespace is not collapsed
+    ("hewlett  packard", None),
+])
+def test_normalize_company(raw, expected):
+    assert normalize_company(raw, quiet=True) == expected
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("notebook", "Notebook"), ("2 in 1 convertible", "2 In 1 Convertible"), ("2-in-1", "2 In 1 Convertible"),
+    ("Convertible laptop", "2 In 1 Convertible"), ("gaming laptop", "Gaming"), ("Gaming", "Gaming"),
+    ("ULTRABOOK LAPTOP", "Ultrabook"), ("work station", "Workstation"), ("netbook", None), ("", None),
+    ("2 in 1 gaming laptop", "2 In 1 Convertible"),
+])
+def test_normalize_type(raw, expected):
+    assert normalize_type(raw, quiet=True) == expected
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("8GB", 8), ("zero", 0), ("thirty-two", 32), (" 2.5 kg ", 2.5), ("16 g", 16),
+    ("one hundred", 100), ("abc", None),
+    ("1,024", 1),  # the comma becomes a space, so only the first group is read
+])
+def test_coerce_numeric_token(raw, expected):
+    assert _coerce_numeric_token(raw) == expected
+
+
+# ---------- Parity with the old linear scans ----------
+
+def _variants(words):
+    """Every alias with case / whitespace / separator changes, alone, wrapped and paired."""
+    pads = ["", " ", "  ", "\t"]
+    out = set()
+    for w in words:
+        for form in (w, w.upper(), w.title(), w.replace(" ", "-"), w.replace(" ", "_"), w.replace(" ", "  ")):
+            for left, right in product(pads, pads):
+                out.add(left + form + right)
+            out.update([f"my {form} laptop", f"{form}x", f"x{form}"])
+    for a, b in product(words, repeat=2):
+        out.update([f"{a} {b}", f"{a}/{b}"])
+    return sorted(out) + ["", " ", "unknown", "laptop", "123", "n/a"]
+
+
+OPSYS_WORDS = sorted({a for canonical, aliases in OPSYS_ALIASES.items() for a in [canonical, *aliases]})
+COMPANY_WORDS = sorted(set(COMPANY_ALIASES) | {c.lower() for c in VALID_COMPANIES})
+TYPE_WORDS = sorted(set(TYPE_ALIASES) | {t.lower() for t in VALID_TYPES})
+
+
+def test_opsys_parity():
+    for raw in _variants(OPSYS_WORDS):
+        assert normalize_opsys(raw) == old_opsys(raw), raw
+
+
+def test_company_parity():
+    for raw in _variants(COMPANY_WORDS):
+        assert normalize_company(raw, quiet=True) == old_company(raw), raw
+
+
+def test_type_parity():
+    for raw in _variants(TYPE_WORDS):
+        assert normalize_type(raw, quiet=True) == old_type(raw), raw
+
+
+def test_coerce_parity():
+    for raw in _variants(["8gb", "1,024", "2.5 kg", "sixty four", "one", "16g", "0.5"]):
+        assert _coerce_numeric_token(raw) == old_coerce(raw), raw
+
+
+@pytest.mark.parametrize("field, normalizer", [
+    ("Company", old_company), ("TypeName", old_type), ("OpSys", old_opsys),
+])
+def test_normalize_series(field, normalizer):
+    words = {"Company": COMPANY_WORDS, "TypeName": TYPE_WORDS, "OpSys": OPSYS_WORDS}[field]
+    values = _variants(words)[:300] + [None, np.nan, 8]
+    series = pd.Series(values * 2, index=range(100, 100 + 2 * len(values)), name=field)
+    result = normalize_series(series, field)
+    assert list(result.index) == list(series.index)
+    assert result.name == field
+    assert list(result) == [normalizer(v) if isinstance(v, str) else None for v in series]
+
+
+def test_alias_index_first_entry_wins():
+    index = AliasIndex([("b", 1), ("ab", 2), ("a", 3), ("b", 4)])
+    assert index.search("ab") == 1  # "b" is listed first even though "ab" starts earlier
+    assert index.search("xa") == 3
+    assert index.search("zzz") is None
+    assert AliasIndex([]).search("anything") is None
@@ -0,0 +1,69 @@
+# predict_batch must price every record exactly like the single-row paths.
+
+import os
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.inference import predict_rows
+from src.utils import predict_batch, predict_price, predict_specs, preprocess_input
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(ROOT_DIR, "models")
+DATA_PATH = os.path.join(ROOT_DIR, "data", "processed", "laptops_clean.csv")
+
+
+@pytest.fixture(scope="module")
+def model():
+    return joblib.load(os.path.join(MODELS_DIR, "best_model.pkl"))
+
+
+@pytest.fixture(scope="module")
+def feature_names():
+    return list(joblib.load(os.path.join(MODELS_DIR, "feature_names.pkl")))
+
+
+@pytest.fixture(scope="module")
+def sparse_records():
+    """Processed rows with a random subset of fields left out of each record."""
+    frame = pd.read_csv(DATA_PATH).drop(columns=["Price_euros"]).sample(300, random_state=0)
+    rng = np.random.default_rng(0)
+    records = []
+    for row in frame.to_dict("records"):
+        keep = rng.random(len(row)) < 0.6
+        records.append({key: value for (key, value), k in zip(row.items(), keep) if k})
+    return records + [{"Company": "HP", "Ram": 16}, {"Company": "Dell"}, {}]
+
+
+def single_row_prices(model, records, feature_names):
+    return np.array([predict_price(model, preprocess_input(r, feature_names)) for r in records])
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_batch_matches_predict_price_on_sparse_records(model, feature_names, sparse_records, sparse):
+    batch = predict_batch(model, sparse_records, feature_names, chunk_size=64, sparse=sparse)
+    expected = single_row_prices(model, sparse_records, feature_names)
+    assert np.isfinite(batch).all()
+    np.testing.assert_allclose(batch, expected, rtol=0, atol=1e-3)
+
+
+def test_batch_matches_predict_specs(model, feature_names):
+    records = [{"Company": "Dell", "TypeName": "Notebook", "Ram": 8, "SSD": 256}, {"Company": "HP", "Ram": 16}]
+    batch = predict_batch(model, records, feature_names)
+    assert batch.tolist() == [predict_specs(model, r, feature_names) for r in records]
+
+
+def test_feature_name_warning_is_scoped_to_predict(feature_names):
+    from sklearn.tree import DecisionTreeRegressor
+
+    frame = pd.DataFrame(np.eye(len(feature_names)), columns=feature_names)
+    tree = DecisionTreeRegressor().fit(frame, np.arange(len(feature_names), dtype=float))
+    X = frame.to_numpy()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        predict_rows(tree, X)
+    with pytest.warns(UserWarning, match="does not have valid feature names"):
+        tree.predict(X)
@@ -0,0 +1,51 @@
+# The NumPy runtime artifact must price specs exactly like predict_specs.
+
+import os
+
+import joblib
+import numpy as np
+import pytest
+
+from src.cache import spec_key
+from src.runtime import RuntimeModel, export_runtime
+from src.utils import predict_specs
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(ROOT_DIR, "models")
+
+SPECS = [
+    {"Company": "Dell", "TypeName": "Notebook", "Ram": 8, "SSD": 256},
+    {"Company": "HP", "OpSys": "Windows 10", "Ram": 16, "Weight": 1.8},
+    # Mixed-case spellings the model never saw
+    {"Company": "Hp", "OpSys": "macos", "Ram": 8},
+    {"Company": "dell", "TypeName": "notebook", "Cpu_brand": "intel core i5"},
+    {"Company": "Apple", "OpSys": None, "Ram": 4},
+]
+
+
+@pytest.fixture(scope="module")
+def model():
+    return joblib.load(os.path.join(MODELS_DIR, "best_model.pkl"))
+
+
+@pytest.fixture(scope="module")
+def feature_names():
+    return list(joblib.load(os.path.join(MODELS_DIR, "feature_names.pkl")))
+
+
+@pytest.fixture(scope="module")
+def runtime(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("runtime") / "model_runtime.npz")
+    export_runtime(path)
+    return RuntimeModel.load(path)
+
+
+def test_runtime_matches_predict_specs(runtime, model, feature_names):
+    expected = [predict_specs(model, spec, feature_names) for spec in SPECS]
+    np.testing.assert_allclose(runtime.predict(SPECS), expected, rtol=0, atol=1e-3)
+
+
+def test_runtime_matches_predict_specs_after_spec_key(runtime, model, feature_names):
+    specs = [spec_key(spec, feature_names)[0] for spec in SPECS]
+    expected = [predict_specs(model, spec, feature_names) for spec in specs]
+    np.testing.assert_allclose(runtime.predict(specs), expected, rtol=0, atol=1e-3)
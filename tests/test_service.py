@@ -0,0 +1,49 @@
+# /predict and /predict/batch must validate and price the same spec the same way.
+
+import asyncio
+import json
+import math
+
+import pytest
+
+from src.service import PredictionService
+
+FULL = {"Company": "Dell", "TypeName": "Notebook", "Ram": 8, "SSD": 256}
+SPARSE = {"Company": "HP", "Ram": 16}
+
+
+def call(method, path, payload, requests=1):
+    """Route `requests` identical calls through a fresh service (batcher running)."""
+    async def run():
+        service = PredictionService(max_wait_ms=1)
+        batcher = asyncio.create_task(service.batcher.run())
+        try:
+            body = json.dumps(payload).encode("utf-8")
+            return await asyncio.gather(*(service.route(method, path, body) for _ in range(requests)))
+        finally:
+            batcher.cancel()
+    results = asyncio.run(run())
+    return results[0] if requests == 1 else results
+
+
+def test_batch_prices_missing_fields_like_predict():
+    status, body = call("POST", "/predict/batch", [FULL, SPARSE])
+    assert status == 200
+    assert all(math.isfinite(p) for p in body["prices"])
+    json.dumps(body, allow_nan=False)
+    singles = [call("POST", "/predict", spec)[1]["price"] for spec in (FULL, SPARSE)]
+    assert body["prices"] == singles
+
+
+@pytest.mark.parametrize("spec", [{"Company": ["x"]}, {"TypeName": {"a": 1}}, {"Ram": "8"}, {"Ram": True}])
+def test_invalid_fields_rejected_on_both_endpoints(spec):
+    status, body = call("POST", "/predict/batch", [FULL, spec])
+    assert status == 400 and "Spec 1" in body["error"]
+    status, body = call("POST", "/predict", spec)
+    assert status == 400
+
+
+def test_micro_batched_requests_match_batch_endpoint():
+    results = call("POST", "/predict", SPARSE, requests=5)
+    prices = {body["price"] for status, body in results if status == 200}
+    assert len(results) == 5 and prices == set(call("POST", "/predict/batch", [SPARSE])[1]["prices"])